@@ -447,6 +447,11 @@ def setup_redis_cache_connection():
 		from frappe.utils.redis_wrapper import RedisWrapper
 
 		cache = RedisWrapper.from_url(conf.get("redis_cache"))
+		if conf.get("use_client_cache"):
+			cache.enable_client_cache(
+				maxsize=conf.get("client_cache_size") or 1024,
+				ttl=conf.get("client_cache_ttl") or 300,
+			)
 
 
 def get_traceback(with_context: bool = False) -> str:
@@ -1307,6 +1312,20 @@ def get_doc(*args, **kwargs):
 	return doc
 
 
+def insert_many(docs, **kwargs) -> list["Document"]:
+	"""Insert many new documents, running validations and hooks, in batched queries.
+
+	See `frappe.model.document.insert_many` for arguments.
+
+	Example:
+
+	        frappe.insert_many({"doctype": "ToDo", "description": d} for d in descriptions)
+	"""
+	import frappe.model.document
+
+	return frappe.model.document.insert_many(docs, **kwargs)
+
+
 def get_last_doc(doctype, filters=None, order_by="creation desc", *, for_update=False):
 	"""Get last created document of this type."""
 	d = get_all(doctype, filters=filters, limit_page_length=1, order_by=order_by, pluck="name")
@@ -1328,6 +1347,15 @@ def get_meta(doctype, cached=True):
 	return frappe.model.meta.get_meta(doctype, cached=cached)
 
 
+def get_compiled_meta(doctype):
+	"""Get read-only `frappe.model.compiled_meta.CompiledMeta` of given doctype name.
+
+	Cheaper to load than `get_meta`, use it where the meta is only read."""
+	import frappe.model.compiled_meta
+
+	return frappe.model.compiled_meta.get_compiled_meta(doctype)
+
+
 def get_meta_module(doctype):
 	import frappe.modules
 
@@ -1967,6 +1995,11 @@ def get_list(doctype, *args, **kwargs):
 	:param order_by: Order By e.g. `modified desc`.
 	:param limit_start: Start results at record #. Default 0.
 	:param limit_page_length: No of records in the page. Default 20.
+	:param as_iterator: Return a generator streaming rows instead of a list, see `DatabaseQuery.iterate`.
+	:param chunk_size: Number of rows fetched at a time with `as_iterator`.
+	:param cursor: Paginate by seeking past the last row of the previous page instead of `limit_start`.
+	        Pass an empty string for the first page, the result's `next_cursor` for the next ones.
+	:param cache: Cache result in Redis until any of the queried tables changes, `True` or TTL in seconds.
 
 	Example usage:
 
@@ -1991,6 +2024,7 @@ def get_all(doctype, *args, **kwargs):
 	:param order_by: Order By e.g. `modified desc`.
 	:param limit_start: Start results at record #. Default 0.
 	:param limit_page_length: No of records in the page. Default 20.
+	:param cache: Cache result in Redis until any of the queried tables changes, `True` or TTL in seconds.
 
 	Example usage:
 
@@ -1999,6 +2033,10 @@ def get_all(doctype, *args, **kwargs):
 
 	        # filter as a list of lists
 	        frappe.get_all("ToDo", fields=["*"], filters = [["modified", ">", "2014-01-01"]])
+
+	        # stream rows in constant memory
+	        for row in frappe.get_all("GL Entry", fields=["*"], as_iterator=True, chunk_size=1000):
+	                ...
 	"""
 	kwargs["ignore_permissions"] = True
 	if "limit_page_length" not in kwargs:
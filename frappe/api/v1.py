@@ -24,7 +24,12 @@ def document_list(doctype: str):
 			frappe.form_dict[param] = sbool(param_val)
 
 	# evaluate frappe.get_list
-	return frappe.call(frappe.client.get_list, doctype, **frappe.form_dict)
+	data = frappe.call(frappe.client.get_list, doctype, **frappe.form_dict)
+
+	if frappe.form_dict.get("cursor") is not None:
+		frappe.response["next_cursor"] = getattr(data, "next_cursor", None)
+
+	return data
 
 
 def handle_rpc_call(method: str):
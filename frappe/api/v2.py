@@ -77,7 +77,12 @@ def document_list(doctype: str):
 	# set limit of records for frappe.get_list
 	frappe.form_dict.limit_page_length = frappe.form_dict.limit or 20
 	# evaluate frappe.get_list
-	return frappe.call(frappe.client.get_list, doctype, **frappe.form_dict)
+	data = frappe.call(frappe.client.get_list, doctype, **frappe.form_dict)
+
+	if frappe.form_dict.get("cursor") is not None:
+		frappe.response["next_cursor"] = getattr(data, "next_cursor", None)
+
+	return data
 
 
 def count(doctype: str) -> int:
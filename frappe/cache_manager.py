@@ -42,6 +42,7 @@ global_cache_keys = (
 	"sitemap_routes",
 	"db_tables",
 	"server_script_autocompletion_items",
+	"query_cache_versions",
 ) + doctype_map_keys
 
 user_cache_keys = (
@@ -65,6 +66,7 @@ user_cache_keys = (
 
 doctype_cache_keys = (
 	"doctype_meta",
+	"doctype_compiled_meta",
 	"doctype_form_meta",
 	"table_columns",
 	"last_modified",
@@ -37,6 +37,7 @@ def get_list(
 	debug: bool = False,
 	as_dict: bool = True,
 	or_filters=None,
+	cursor=None,
 ):
 	"""Return a list of records by filters, fields, ordering and limit.
 
@@ -45,7 +46,8 @@ def get_list(
 	:param filters: filter list by this dict
 	:param order_by: Order by this fieldname
 	:param limit_start: Start at this index
-	:param limit_page_length: Number of records to be returned (default 20)"""
+	:param limit_page_length: Number of records to be returned (default 20)
+	:param cursor: Cursor of the page to be returned, empty for the first page (see `frappe.get_list`)"""
 	if frappe.is_table(doctype):
 		check_parent_permission(parent, doctype)
 
@@ -61,6 +63,7 @@ def get_list(
 		limit_page_length=limit_page_length,
 		debug=debug,
 		as_list=not as_dict,
+		cursor=cursor,
 	)
 
 	validate_args(args)
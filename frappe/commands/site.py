@@ -143,7 +143,7 @@ def restore(
 	with_public_files=None,
 	with_private_files=None,
 ):
-	"Restore site database from an sql file"
+	"Restore site database from an sql file or a folder of a parallel backup"
 
 	from frappe.utils.synchronization import filelock
 
@@ -878,6 +878,14 @@ def use(site, sites_path="."):
 @click.option(
 	"--old-backup-metadata", default=False, is_flag=True, help="Use older backup metadata"
 )
+@click.option(
+	"--parallel",
+	default=False,
+	is_flag=True,
+	help="Dump tables in parallel to a folder and only copy changed files,"
+	" MariaDB sites need to be in maintenance mode",
+)
+@click.option("--jobs", type=int, help="Number of tables or files backed up at once with --parallel")
 @pass_context
 def backup(
 	context,
@@ -893,6 +901,8 @@ def backup(
 	include="",
 	exclude="",
 	old_backup_metadata=False,
+	parallel=False,
+	jobs=None,
 ):
 	"Backup"
 
@@ -919,6 +929,8 @@ def backup(
 				verbose=verbose,
 				force=True,
 				old_backup_metadata=old_backup_metadata,
+				parallel=parallel,
+				jobs=jobs,
 			)
 		except Exception:
 			click.secho(
@@ -1114,8 +1114,13 @@ def get_version(output):
 @click.option(
 	"--static-pages", is_flag=True, default=False, help="Rebuild global search for static pages"
 )
+@click.option(
+	"--full/--incremental",
+	default=True,
+	help="Index all documents, or only the ones modified since the last rebuild",
+)
 @pass_context
-def rebuild_global_search(context, static_pages=False):
+def rebuild_global_search(context, static_pages=False, full=True):
 	"""Setup help table in the current site (called after migrate)"""
 	from frappe.utils.global_search import (
 		add_route_to_global_search,
@@ -1140,7 +1145,8 @@ def rebuild_global_search(context, static_pages=False):
 			else:
 				doctypes = get_doctypes_with_global_search()
 				for i, doctype in enumerate(doctypes):
-					rebuild_for_doctype(doctype)
+					rebuild_for_doctype(doctype, full=full)
+					frappe.db.commit()
 					update_progress_bar("Rebuilding Global Search", i, len(doctypes))
 
 		finally:
@@ -1149,6 +1155,34 @@ def rebuild_global_search(context, static_pages=False):
 		raise SiteNotSpecifiedError
 
 
+@click.command("build-link-search-index")
+@click.option(
+	"--doctype", "doctypes", multiple=True, required=True, help="DocType to index, can be repeated"
+)
+@click.option("--drop", is_flag=True, default=False, help="Drop the index instead of building it")
+@pass_context
+def build_link_search_index(context, doctypes, drop=False):
+	"""Build the n-gram index used by Link field search for given doctypes"""
+	from frappe.desk.link_search_index import build_index, drop_index
+
+	for site in context.sites:
+		try:
+			frappe.init(site)
+			frappe.connect()
+
+			for doctype in doctypes:
+				if drop:
+					drop_index(doctype)
+				else:
+					build_index(doctype)
+				frappe.db.commit()
+
+		finally:
+			frappe.destroy()
+	if not context.sites:
+		raise SiteNotSpecifiedError
+
+
 commands = [
 	build,
 	clear_cache,
@@ -1181,5 +1215,6 @@ commands = [
 	bulk_rename,
 	add_to_email_queue,
 	rebuild_global_search,
+	build_link_search_index,
 	run_parallel_tests,
 ]
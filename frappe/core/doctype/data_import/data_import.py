@@ -31,6 +31,7 @@ class DataImport(Document):
 		import_file: DF.Attach | None
 		import_type: DF.Literal["", "Insert New Records", "Update Existing Records"]
 		mute_emails: DF.Check
+		parallel_workers: DF.Int
 		payload_count: DF.Int
 		reference_doctype: DF.Link
 		show_failed_logs: DF.Check
@@ -153,6 +154,21 @@ def start_import(data_import):
 	frappe.publish_realtime("data_import_refresh", {"data_import": data_import.name})
 
 
+def import_payload_range(data_import, payloads, total_payload_count):
+	"""Runs in one of the background jobs of a parallel import, each sets the status from the logs."""
+	data_import = frappe.get_doc("Data Import", data_import)
+	i = Importer(data_import.reference_doctype, data_import=data_import, parse_file=False)
+	try:
+		i.import_payload_range(payloads, total_payload_count)
+	except Exception:
+		frappe.db.rollback()
+		data_import.log_error("Data import failed")
+	finally:
+		frappe.flags.in_import = False
+
+	frappe.publish_realtime("data_import_refresh", {"data_import": data_import.name})
+
+
 @frappe.whitelist()
 def download_template(
 	doctype, export_fields=None, export_records=None, export_filters=None, file_type="CSV"
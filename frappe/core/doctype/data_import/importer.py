@@ -3,6 +3,7 @@
 
 import io
 import json
+import math
 import os
 import re
 import timeit
@@ -21,13 +22,19 @@ from frappe.utils.xlsxutils import (
 
 INVALID_VALUES = ("", None)
 MAX_ROWS_IN_PREVIEW = 10
+LINK_CHECK_BATCH_SIZE = 10_000
+# seconds between progress updates of each job of a parallel import
+PROGRESS_INTERVAL = 1
+PARALLEL_IMPORT_KEY_EXPIRY = 24 * 60 * 60
 INSERT = "Insert New Records"
 UPDATE = "Update Existing Records"
 DURATION_PATTERN = re.compile(r"^(?:(\d+d)?((^|\s)\d+h)?((^|\s)\d+m)?((^|\s)\d+s)?)$")
 
 
 class Importer:
-	def __init__(self, doctype, data_import=None, file_path=None, import_type=None, console=False):
+	def __init__(
+		self, doctype, data_import=None, file_path=None, import_type=None, console=False, parse_file=True
+	):
 		self.doctype = doctype
 		self.console = console
 
@@ -40,13 +47,16 @@ class Importer:
 		self.template_options = frappe.parse_json(self.data_import.template_options or "{}")
 		self.import_type = self.data_import.import_type
 
-		self.import_file = ImportFile(
-			doctype,
-			file_path or data_import.google_sheets_url or data_import.import_file,
-			self.template_options,
-			self.import_type,
-			console=self.console,
-		)
+		# jobs of a parallel import are given their payloads, see `import_payload_range`
+		self.import_file = None
+		if parse_file:
+			self.import_file = ImportFile(
+				doctype,
+				file_path or data_import.google_sheets_url or data_import.import_file,
+				self.template_options,
+				self.import_type,
+				console=self.console,
+			)
 
 	def get_data_for_import_preview(self):
 		out = self.import_file.get_data_for_import_preview()
@@ -89,6 +99,11 @@ class Importer:
 				self.data_import.db_set("template_warnings", json.dumps(warnings))
 			return
 
+		workers = min(cint(self.data_import.parallel_workers), len(payloads))
+		if workers > 1 and not self.console:
+			self.start_parallel_import(payloads, workers)
+			return
+
 		# setup import log
 		import_log = (
 			frappe.get_all(
@@ -100,15 +115,15 @@ class Importer:
 			or []
 		)
 
-		log_index = 0
-
 		# Do not remove rows in case of retry after an error or pending data import
 		if (
 			self.data_import.status == "Partial Success"
 			and len(import_log) >= self.data_import.payload_count
 		):
-			# remove previous failures from import log only in case of retry after partial success
+			# remove previous failures from import log only in case of retry after partial success,
+			# they are imported again and logged anew
 			import_log = [log for log in import_log if log.get("success")]
+			frappe.db.delete("Data Import Log", {"data_import": self.data_import.name, "success": 0})
 
 		# get successfully imported rows
 		imported_rows = []
@@ -117,8 +132,6 @@ class Importer:
 			if log.success or len(import_log) < self.data_import.payload_count:
 				imported_rows += json.loads(log.row_indexes)
 
-			log_index = log.log_index
-
 		# start import
 		total_payload_count = len(payloads)
 		batch_size = frappe.conf.data_import_batch_size or 1000
@@ -128,6 +141,8 @@ class Importer:
 				doc = payload.doc
 				row_indexes = [row.row_number for row in payload.rows]
 				current_index = (i + 1) + (batch_index * batch_size)
+				# the payload index, as in parallel imports
+				log_index = current_index - 1
 
 				if set(row_indexes).intersection(set(imported_rows)):
 					print("Skipping imported rows", row_indexes)
@@ -177,8 +192,6 @@ class Importer:
 						{"success": True, "docname": doc.name, "row_indexes": row_indexes},
 					)
 
-					log_index += 1
-
 					if self.data_import.status != "Partial Success":
 						self.data_import.db_set("status", "Partial Success")
 
@@ -203,8 +216,6 @@ class Importer:
 						},
 					)
 
-					log_index += 1
-
 		# Logs are db inserted directly so will have to be fetched again
 		import_log = (
 			frappe.get_all(
@@ -238,6 +249,139 @@ class Importer:
 		frappe.flags.in_import = False
 		frappe.flags.mute_emails = False
 
+	def start_parallel_import(self, payloads, workers):
+		"""Split the payloads in contiguous ranges, each imported by its own background job.
+
+		Jobs are given their payloads, so that the file is only parsed once."""
+		name = self.data_import.name
+		frappe.cache.delete(get_parallel_import_key(name, "progress"))
+
+		payloads = [
+			{"index": index, "doc": payload.doc, "row_indexes": [row.row_number for row in payload.rows]}
+			for index, payload in enumerate(payloads)
+		]
+		for payload_range in frappe.utils.create_batch(payloads, math.ceil(len(payloads) / workers)):
+			frappe.enqueue(
+				"frappe.core.doctype.data_import.data_import.import_payload_range",
+				queue="default",
+				timeout=10000,
+				event="data_import",
+				data_import=name,
+				payloads=payload_range,
+				total_payload_count=len(payloads),
+				enqueue_after_commit=True,
+				now=frappe.conf.developer_mode or frappe.flags.in_test,
+			)
+
+	def import_payload_range(self, payloads, total_payload_count):
+		"""Import a contiguous range of payloads, in one of the jobs of a parallel import.
+
+		The payload index is used as log index, like in `import_data`, so the logs of the jobs never
+		collide. Documents are committed in batches, a failing document is rolled back to its own
+		savepoint only. The status is set from the logs after every batch, see
+		`set_status_from_logs`."""
+		# template warnings are reset by the job starting the import, don't lock the Data Import here
+		frappe.cache.hdel("lang", frappe.session.user)
+		frappe.set_user_lang(frappe.session.user)
+		frappe.flags.in_import = True
+		frappe.flags.mute_emails = self.data_import.mute_emails
+
+		name = self.data_import.name
+		imported_rows = set()
+		for row_indexes in frappe.get_all(
+			"Data Import Log", filters={"data_import": name, "success": 1}, pluck="row_indexes"
+		):
+			imported_rows.update(json.loads(row_indexes))
+
+		# failures of an earlier attempt are imported again and logged anew
+		frappe.db.delete(
+			"Data Import Log",
+			{
+				"data_import": name,
+				"success": 0,
+				"log_index": ("between", (payloads[0]["index"], payloads[-1]["index"])),
+			},
+		)
+
+		commit_batch_size = cint(frappe.conf.data_import_commit_batch_size) or 100
+		uncommitted = 0
+		self.import_started = self.last_progress = timeit.default_timer()
+
+		for payload in payloads:
+			row_indexes = payload["row_indexes"]
+			if imported_rows.intersection(row_indexes):
+				self.publish_parallel_progress(total_payload_count, skipping=True)
+				continue
+
+			frappe.db.savepoint("data_import_payload")
+			try:
+				doc = self.process_doc(frappe._dict(payload["doc"]))
+				log = {"success": True, "docname": doc.name, "row_indexes": row_indexes}
+			except Exception:
+				messages = frappe.local.message_log
+				frappe.clear_messages()
+				frappe.db.rollback(save_point="data_import_payload")
+				log = {
+					"success": False,
+					"exception": frappe.get_traceback(),
+					"messages": messages,
+					"row_indexes": row_indexes,
+				}
+
+			create_import_log(name, payload["index"], log)
+			self.publish_parallel_progress(total_payload_count, success=log["success"])
+
+			uncommitted += 1
+			if uncommitted >= commit_batch_size:
+				self.set_status_from_logs()
+				frappe.db.commit()
+				uncommitted = 0
+
+		self.set_status_from_logs()
+		frappe.db.commit()
+		self.after_import()
+
+	def publish_parallel_progress(self, total_payload_count, **kwargs):
+		"""Count the payload in the progress of all jobs, published at most every
+		`PROGRESS_INTERVAL` seconds by each job."""
+		name = self.data_import.name
+		key = get_parallel_import_key(name, "progress")
+		current = frappe.cache.incrby(key, 1)
+		frappe.cache.expire(key, PARALLEL_IMPORT_KEY_EXPIRY)
+
+		now = timeit.default_timer()
+		if current < total_payload_count and now - self.last_progress < PROGRESS_INTERVAL:
+			return
+
+		self.last_progress = now
+		# all jobs import at about the same rate
+		eta = (now - self.import_started) / current * (total_payload_count - current)
+		frappe.publish_realtime(
+			"data_import_progress",
+			{
+				"current": current,
+				"total": total_payload_count,
+				"data_import": name,
+				"eta": eta,
+				**kwargs,
+			},
+			user=frappe.session.user,
+		)
+
+	def set_status_from_logs(self):
+		"""Set the status of a parallel import from the documents imported so far by all its jobs.
+
+		Doesn't depend on the jobs finishing, the import can be retried if one of them was killed."""
+		imported = frappe.db.count("Data Import Log", {"data_import": self.data_import.name, "success": 1})
+		if not imported:
+			status = "Pending"
+		elif imported < self.data_import.payload_count:
+			status = "Partial Success"
+		else:
+			status = "Success"
+
+		self.data_import.db_set("status", status, commit=False)
+
 	def process_doc(self, doc):
 		if self.import_type == INSERT:
 			return self.insert_record(doc)
@@ -748,7 +892,11 @@ class Row:
 		return value
 
 	def link_exists(self, value, df):
-		return bool(frappe.db.exists(df.options, value, cache=True))
+		value = cstr(value)
+		link_values = self.header.link_values.get(df.options) or {}
+		if value not in link_values:
+			link_values = check_link_values(df.options, [value], self.header.link_values)
+		return link_values[value]
 
 	def parse_value(self, value, col):
 		df = col.df
@@ -808,11 +956,15 @@ class Header(Row):
 
 		self.seen = []
 		self.columns = []
+		# {link doctype: {value: exists}}, looked up in bulk by the columns and reused by the rows
+		self.link_values = {}
 
 		for j, header in enumerate(row):
 			column_values = [get_item_at_index(r, j) for r in raw_data]
 			map_to_field = column_to_field_map.get(str(j))
-			column = Column(j, header, self.doctype, column_values, map_to_field, self.seen)
+			column = Column(
+				j, header, self.doctype, column_values, map_to_field, self.seen, self.link_values
+			)
 			self.seen.append(header)
 			self.columns.append(column)
 
@@ -844,9 +996,13 @@ class Header(Row):
 
 
 class Column:
-	def __init__(self, index, header, doctype, column_values, map_to_field=None, seen=None):
+	def __init__(
+		self, index, header, doctype, column_values, map_to_field=None, seen=None, link_values=None
+	):
 		if seen is None:
 			seen = []
+		if link_values is None:
+			link_values = {}
 		self.index = index
 		self.column_number = index + 1
 		self.doctype = doctype
@@ -854,6 +1010,7 @@ class Column:
 		self.column_values = column_values
 		self.map_to_field = map_to_field
 		self.seen = seen
+		self.link_values = link_values
 
 		self.date_format = None
 		self.df = None
@@ -989,10 +1146,8 @@ class Column:
 		if self.df.fieldtype == "Link":
 			# find all values that dont exist
 			values = list({cstr(v) for v in self.column_values if v})
-			exists = [
-				cstr(d.name) for d in frappe.get_all(self.df.options, filters={"name": ("in", values)})
-			]
-			not_exists = list(set(values) - set(exists))
+			link_values = check_link_values(self.df.options, values, self.link_values)
+			not_exists = [value for value in values if not link_values[value]]
 			if not_exists:
 				missing_values = ", ".join(not_exists)
 				message = _("The following values do not exist for {0}: {1}")
@@ -1227,6 +1382,40 @@ def get_autoname_field(doctype):
 		return meta.get_field(fieldname)
 
 
+def get_parallel_import_key(data_import, counter):
+	return frappe.cache.make_key(f"data_import:{data_import}:{counter}")
+
+
+def check_link_values(doctype, values, link_values):
+	"""Find out which of the values are existing names of `doctype`, with one query per
+	`LINK_CHECK_BATCH_SIZE` values. Results are remembered in `link_values` and values already
+	looked up are skipped.
+
+	Values are matched like the database compares names, e.g. on MariaDB "test item " is an
+	existing "Test Item".
+
+	Returns {value: exists} of all looked up values of `doctype`."""
+	checked = link_values.setdefault(doctype, {})
+	unchecked = [value for value in values if value not in checked]
+
+	for batch in frappe.utils.create_batch(unchecked, LINK_CHECK_BATCH_SIZE):
+		existing = {
+			normalize_link_value(name)
+			for name in frappe.get_all(doctype, {"name": ("in", batch)}, pluck="name")
+		}
+		checked.update((value, normalize_link_value(value) in existing) for value in batch)
+
+	return checked
+
+
+def normalize_link_value(value) -> str:
+	# MariaDB's collations ignore case and trailing spaces, Postgres compares names as is
+	if frappe.db.db_type == "mariadb":
+		return cstr(value).casefold().rstrip(" ")
+
+	return cstr(value)
+
+
 def get_item_at_index(_list, i, default=None):
 	try:
 		a = _list[i]
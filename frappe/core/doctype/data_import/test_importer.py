@@ -1,7 +1,7 @@
 # Copyright (c) 2019, Frappe Technologies and Contributors
 # License: MIT. See LICENSE
 import frappe
-from frappe.core.doctype.data_import.importer import Importer
+from frappe.core.doctype.data_import.importer import Importer, check_link_values
 from frappe.tests.test_query_builder import db_type_is, run_only_if
 from frappe.tests.utils import FrappeTestCase
 from frappe.utils import format_duration, getdate
@@ -50,6 +50,35 @@ class TestImporter(FrappeTestCase):
 		self.assertEqual(doc3.another_number, 5)
 		self.assertEqual(format_duration(doc3.duration), "5d 5h 45m")
 
+	def test_parallel_data_import(self):
+		for name in ("Test", "Test 2", "Test 3"):
+			frappe.delete_doc_if_exists(doctype_name, name)
+
+		import_file = get_import_file("sample_import_file")
+		data_import = self.get_importer(doctype_name, import_file)
+		data_import.db_set("parallel_workers", 2)
+		data_import.start_import()
+		data_import.reload()
+
+		self.assertEqual(data_import.status, "Success")
+		self.assertEqual(
+			frappe.get_all(
+				"Data Import Log",
+				filters={"data_import": data_import.name},
+				order_by="log_index",
+				pluck="log_index",
+			),
+			[0, 1, 2],
+		)
+		self.assertEqual(frappe.db.get_value(doctype_name, "Test 3", "another_number"), 5)
+
+	@run_only_if(db_type_is.MARIADB)
+	def test_link_values_match_like_database(self):
+		self.assertEqual(
+			check_link_values("Role", ["system manager", "System Manager ", "No Such Role"], {})["Role"],
+			{"system manager": True, "System Manager ": True, "No Such Role": False},
+		)
+
 	def test_data_import_preview(self):
 		import_file = get_import_file("sample_import_file")
 		data_import = self.get_importer(doctype_name, import_file)
@@ -0,0 +1,304 @@
+# Copyright (c) 2024, Frappe Technologies and contributors
+# License: MIT. See LICENSE
+
+"""
+Column oriented storage of Prepared Report results.
+
+Rows are stored in chunks of `CHUNK_SIZE`, each column of a chunk compressed on its own. An index
+at the end of the file has the offsets of all the chunk columns, so a page of rows only needs its
+chunks to be read and sorting or filtering only needs the columns involved.
+
+	[chunk columns ...][index][index length (8 bytes)][MAGIC]
+"""
+
+import json
+import operator
+import zlib
+from typing import IO
+
+import frappe
+from frappe.utils import cstr, flt
+
+MAGIC = b"FRPR1"
+FILE_EXTENSION = ".frpr"
+CHUNK_SIZE = 1000
+INDEX_LENGTH_SIZE = 8
+
+# rows are dicts (by fieldname), lists (by column index) or stored whole when they are mixed
+DICT_ROWS, LIST_ROWS, WHOLE_ROWS = "dict", "list", "whole"
+WHOLE_ROW_KEY = "row"
+
+
+def encode(value) -> bytes:
+	return zlib.compress(frappe.safe_encode(frappe.as_json(value, indent=None, separators=(",", ":"))))
+
+
+def decode(content: bytes):
+	return json.loads(zlib.decompress(content))
+
+
+def write_result(data: dict, file: IO[bytes], has_total_row=False) -> None:
+	"""Write a report result (as returned by `generate_report_result`) to the file.
+
+	The total row, if any, is kept aside so that pages only have rows of the report."""
+	data = dict(data)
+	rows = data.pop("result", None) or []
+	total_row = None
+	if has_total_row and rows:
+		total_row = rows[-1]
+		rows = rows[:-1]
+
+	row_format, keys = get_row_format(rows)
+	chunks = []
+	offset = 0
+	for start in range(0, len(rows), CHUNK_SIZE):
+		chunk_rows = rows[start : start + CHUNK_SIZE]
+		columns = []
+		for key in keys:
+			content = encode(get_column_values(chunk_rows, row_format, key))
+			file.write(content)
+			columns.append((offset, len(content)))
+			offset += len(content)
+
+		chunks.append({"rows": len(chunk_rows), "columns": columns})
+
+	index = encode(
+		{
+			"row_format": row_format,
+			"keys": keys,
+			"row_count": len(rows),
+			"chunk_size": CHUNK_SIZE,
+			"chunks": chunks,
+			"total_row": total_row,
+			"data": data,
+		}
+	)
+	file.write(index)
+	file.write(len(index).to_bytes(INDEX_LENGTH_SIZE, "big"))
+	file.write(MAGIC)
+
+
+def get_row_format(rows):
+	if all(isinstance(row, dict) for row in rows):
+		keys = {}
+		for row in rows:
+			keys.update(dict.fromkeys(row))
+		return DICT_ROWS, list(keys)
+
+	if all(isinstance(row, (list, tuple)) for row in rows) and len({len(row) for row in rows}) <= 1:
+		return LIST_ROWS, list(range(len(rows[0]) if rows else 0))
+
+	return WHOLE_ROWS, [WHOLE_ROW_KEY]
+
+
+def get_column_values(rows, row_format, key):
+	"""Return [values, offsets of rows without the key]."""
+	if row_format == WHOLE_ROWS:
+		return [rows, []]
+
+	if row_format == LIST_ROWS:
+		return [[row[key] for row in rows], []]
+
+	return [[row.get(key) for row in rows], [i for i, row in enumerate(rows) if key not in row]]
+
+
+def is_chunked_result(file: IO[bytes]) -> bool:
+	file.seek(-len(MAGIC), 2)
+	return file.read() == MAGIC
+
+
+class ChunkedResult:
+	"""Read rows of a result written by `write_result`, only loading the parts that are needed."""
+
+	def __init__(self, file: IO[bytes]):
+		self.file = file
+		if not is_chunked_result(file):
+			frappe.throw(frappe._("Not a prepared report result file"))
+
+		file.seek(-(len(MAGIC) + INDEX_LENGTH_SIZE), 2)
+		index_length = int.from_bytes(file.read(INDEX_LENGTH_SIZE), "big")
+		file.seek(-(len(MAGIC) + INDEX_LENGTH_SIZE + index_length), 2)
+		self.index = decode(file.read(index_length))
+
+		self.row_format = self.index["row_format"]
+		self.keys = self.index["keys"]
+		self.row_count = self.index["row_count"]
+		self.chunk_size = self.index["chunk_size"]
+		self.chunks = self.index["chunks"]
+		self.total_row = self.index["total_row"]
+
+	def close(self):
+		self.file.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+	@property
+	def data(self) -> dict:
+		"""The result without its rows (columns, chart, message, etc.)."""
+		return dict(self.index["data"])
+
+	def get_data(self) -> dict:
+		"""The whole result, like it was written."""
+		return self.data | {"result": self.get_rows() + self.get_total_rows()}
+
+	def get_total_rows(self) -> list:
+		return [self.total_row] if self.total_row is not None else []
+
+	def read_column(self, chunk, key) -> list:
+		"""Return [values, offsets of rows without the key] of a column of a chunk."""
+		offset, length = chunk["columns"][self.keys.index(key)]
+		self.file.seek(offset)
+		return decode(self.file.read(length))
+
+	def read_chunk(self, chunk) -> list:
+		columns = [self.read_column(chunk, key) for key in self.keys]
+		if self.row_format == WHOLE_ROWS:
+			return columns[0][0]
+
+		if self.row_format == LIST_ROWS:
+			if not columns:
+				return [[] for _ in range(chunk["rows"])]
+			return [list(row) for row in zip(*(values for values, _missing in columns))]
+
+		rows = [{} for _ in range(chunk["rows"])]
+		for key, (values, missing) in zip(self.keys, columns):
+			missing = set(missing)
+			for i, value in enumerate(values):
+				if i not in missing:
+					rows[i][key] = value
+
+		return rows
+
+	def get_values(self, key) -> list:
+		"""Return values of a column of all rows, reading only that column."""
+		key = self.get_key(key)
+		values = []
+		for chunk in self.chunks:
+			if self.row_format == WHOLE_ROWS:
+				values.extend(get_value(row, key) for row in self.read_column(chunk, WHOLE_ROW_KEY)[0])
+			else:
+				values.extend(self.read_column(chunk, key)[0])
+
+		return values
+
+	def get_key(self, key):
+		if self.row_format == LIST_ROWS or (self.row_format == WHOLE_ROWS and cstr(key).isdigit()):
+			return int(key)
+
+		if self.row_format == DICT_ROWS and key not in self.keys:
+			frappe.throw(frappe._("Invalid column {0}").format(key))
+
+		return key
+
+	def get_rows(self, start: int = 0, page_length: int | None = None, **kwargs) -> list:
+		return self.get_page(start, page_length, **kwargs)["result"]
+
+	def get_page(
+		self,
+		start: int = 0,
+		page_length: int | None = None,
+		order_by: str | int | None = None,
+		order: str = "asc",
+		filters: dict | None = None,
+	) -> dict:
+		"""Return a page of rows, sorted by and filtered on column values if needed, and the
+		number of rows matching the filters.
+
+		Filters are {column: value}, with values as in the report view: `>5`, `<10`, `=324`,
+		`!=4`, `5:10` for a range, text otherwise to match the column values containing it."""
+		if order_by or filters:
+			positions = self.get_positions(order_by, order, filters)
+		else:
+			positions = range(self.row_count)
+
+		start = max(int(start or 0), 0)
+		end = start + page_length if page_length else None
+		return {"result": self.get_rows_at(positions[start:end]), "row_count": len(positions)}
+
+	def get_positions(self, order_by=None, order="asc", filters=None) -> list[int]:
+		positions = list(range(self.row_count))
+		for key, value in (filters or {}).items():
+			if value in (None, ""):
+				continue
+			matches = get_filter_function(cstr(value))
+			values = self.get_values(key)
+			positions = [i for i in positions if matches(values[i])]
+
+		if order_by:
+			values = self.get_values(order_by)
+			positions.sort(key=lambda i: get_sort_key(values[i]), reverse=order == "desc")
+
+		return positions
+
+	def get_rows_at(self, positions) -> list:
+		"""Return rows at the positions, reading only the chunks that have them."""
+		chunks = {}
+		for position in positions:
+			chunk_index = position // self.chunk_size
+			if chunk_index not in chunks:
+				chunks[chunk_index] = self.read_chunk(self.chunks[chunk_index])
+
+		return [
+			chunks[position // self.chunk_size][position % self.chunk_size] for position in positions
+		]
+
+
+def get_value(row, key):
+	if isinstance(row, dict):
+		return row.get(key)
+
+	if isinstance(row, (list, tuple)) and isinstance(key, int) and key < len(row):
+		return row[key]
+
+
+def get_sort_key(value):
+	"""Sort numbers before text, empty values last."""
+	if value is None or value == "":
+		return (2, 0, "")
+
+	if isinstance(value, (int, float)):
+		return (0, value, "")
+
+	return (1, 0, cstr(value).casefold())
+
+
+COMPARISON_OPERATORS = {
+	">=": operator.ge,
+	"<=": operator.le,
+	"!=": operator.ne,
+	">": operator.gt,
+	"<": operator.lt,
+	"=": operator.eq,
+}
+
+
+def get_filter_function(value: str):
+	value = value.strip()
+	for symbol, compare in COMPARISON_OPERATORS.items():
+		if value.startswith(symbol):
+			expected = value[len(symbol) :].strip()
+			return lambda cell: compare_values(cell, expected, compare)
+
+	if ":" in value:
+		low, high = (part.strip() for part in value.split(":", 1))
+		return lambda cell: (
+			is_number(cell) and (not low or cell >= flt(low)) and (not high or cell <= flt(high))
+		)
+
+	text = value.casefold()
+	return lambda cell: text in cstr(cell).casefold()
+
+
+def compare_values(cell, expected, compare):
+	if is_number(cell):
+		return compare(flt(cell), flt(expected))
+
+	return compare(cstr(cell).casefold(), expected.casefold())
+
+
+def is_number(value) -> bool:
+	return isinstance(value, (int, float)) and not isinstance(value, bool)
@@ -1,6 +1,7 @@
 # Copyright (c) 2018, Frappe Technologies and contributors
 # License: MIT. See LICENSE
 import gzip
+import io
 import json
 from contextlib import suppress
 from typing import Any
@@ -8,16 +9,23 @@ from typing import Any
 from rq import get_current_job
 
 import frappe
+from frappe.core.doctype.prepared_report.chunked_result import (
+	FILE_EXTENSION,
+	ChunkedResult,
+	write_result,
+)
 from frappe.desk.form.load import get_attachments
 from frappe.desk.query_report import generate_report_result
 from frappe.model.document import Document
 from frappe.monitor import add_data_to_monitor
-from frappe.utils import add_to_date, now
+from frappe.utils import add_to_date, cint, now
 from frappe.utils.background_jobs import enqueue
 
 # If prepared report runs for longer than this time it's automatically considered as failed
 FAILURE_THRESHOLD = 60 * 60
 REPORT_TIMEOUT = 25 * 60
+# rows sent when a prepared report is opened, the rest are loaded page by page
+PAGE_LENGTH = 500
 
 
 class PreparedReport(Document):
@@ -78,13 +86,35 @@ class PreparedReport(Document):
 		)
 
 	def get_prepared_data(self, with_file_name=False):
+		"""Return the whole result as JSON (and the name of a JSON file for it)."""
 		if attachments := get_attachments(self.doctype, self.name):
 			attachment = attachments[0]
-			attached_file = frappe.get_doc("File", attachment.name)
+
+			if attachment.file_name.endswith(FILE_EXTENSION):
+				with self.get_chunked_result() as result:
+					data = frappe.safe_encode(frappe.as_json(result.get_data()))
+				file_name = attachment.file_name.removesuffix(FILE_EXTENSION) + ".json"
+			else:
+				data = gzip.decompress(frappe.get_doc("File", attachment.name).get_content())
+				file_name = attachment.file_name.removesuffix(".gz")
 
 			if with_file_name:
-				return (gzip.decompress(attached_file.get_content()), attachment.file_name)
-			return gzip.decompress(attached_file.get_content())
+				return (data, file_name)
+			return data
+
+	def get_chunked_result(self) -> ChunkedResult | None:
+		"""Return a reader of the result, for results stored in chunks (not the older JSON files).
+
+		Local files are read in place, only the parts of them that are needed."""
+		attachments = get_attachments(self.doctype, self.name)
+		if not attachments or not attachments[0].file_name.endswith(FILE_EXTENSION):
+			return None
+
+		file = frappe.get_doc("File", attachments[0].name)
+		if file.is_remote_file:
+			return ChunkedResult(io.BytesIO(file.get_content()))
+
+		return ChunkedResult(open(file.get_full_path(), "rb"))
 
 
 def generate_report(prepared_report):
@@ -108,7 +138,8 @@ def generate_report(prepared_report):
 					report.custom_columns = data["columns"]
 
 		result = generate_report_result(report=report, filters=instance.filters, user=instance.owner)
-		create_json_gz_file(result, instance.doctype, instance.name)
+		has_total_row = cint(report.add_total_row) and not result.get("skip_total_row")
+		create_result_file(result, instance.doctype, instance.name, has_total_row)
 
 		instance.status = "Completed"
 	except Exception:
@@ -237,6 +268,53 @@ def create_json_gz_file(data, dt, dn):
 	_file.save(ignore_permissions=True)
 
 
+def create_result_file(data, dt, dn, has_total_row=False):
+	"""Attach the result, stored in chunks of columns (see `chunked_result`)."""
+	file_name = "{}{}".format(
+		frappe.utils.data.format_datetime(frappe.utils.now(), "Y-m-d-H:M"), FILE_EXTENSION
+	)
+	content = io.BytesIO()
+	write_result(data, content, has_total_row=has_total_row)
+
+	_file = frappe.get_doc(
+		{
+			"doctype": "File",
+			"file_name": file_name,
+			"attached_to_doctype": dt,
+			"attached_to_name": dn,
+			"content": content.getvalue(),
+			"is_private": 1,
+		}
+	)
+	_file.save(ignore_permissions=True)
+
+
+@frappe.whitelist()
+def get_prepared_report_rows(
+	name, start=0, page_length=PAGE_LENGTH, order_by=None, order="asc", filters=None
+):
+	"""Return a page of rows of a prepared report, optionally sorted by and filtered on columns.
+
+	Only the parts of the result that are needed are read. See `ChunkedResult.get_rows`."""
+	prepared_report = frappe.get_doc("Prepared Report", name)
+	prepared_report.check_permission("read")
+
+	filters = frappe.parse_json(filters) or {}
+	result = prepared_report.get_chunked_result()
+	if not result:
+		frappe.throw(frappe._("Rows of this report can't be loaded page by page, please rebuild it"))
+
+	with result:
+		page = result.get_page(
+			cint(start),
+			cint(page_length),
+			order_by=order_by,
+			order="desc" if order == "desc" else "asc",
+			filters=filters,
+		)
+		return page | {"total_row": result.total_row}
+
+
 @frappe.whitelist()
 def download_attachment(dn):
 	pr = frappe.get_doc("Prepared Report", dn)
@@ -244,7 +322,7 @@ def download_attachment(dn):
 		frappe.throw(frappe._("Cannot Download Report due to insufficient permissions"))
 
 	data, file_name = pr.get_prepared_data(with_file_name=True)
-	frappe.local.response.filename = file_name[:-3]
+	frappe.local.response.filename = file_name
 	frappe.local.response.filecontent = data
 	frappe.local.response.type = "binary"
 
@@ -1,11 +1,15 @@
 # Copyright (c) 2018, Frappe Technologies and Contributors
 # License: MIT. See LICENSE
+import io
 import json
 import time
 from contextlib import contextmanager
+from unittest.mock import patch
 
 import frappe
-from frappe.desk.query_report import generate_report_result, get_report_doc
+from frappe.core.doctype.prepared_report import chunked_result
+from frappe.core.doctype.prepared_report.prepared_report import get_prepared_report_rows
+from frappe.desk.query_report import export_query, generate_report_result, get_report_doc
 from frappe.query_builder.utils import db_type_is
 from frappe.tests.test_query_builder import run_only_if
 from frappe.tests.utils import FrappeTestCase, timeout
@@ -63,6 +67,71 @@ class TestPreparedReport(FrappeTestCase):
 		self.assertEqual(len(prepared_data["result"]), len(generated_data["result"]))
 		self.assertEqual(len(prepared_data), len(generated_data))
 
+	def test_prepared_report_rows(self):
+		doc = self.create_prepared_report()
+		self.wait_for_status(doc, "Completed")
+
+		prepared_data = json.loads(doc.get_prepared_data().decode("utf-8"))
+		page = get_prepared_report_rows(doc.name, start=1, page_length=2)
+		rows = prepared_data["result"][:-1] if page["total_row"] else prepared_data["result"]
+		self.assertEqual(page["row_count"], len(rows))
+		self.assertEqual(page["result"], rows[1:3])
+
+		fieldname = prepared_data["columns"][0]["fieldname"]
+		page = get_prepared_report_rows(doc.name, order_by=fieldname, order="desc")
+		values = [row[fieldname] for row in page["result"]]
+		self.assertEqual(values, sorted(values, key=chunked_result.get_sort_key, reverse=True))
+
+	def test_export_paged_prepared_report(self):
+		doc = self.create_prepared_report()
+		self.wait_for_status(doc, "Completed")
+
+		prepared_data = json.loads(doc.get_prepared_data().decode("utf-8"))
+		fieldname = prepared_data["columns"][0]["fieldname"]
+
+		# paged reports send no `visible_idx`, only the order of the rows sorted on the server
+		frappe.local.form_dict = frappe._dict(
+			{
+				"report_name": doc.report_name,
+				"filters": {"prepared_report_name": doc.name},
+				"file_format_type": "CSV",
+				"include_indentation": 0,
+				"prepared_report_order_by": fieldname,
+				"prepared_report_order": "desc",
+			}
+		)
+		export_query()
+
+		# header and every row of the report, not only the first page
+		lines = frappe.response["filecontent"].decode("utf-8").splitlines()
+		self.assertEqual(len(lines), len(prepared_data["result"]) + 1)
+
+		page = get_prepared_report_rows(doc.name, order_by=fieldname, order="desc", page_length=1)
+		self.assertIn(str(page["result"][0][fieldname]), lines[1])
+
+		# only rows matching the column filters, like the pages loaded with them
+		filters = {fieldname: f"={page['result'][0][fieldname]}"}
+		frappe.local.form_dict.prepared_report_filters = json.dumps(filters)
+		export_query()
+
+		lines = frappe.response["filecontent"].decode("utf-8").splitlines()
+		matching = get_prepared_report_rows(doc.name, filters=filters)
+		# header, matching rows and the total row, if any
+		self.assertEqual(len(lines), 1 + matching["row_count"] + bool(matching["total_row"]))
+
+	def test_chunked_result(self):
+		rows = [{"idx": i, "title": f"row {i}"} for i in range(25)] + [{"idx": 25}]
+		file = io.BytesIO()
+		with patch.object(chunked_result, "CHUNK_SIZE", 10):
+			chunked_result.write_result({"columns": [], "result": rows}, file)
+
+		result = chunked_result.ChunkedResult(file)
+		self.assertEqual(result.get_data(), {"columns": [], "result": rows})
+		self.assertEqual(result.get_rows(9, 3), rows[9:12])
+		self.assertEqual(result.get_rows(0, 2, order_by="idx", order="desc"), rows[::-1][:2])
+		self.assertEqual(result.get_page(filters={"idx": ">20"})["row_count"], 5)
+		self.assertEqual(result.get_page(filters={"title": "ROW 1"})["row_count"], 11)
+
 	@run_only_if(db_type_is.MARIADB)
 	def test_start_status_and_kill_jobs(self):
 		with test_report(report_type="Query Report", query="select sleep(10)") as report:
@@ -57,6 +57,39 @@ frappe.listview_settings["Recorder"] = {
 			});
 		});
 
+		listview.page.add_menu_item(__("Start Sampling"), () => {
+			frappe.prompt(
+				[
+					{
+						fieldname: "sample_rate",
+						fieldtype: "Int",
+						label: __("Record 1 in N Requests"),
+						default: 100,
+					},
+					{
+						fieldname: "latency_threshold",
+						fieldtype: "Float",
+						label: __("Also Record Requests Slower Than (ms)"),
+					},
+				],
+				(values) => {
+					frappe.call({
+						method: "frappe.recorder.start",
+						args: values,
+						callback: () => listview.refresh(),
+					});
+				},
+				__("Start Sampling"),
+				__("Start")
+			);
+		});
+
+		listview.page.add_menu_item(__("Query Fingerprints"), () => {
+			frappe.xcall("frappe.recorder.get_fingerprints").then((fingerprints) => {
+				this.show_fingerprints(fingerprints);
+			});
+		});
+
 		setInterval(() => {
 			if (listview.list_view_settings.disable_auto_refresh) {
 				return;
@@ -100,6 +133,45 @@ frappe.listview_settings["Recorder"] = {
 		});
 	},
 
+	show_fingerprints(fingerprints) {
+		const rows = fingerprints
+			.map(
+				(f) => `<tr>
+					<td><pre class="small">${frappe.utils.escape_html(f.query)}</pre></td>
+					<td>${f.count}</td>
+					<td>${f.time}</td>
+					<td>${f.p50} / ${f.p95} / ${f.p99}</td>
+					<td>${f.rows_examined ?? ""}</td>
+					<td>${f.endpoints
+						.map(([endpoint, count]) => `${frappe.utils.escape_html(endpoint)} (${count})`)
+						.join("<br>")}</td>
+				</tr>`
+			)
+			.join("");
+
+		const dialog = new frappe.ui.Dialog({
+			title: __("Query Fingerprints"),
+			size: "extra-large",
+			fields: [{ fieldname: "fingerprints", fieldtype: "HTML" }],
+		});
+		dialog.fields_dict.fingerprints.$wrapper.html(
+			fingerprints.length
+				? `<table class="table table-bordered">
+					<thead><tr>
+						<th>${__("Query")}</th>
+						<th>${__("Count")}</th>
+						<th>${__("Total Time (ms)")}</th>
+						<th>${__("p50 / p95 / p99 (ms)")}</th>
+						<th>${__("Rows Examined")}</th>
+						<th>${__("Endpoints")}</th>
+					</tr></thead>
+					<tbody>${rows}</tbody>
+				</table>`
+				: `<p class="text-muted">${__("No queries have been sampled yet.")}</p>`
+		);
+		dialog.show();
+	},
+
 	update_indicators(listview) {
 		if (listview.enabled) {
 			listview.page.set_indicator(__("Active"), "green");
@@ -29,6 +29,8 @@ class Report(Document):
 		from frappe.types import DF
 
 		add_total_row: DF.Check
+		cache_duration: DF.Int
+		cache_result: DF.Check
 		columns: DF.Table[ReportColumn]
 		disabled: DF.Check
 		filters: DF.Table[ReportFilter]
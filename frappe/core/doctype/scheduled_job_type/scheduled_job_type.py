@@ -11,7 +11,7 @@ from croniter import croniter
 import frappe
 from frappe.model.document import Document
 from frappe.utils import get_datetime, now_datetime
-from frappe.utils.background_jobs import enqueue, is_job_enqueued
+from frappe.utils.background_jobs import enqueue, get_queues_timeout, is_job_enqueued
 
 
 class ScheduledJobType(Document):
@@ -160,6 +160,10 @@ class ScheduledJobType(Document):
 		frappe.db.commit()
 
 	def get_queue_name(self):
+		if queue := frappe.get_hooks("scheduler_job_queues", {}).get(self.method):
+			if queue[-1] in get_queues_timeout():
+				return queue[-1]
+
 		return "long" if ("Long" in self.frequency) else "default"
 
 	def on_trash(self):
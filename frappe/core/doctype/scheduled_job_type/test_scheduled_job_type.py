@@ -1,6 +1,7 @@
 # Copyright (c) 2019, Frappe Technologies and Contributors
 # License: MIT. See LICENSE
 from datetime import timedelta
+from unittest.mock import patch
 
 import frappe
 from frappe.core.doctype.scheduled_job_type.scheduled_job_type import sync_jobs
@@ -76,6 +77,20 @@ class TestScheduledJobType(FrappeTestCase):
 		self.assertFalse(job.is_event_due(get_datetime("2019-01-01 00:05:06")))
 		self.assertFalse(job.is_event_due(get_datetime("2019-01-01 00:14:59")))
 
+	def test_job_queue(self):
+		job = frappe.get_doc(
+			"Scheduled Job Type",
+			dict(method="frappe.integrations.doctype.webhook.webhook.retry_webhook_requests"),
+		)
+		self.assertEqual(job.cron_format, "* * * * *")
+		# its own queue is only used if workers are configured for it
+		self.assertEqual(job.get_queue_name(), "default")
+		with patch(
+			"frappe.core.doctype.scheduled_job_type.scheduled_job_type.get_queues_timeout",
+			return_value={"default": 300, "webhook_retry": 300},
+		):
+			self.assertEqual(job.get_queue_name(), "webhook_retry")
+
 	def test_cold_start(self):
 		now = now_datetime()
 		just_before_12_am = now.replace(hour=11, minute=59, second=30)
@@ -65,13 +65,23 @@ def get_db(host=None, user=None, password=None, port=None, cur_db_name=None):
 
 
 def get_command(
-	host=None, port=None, user=None, password=None, db_name=None, extra=None, dump=False
+	host=None,
+	port=None,
+	user=None,
+	password=None,
+	db_name=None,
+	extra=None,
+	dump=False,
+	restore_dump=False,
 ):
 	import frappe
 
 	if frappe.conf.db_type == "postgres":
 		if dump:
 			bin, bin_name = which("pg_dump"), "pg_dump"
+		elif restore_dump:
+			# dumps in the directory format of `pg_dump`
+			bin, bin_name = which("pg_restore"), "pg_restore"
 		else:
 			bin, bin_name = which("psql"), "psql"
 
@@ -85,7 +95,7 @@ def get_command(
 		else:
 			conn_string = f"postgresql://{user}@{host}:{port}/{db_name}"
 
-		command = [conn_string]
+		command = [f"--dbname={conn_string}" if restore_dump else conn_string]
 
 		if extra:
 			command.extend(extra)
@@ -9,7 +9,7 @@ import string
 import traceback
 from collections.abc import Iterable, Sequence
 from contextlib import contextmanager, suppress
-from time import time
+from time import perf_counter, time
 from typing import TYPE_CHECKING, Any, Union
 
 from pypika.dialects import MySQLQueryBuilder, PostgreSQLQueryBuilder
@@ -17,6 +17,12 @@ from pypika.dialects import MySQLQueryBuilder, PostgreSQLQueryBuilder
 import frappe
 import frappe.defaults
 from frappe import _
+from frappe.database.query_cache import (
+	add_read_tables,
+	bump_table_versions,
+	cached_sql,
+	get_written_tables,
+)
 from frappe.database.utils import (
 	DefaultOrderBy,
 	EmptyQueryValues,
@@ -27,7 +33,7 @@ from frappe.database.utils import (
 	is_query_type,
 )
 from frappe.exceptions import DoesNotExistError, ImplicitCommitError
-from frappe.monitor import get_trace_id
+from frappe.monitor import get_profile, get_trace_id
 from frappe.query_builder.functions import Count
 from frappe.utils import CallbackManager
 from frappe.utils import cast as cast_fieldtype
@@ -86,6 +92,9 @@ class Database:
 
 		self.transaction_writes = 0
 		self.auto_commit_on_many_writes = 0
+		# tables written in current transaction, see `frappe.database.query_cache`
+		self.written_tables = set()
+		self.transaction_started_at = 0
 
 		self.value_cache = {}
 		self.logger = frappe.logger("database")
@@ -106,6 +115,7 @@ class Database:
 		"""Connects to a database as set in `site_config.json`."""
 		self._conn: Union["MariadbConnection", "PostgresConnection"] = self.get_connection()
 		self._cursor: Union["MariadbCursor", "PostgresCursor"] = self._conn.cursor()
+		self.transaction_started_at = time()
 
 		try:
 			if execution_timeout := get_query_execution_timeout():
@@ -154,6 +164,7 @@ class Database:
 		run=True,
 		pluck=False,
 		as_iterator=False,
+		chunk_size=SQL_ITERATOR_BATCH_SIZE,
 	):
 		"""Execute a SQL query and fetch all rows.
 
@@ -171,6 +182,7 @@ class Database:
 		:param as_iterator: Returns iterator over results instead of fetching all results at once.
 		        This should be used with unbuffered cursor as default cursors used by pymysql and postgres
 		        buffer the results internally. See `Database.unbuffered_cursor`.
+		:param chunk_size: Number of rows fetched from the cursor at a time with `as_iterator`.
 		Examples:
 
 		        # return customer names as dicts
@@ -204,6 +216,7 @@ class Database:
 		# in transaction validations
 		self.check_transaction_status(query)
 		self.clear_db_table_cache(query)
+		add_read_tables(query)
 
 		if auto_commit:
 			self.commit()
@@ -218,9 +231,15 @@ class Database:
 
 		query, values = self._transform_query(query, values)
 
+		# profiled without the trace id, so that queries can be compared across transactions
+		profiled_query = query
+
 		if trace_id := get_trace_id():
 			query += f" /* FRAPPE_TRACE_ID: {trace_id} */"
 
+		if profile := get_profile():
+			query_start = perf_counter()
+
 		try:
 			self._cursor.execute(query, values)
 		except Exception as e:
@@ -260,6 +279,9 @@ class Database:
 			):
 				raise
 
+		if profile:
+			profile.record_query(profiled_query, perf_counter() - query_start)
+
 		if debug:
 			time_end = time()
 			frappe.errprint(f"Execution time: {time_end - time_start:.2f} sec")
@@ -273,7 +295,9 @@ class Database:
 			return ()
 
 		if as_iterator:
-			return self._return_as_iterator(pluck=pluck, as_dict=as_dict, as_list=as_list, update=update)
+			return self._return_as_iterator(
+				pluck=pluck, as_dict=as_dict, as_list=as_list, update=update, chunk_size=chunk_size
+			)
 
 		last_result = self._transform_result(self._cursor.fetchall())
 		if pluck:
@@ -294,8 +318,8 @@ class Database:
 		self._clean_up()
 		return last_result
 
-	def _return_as_iterator(self, *, pluck, as_dict, as_list, update):
-		while result := self._transform_result(self._cursor.fetchmany(SQL_ITERATOR_BATCH_SIZE)):
+	def _return_as_iterator(self, *, pluck, as_dict, as_list, update, chunk_size=SQL_ITERATOR_BATCH_SIZE):
+		while result := self._transform_result(self._cursor.fetchmany(chunk_size)):
 			if pluck:
 				for row in result:
 					yield row[0]
@@ -415,6 +439,7 @@ class Database:
 			self.transaction_writes = 0
 
 		if query[:6].lower() in ("update", "insert", "delete"):
+			self.written_tables.update(get_written_tables(query))
 			self.transaction_writes += 1
 			if self.transaction_writes > self.MAX_WRITES_PER_TRANSACTION:
 				if self.auto_commit_on_many_writes:
@@ -424,6 +449,9 @@ class Database:
 					msg += _("The changes have been reverted.") + "<br>"
 					raise frappe.TooManyWritesError(msg)
 
+		elif query[:8].lower().startswith(("truncate", "drop", "alter", "rename", "replace")):
+			self.written_tables.update(get_written_tables(query))
+
 	def check_implicit_commit(self, query: str):
 		if (
 			self.transaction_writes
@@ -473,6 +501,7 @@ class Database:
 		pluck=False,
 		distinct=False,
 		skip_locked=False,
+		query_cache=False,
 	):
 		"""Return a document property or list of properties.
 
@@ -487,6 +516,8 @@ class Database:
 		:param pluck: pluck first column instead of returning as nested list or dict.
 		:param for_update: All the affected/read rows will be locked.
 		:param skip_locked: Skip selecting currently locked rows.
+		:param query_cache: Cache result in Redis until the table changes, `True` or TTL in seconds.
+		        See `frappe.database.query_cache`.
 
 		Example:
 
@@ -518,6 +549,7 @@ class Database:
 			distinct=distinct,
 			limit=1,
 			skip_locked=skip_locked,
+			query_cache=query_cache,
 		)
 
 		if not run:
@@ -551,6 +583,7 @@ class Database:
 		distinct=False,
 		limit=None,
 		skip_locked=False,
+		query_cache=False,
 	):
 		"""Return multiple document properties.
 
@@ -562,6 +595,7 @@ class Database:
 		:param debug: Print query in error log.
 		:param order_by: Column to order by,
 		:param distinct: Get Distinct results.
+		:param query_cache: Cache result in Redis until the table changes, `True` or TTL in seconds.
 
 		Example:
 
@@ -618,6 +652,7 @@ class Database:
 						limit=limit,
 						for_update=for_update,
 						skip_locked=skip_locked,
+						query_cache=query_cache,
 					)
 				except Exception as e:
 					if ignore and (frappe.db.is_missing_column(e) or frappe.db.is_table_missing(e)):
@@ -719,7 +754,7 @@ class Database:
 			return frappe._dict(queried_result)
 
 		try:
-			meta = frappe.get_meta(doctype)
+			meta = frappe.get_compiled_meta(doctype)
 		except DoesNotExistError:
 			return frappe._dict(queried_result)
 
@@ -821,7 +856,7 @@ class Database:
 		).run()
 		val = val[0][0] if val else None
 
-		df = frappe.get_meta(doctype).get_field(fieldname)
+		df = frappe.get_compiled_meta(doctype).get_field(fieldname)
 
 		if not df:
 			frappe.throw(
@@ -856,6 +891,7 @@ class Database:
 		pluck=False,
 		distinct=False,
 		limit=None,
+		query_cache=False,
 	):
 		query = frappe.qb.get_query(
 			table=doctype,
@@ -871,6 +907,12 @@ class Database:
 		if isinstance(fields, str) and fields == "*":
 			as_dict = True
 
+		if query_cache and run and not (for_update or getattr(query, "_child_queries", None)):
+			sql, params = query.walk()
+			return cached_sql(
+				sql, params, ttl=query_cache, as_dict=as_dict, debug=debug, update=update, pluck=pluck
+			)
+
 		return query.run(as_dict=as_dict, debug=debug, update=update, run=run, pluck=pluck)
 
 	def _get_value_for_many_names(
@@ -928,6 +970,7 @@ class Database:
 		:param update_modified: default True. Set as false, if you don't want to update the timestamp.
 		:param debug: Print the query in the developer / js console.
 		"""
+		from frappe.desk.link_search_index import get_names_to_reindex, reindex
 		from frappe.model.utils import is_single_doctype
 
 		if dn is None or dt == dn:
@@ -967,7 +1010,11 @@ class Database:
 		for column, value in to_update.items():
 			query = query.set(column, value)
 
+		# documents are looked up before their indexed fields change
+		names_to_reindex = get_names_to_reindex(dt, dn, to_update)
 		query.run(debug=debug)
+		if names_to_reindex:
+			reindex(dt, names_to_reindex)
 
 		if dt in self.value_cache:
 			del self.value_cache[dt]
@@ -1010,6 +1057,7 @@ class Database:
 	def begin(self, *, read_only=False):
 		read_only = read_only or frappe.flags.read_only
 		mode = "READ ONLY" if read_only else ""
+		self.transaction_started_at = time()
 		self.sql(f"START TRANSACTION {mode}")
 
 	def commit(self):
@@ -1020,6 +1068,11 @@ class Database:
 		self.before_commit.run()
 
 		self.sql("commit")
+
+		if self.written_tables:
+			bump_table_versions(self.written_tables)
+			self.written_tables = set()
+
 		self.begin()  # explicitly start a new transaction
 
 		self.after_commit.run()
@@ -1035,6 +1088,7 @@ class Database:
 			self.before_rollback.run()
 
 			self.sql("rollback")
+			self.written_tables = set()
 			self.begin()
 
 			self.after_rollback.run()
@@ -1,3 +1,5 @@
+import os
+
 import frappe
 from frappe import _
 
@@ -65,23 +67,51 @@ class DbManager:
 
 	@staticmethod
 	def restore_database(verbose, target, source, user, password):
+		from frappe.utils import execute_in_shell
+		from frappe.utils.backups import is_parallel_dump, restore_parallel_dump
+
+		if os.path.isdir(source) and is_parallel_dump(source):
+			restore_parallel_dump(
+				source,
+				lambda file, jobs=None: DbManager.get_restore_command(
+					target, file, user, password, jobs=jobs
+				),
+				verbose=verbose,
+			)
+		else:
+			execute_in_shell(
+				DbManager.get_restore_command(target, source, user, password),
+				check_exit_code=True,
+				verbose=verbose,
+			)
+
+		frappe.cache.delete_keys("")  # Delete all keys associated with this site.
+
+	@staticmethod
+	def get_restore_command(target, source, user, password, jobs=None) -> str:
 		import shlex
 		from shutil import which
 
 		from frappe.database import get_command
-		from frappe.utils import execute_in_shell
 
 		command = ["set -o pipefail;"]
+		extra = None
+		restore_dump = os.path.isdir(source)
+
+		if restore_dump:
+			# rows dumped by `pg_dump` in its directory format, see `take_parallel_dump`
+			extra = ["--data-only", "--no-owner", f"--jobs={jobs or 1}", source]
+			source = []
 
-		if source.endswith(".gz"):
+		elif source.endswith(".gz"):
 			if gzip := which("gzip"):
-				command.extend([gzip, "-cd", source, "|"])
+				command.extend([gzip, "-cd", shlex.quote(source), "|"])
 				source = []
 			else:
 				raise Exception("`gzip` not installed")
 
 		else:
-			source = ["<", source]
+			source = ["<", shlex.quote(source)]
 
 		bin, args, bin_name = get_command(
 			host=frappe.conf.db_host,
@@ -89,6 +119,8 @@ class DbManager:
 			user=user,
 			password=password,
 			db_name=target,
+			extra=extra,
+			restore_dump=restore_dump,
 		)
 		if not bin:
 			frappe.throw(
@@ -98,5 +130,4 @@ class DbManager:
 		command.append(bin)
 		command.append(shlex.join(args))
 		command.extend(source)
-		execute_in_shell(" ".join(command), check_exit_code=True, verbose=verbose)
-		frappe.cache.delete_keys("")  # Delete all keys associated with this site.
+		return " ".join(command)
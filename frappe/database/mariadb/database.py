@@ -307,6 +307,22 @@ class MariaDBDatabase(MariaDBConnectionUtil, MariaDBExceptionUtil, Database):
 				)
 			)
 
+	def create_link_search_index_table(self):
+		if "__link_search_index" not in self.get_tables():
+			self.sql(
+				"""create table __link_search_index(
+				doctype varchar(140) not null,
+				name varchar({0}) not null,
+				gram varchar(4) not null,
+				primary key (doctype, gram, name),
+				index `doctype_name` (doctype, name))
+				COLLATE=utf8mb4_bin
+				ENGINE=InnoDB
+				CHARACTER SET=utf8mb4""".format(
+					self.VARCHAR_LEN
+				)
+			)
+
 	def create_user_settings_table(self):
 		self.sql_ddl(
 			"""create table if not exists __UserSettings (
@@ -302,6 +302,21 @@ class PostgresDatabase(PostgresExceptionUtil, Database):
 				)
 			)
 
+	def create_link_search_index_table(self):
+		if "__link_search_index" not in self.get_tables():
+			self.sql(
+				"""create table "__link_search_index"(
+				doctype varchar(140) not null,
+				name varchar({0}) not null,
+				gram varchar(4) not null,
+				primary key (doctype, gram, name))""".format(
+					self.VARCHAR_LEN
+				)
+			)
+			self.sql(
+				"""create index "link_search_index_doctype_name" on "__link_search_index" (doctype, name)"""
+			)
+
 	def create_user_settings_table(self):
 		self.sql_ddl(
 			"""create table if not exists "__UserSettings" (
@@ -179,7 +179,7 @@ class Engine:
 
 		# apply implicit join if child table is referenced
 		if doctype and doctype != self.doctype:
-			meta = frappe.get_meta(doctype)
+			meta = frappe.get_compiled_meta(doctype)
 			table = frappe.qb.DocType(doctype)
 			if meta.istable and not self.query.is_joined(table):
 				self.query = self.query.left_join(table).on(
@@ -197,7 +197,7 @@ class Engine:
 			hierarchy = _operator
 			docname = _value
 
-			_df = frappe.get_meta(self.doctype).get_field(field)
+			_df = frappe.get_compiled_meta(self.doctype).get_field(field)
 			ref_doctype = _df.options if _df else self.doctype
 
 			nodes = get_nested_set_hierarchy_result(ref_doctype, docname, hierarchy)
@@ -411,7 +411,7 @@ class DynamicTableField:
 				return ChildTableField(child_doctype, child_field, doctype, alias=alias)
 			else:
 				linked_fieldname, fieldname = field.split(".")
-				linked_field = frappe.get_meta(doctype).get_field(linked_fieldname)
+				linked_field = frappe.get_compiled_meta(doctype).get_field(linked_fieldname)
 				linked_doctype = linked_field.options
 				if linked_field.fieldtype == "Link":
 					return LinkTableField(linked_doctype, fieldname, doctype, linked_fieldname, alias=alias)
@@ -486,7 +486,7 @@ class ChildQuery:
 		fields: list,
 		parent_doctype: str,
 	) -> None:
-		field = frappe.get_meta(parent_doctype).get_field(fieldname)
+		field = frappe.get_compiled_meta(parent_doctype).get_field(fieldname)
 		if field.fieldtype not in frappe.model.table_fields:
 			return
 		self.fieldname = fieldname
@@ -0,0 +1,139 @@
+# Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+
+"""
+Shared (Redis) cache for results of read queries.
+
+Entries are keyed on the query and the current version of every table it reads. The version
+of each table written in a transaction is changed when the transaction commits (see
+`Database.commit`), so an entry is never served once any of its tables has changed.
+
+Example:
+
+	frappe.get_all("Item Group", fields=["name", "parent_item_group"], cache=True)
+"""
+
+import hashlib
+import json
+import re
+from contextlib import contextmanager
+from time import time
+
+import redis
+
+import frappe
+from frappe.database.utils import EmptyQueryValues
+
+VERSIONS_KEY = "query_cache_versions"
+DEFAULT_TTL = 600
+# allowance for clock differences between servers when comparing commit and transaction start times
+CLOCK_SKEW = 1
+
+TABLE_PATTERN = re.compile(r'[`"](tab[^`"]+)[`"]|\b(tab\w+)')
+
+
+def get_tables(query: str) -> set[str]:
+	"""Return names of tables referred to in the query (and possibly a few other identifiers)."""
+	return {quoted or plain for quoted, plain in TABLE_PATTERN.findall(query)}
+
+
+def get_written_tables(query: str) -> set[str]:
+	if query[:6].lower() == "insert":
+		# only look at `insert into <table>`, rows of multi-row inserts can be large
+		end = query.find("(")
+		if end > 0:
+			query = query[:end]
+
+	return get_tables(query)
+
+
+@contextmanager
+def record_read_tables():
+	"""Collect names of the tables read by queries run in the block.
+
+	with record_read_tables() as tables:
+	        run_report()
+	"""
+	tables = set()
+	outer = getattr(frappe.local, "read_tables", None)
+	frappe.local.read_tables = tables
+	try:
+		yield tables
+	finally:
+		frappe.local.read_tables = outer
+		if outer is not None:
+			outer.update(tables)
+
+
+def add_read_tables(query: str, tables=None) -> None:
+	if (read_tables := getattr(frappe.local, "read_tables", None)) is not None:
+		read_tables.update(get_tables(query) if tables is None else tables)
+
+
+def bump_table_versions(tables: set[str]) -> None:
+	"""Change versions of given tables, invalidating cached results of queries reading them."""
+	version = f"{time()}:{frappe.generate_hash(length=8)}"
+
+	try:
+		pipeline = frappe.cache.pipeline()
+		pipeline.hset(frappe.cache.make_key(VERSIONS_KEY), mapping=dict.fromkeys(tables, version))
+		pipeline.execute()
+	except redis.exceptions.ConnectionError:
+		pass
+
+
+def get_table_versions(tables: list[str]) -> list[str]:
+	key = frappe.cache.make_key(VERSIONS_KEY)
+	versions = frappe.cache.hmget(key, tables)
+
+	if missing := [table for table, version in zip(tables, versions) if version is None]:
+		# tables not written since the versions were cleared, any random version will do
+		pipeline = frappe.cache.pipeline()
+		for table in missing:
+			pipeline.hsetnx(key, table, f"0:{frappe.generate_hash(length=8)}")
+		pipeline.hmget(key, tables)
+		versions = pipeline.execute()[-1]
+
+	return [frappe.safe_decode(version) for version in versions]
+
+
+def cached_sql(query: str, values=EmptyQueryValues, *, ttl: int | bool = True, **kwargs):
+	"""Run a read query through `frappe.db.sql` and cache its result for `ttl` seconds (default 600).
+
+	Every call returns its own copy of the result, it can be modified."""
+	db = frappe.db
+	tables = sorted(get_tables(query))
+	add_read_tables(query, tables)
+
+	# uncommitted writes of the current transaction aren't visible to others
+	if not tables or db.written_tables.intersection(tables):
+		return db.sql(query, values, **kwargs)
+
+	try:
+		versions = get_table_versions(tables)
+	except redis.exceptions.ConnectionError:
+		return db.sql(query, values, **kwargs)
+
+	digest = hashlib.sha1(
+		json.dumps(
+			[query, None if values is EmptyQueryValues else values, kwargs, versions],
+			sort_keys=True,
+			default=str,
+		).encode()
+	).hexdigest()
+	key = f"query_cache:{digest}"
+
+	result = frappe.cache.get_value(key, expires=True)
+	if result is not None:
+		return result
+
+	result = db.sql(query, values, **kwargs)
+
+	# the transaction may read a snapshot older than the latest commit to one of the tables,
+	# cache only when all tables were last committed before it started
+	started = db.transaction_started_at - CLOCK_SKEW
+	if all(float(version.split(":", 1)[0]) < started for version in versions):
+		ttl = DEFAULT_TTL if ttl is True else int(ttl)
+		frappe.cache.set_value(key, result, expires_in_sec=ttl)
+
+	return result
@@ -1,16 +1,22 @@
 import json
+import time
 from typing import TYPE_CHECKING, Union
 
 import redis
 
 import frappe
-from frappe.utils import cstr
+from frappe.utils import cint, cstr, flt
 
 if TYPE_CHECKING:
 	from frappe.model.document import Document
 
 queue_prefix = "insert_queue_for_"
 
+# number of queued items fetched and inserted together
+DEFAULT_BATCH_SIZE = 500
+# seconds a flush may run for, remaining items are flushed on the next run
+DEFAULT_TIME_BUDGET = 120
+
 
 def deferred_insert(doctype: str, records: list[Union[dict, "Document"]] | str):
 	if isinstance(records, (dict, list)):
@@ -26,21 +32,58 @@ def deferred_insert(doctype: str, records: list[Union[dict, "Document"]] | str):
 
 
 def save_to_db():
-	queue_keys = frappe.cache.get_keys(queue_prefix)
-	for key in queue_keys:
-		record_count = 0
-		queue_key = get_key_name(key)
+	"""Insert queued records.
+
+	Queues are drained in batches (`deferred_insert_batch_size` items, fetched and removed in
+	one round trip) until they are empty or `deferred_insert_time_budget` seconds have passed."""
+	batch_size = cint(frappe.conf.get("deferred_insert_batch_size")) or DEFAULT_BATCH_SIZE
+	deadline = time.monotonic() + (
+		flt(frappe.conf.get("deferred_insert_time_budget")) or DEFAULT_TIME_BUDGET
+	)
+
+	for key in frappe.cache.get_keys(queue_prefix):
 		doctype = get_doctype_name(key)
-		while frappe.cache.llen(queue_key) > 0 and record_count <= 500:
-			records = frappe.cache.lpop(queue_key)
-			records = json.loads(records.decode("utf-8"))
-			if isinstance(records, dict):
-				record_count += 1
-				insert_record(records, doctype)
-				continue
-			for record in records:
-				record_count += 1
-				insert_record(record, doctype)
+
+		while time.monotonic() < deadline and (items := pop_items(key, batch_size)):
+			records = []
+			for item in items:
+				item = json.loads(item.decode("utf-8"))
+				if isinstance(item, dict):
+					records.append(item)
+				else:
+					records.extend(item)
+
+			insert_records(records, doctype)
+
+
+def pop_items(key: bytes, count: int) -> list[bytes]:
+	"""Remove and return up to `count` items from the start of the queue stored at (full) `key`."""
+	pipeline = frappe.cache.pipeline()
+	pipeline.lrange(key, 0, count - 1)
+	pipeline.ltrim(key, count, -1)
+	items, _ = pipeline.execute()
+	return items
+
+
+def insert_records(records: list[dict], doctype: str):
+	"""Insert records using batched queries, if that fails insert them one by one so that only
+	the failing records are dropped."""
+	if not records:
+		return
+
+	savepoint = "deferred_insert"
+	frappe.db.savepoint(savepoint)
+
+	try:
+		frappe.insert_many(
+			({**record, "doctype": doctype} for record in records), chunk_size=len(records)
+		)
+	except Exception:
+		frappe.db.rollback(save_point=savepoint)
+		for record in records:
+			insert_record(record, doctype)
+	else:
+		frappe.db.release_savepoint(savepoint)
 
 
 def insert_record(record: Union[dict, "Document"], doctype: str):
@@ -0,0 +1,215 @@
+# Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+
+"""
+Optional n-gram index of the fields searched by Link fields (see `search_widget`).
+
+`LIKE %txt%` can't use an index, on large tables every keystroke in a Link field scans the whole
+table. For doctypes with an index, the search is limited to documents having all trigrams of the
+typed text in `__link_search_index`, in the same query applying permission conditions and
+filters.
+
+Text shorter than a trigram (one or two characters) is looked up as a word prefix, it only
+matches documents with a word starting with it, instead of containing it anywhere like
+`LIKE %txt%` does. Text with LIKE wildcards is searched without the index.
+
+Build the index of a doctype once, it is kept up to date on every change after that:
+
+	bench --site mysite build-link-search-index --doctype Customer
+"""
+
+import json
+import re
+import unicodedata
+from functools import partial
+
+import frappe
+from frappe.utils import unique
+
+INDEX_TABLE = "__link_search_index"
+INDEXED_DOCTYPES_KEY = "link_search_index_doctypes"
+GRAM_LENGTH = 3
+BUILD_CHUNK_SIZE = 5000
+INSERT_BATCH_SIZE = 10_000
+
+WORD_PATTERN = re.compile(r"\w+")
+LIKE_WILDCARDS = ("%", "_")
+
+
+def get_indexed_doctypes() -> list[str]:
+	return json.loads(frappe.db.get_default(INDEXED_DOCTYPES_KEY) or "[]")
+
+
+def normalize(value) -> str:
+	"""Case and accent insensitive form of the value, similar to the database's collation."""
+	value = unicodedata.normalize("NFKD", str(value).casefold())
+	return "".join(c for c in value if not unicodedata.combining(c))
+
+
+def get_grams(value) -> set[str]:
+	"""Return trigrams of the value and one and two letter word prefixes, marked with `^`."""
+	value = normalize(value)
+	grams = {value[i : i + GRAM_LENGTH] for i in range(len(value) - GRAM_LENGTH + 1)}
+	for word in WORD_PATTERN.findall(value):
+		prefix_lengths = range(1, min(len(word), GRAM_LENGTH - 1) + 1)
+		grams.update(f"^{word[:length]}" for length in prefix_lengths)
+
+	return grams
+
+
+def get_query_grams(txt: str) -> set[str] | None:
+	txt = normalize(txt)
+	if len(txt) >= GRAM_LENGTH:
+		return {txt[i : i + GRAM_LENGTH] for i in range(len(txt) - GRAM_LENGTH + 1)}
+
+	if WORD_PATTERN.fullmatch(txt):
+		return {f"^{txt}"}
+
+
+def get_search_index_condition(doctype: str, txt: str) -> str | None:
+	"""Return a condition limiting the search of the text to documents matching it in the index.
+
+	Return None if the doctype has no index or the text can't be looked up in it, the text is then
+	searched in all documents. Text shorter than `GRAM_LENGTH` only matches documents with a word
+	starting with it."""
+	if doctype not in get_indexed_doctypes() or any(w in txt for w in LIKE_WILDCARDS):
+		return None
+
+	grams = get_query_grams(txt)
+	if not grams:
+		return None
+
+	escape = partial(frappe.db.escape, percent=False)
+	candidates = (
+		f"select `name` from `{INDEX_TABLE}` where `doctype` = {escape(doctype)}"
+		f" and `gram` in ({', '.join(escape(gram) for gram in sorted(grams))})"
+	)
+	if len(grams) > 1:
+		candidates += f" group by `name` having count(`gram`) = {len(grams)}"
+
+	return f"`tab{doctype}`.`name` in ({candidates})"
+
+
+def get_index_rows(doctype: str, docs, fields: list[str]):
+	for doc in docs:
+		grams = set()
+		for fieldname in fields:
+			if value := doc.get(fieldname):
+				grams.update(get_grams(value))
+
+		yield from ((doctype, doc.name, gram) for gram in grams)
+
+
+def insert_rows(rows):
+	Index = frappe.qb.Table(INDEX_TABLE)
+	for batch in frappe.utils.create_batch(list(rows), INSERT_BATCH_SIZE):
+		query = frappe.qb.into(Index).columns("doctype", "name", "gram").insert(*batch)
+		# rows of a document may have been added concurrently while building the index
+		if frappe.db.db_type == "postgres":
+			query = query.on_conflict().do_nothing()
+		else:
+			query = query.ignore()
+		query.run()
+
+
+def delete_rows(doctype: str, names: list[str] | None = None):
+	filters = {"doctype": doctype}
+	if names is not None:
+		filters["name"] = ("in", names)
+
+	frappe.db.delete(INDEX_TABLE, filters)
+
+
+def update_index(doc, method=None):
+	"""Reindex the document if its doctype has an index, called on every document update."""
+	from frappe.desk.search import get_link_search_fields
+
+	if doc.doctype not in get_indexed_doctypes():
+		return
+
+	fields = get_link_search_fields(doc.meta)
+	if not any(doc.has_value_changed(fieldname) for fieldname in fields):
+		return
+
+	delete_rows(doc.doctype, [doc.name])
+	insert_rows(get_index_rows(doc.doctype, [doc], fields))
+
+
+def get_names_to_reindex(doctype: str, filters, values: dict) -> list[str]:
+	"""Return names of the documents `frappe.db.set_value` is about to update, if any of their
+	indexed fields change."""
+	from frappe.desk.search import get_link_search_fields
+
+	if doctype not in get_indexed_doctypes():
+		return []
+
+	if not set(values).intersection(get_link_search_fields(frappe.get_meta(doctype))):
+		return []
+
+	if isinstance(filters, str):
+		return [filters]
+
+	return frappe.get_all(doctype, filters=filters, pluck="name")
+
+
+def reindex(doctype: str, names: list[str]):
+	"""Reindex documents updated without the ORM, see `get_names_to_reindex`."""
+	from frappe.desk.search import get_link_search_fields
+
+	fields = get_link_search_fields(frappe.get_meta(doctype))
+	docs = frappe.get_all(
+		doctype, filters={"name": ("in", names)}, fields=unique(["name", *fields])
+	)
+	delete_rows(doctype, names)
+	insert_rows(get_index_rows(doctype, docs, fields))
+
+
+def remove_from_index(doc, method=None):
+	if doc.doctype in get_indexed_doctypes():
+		delete_rows(doc.doctype, [doc.name])
+
+
+def rename_in_index(doc, method=None, old=None, new=None, merge=False):
+	from frappe.desk.search import get_link_search_fields
+
+	if doc.doctype not in get_indexed_doctypes():
+		return
+
+	delete_rows(doc.doctype, [old, new])
+	insert_rows(get_index_rows(doc.doctype, [doc], get_link_search_fields(doc.meta)))
+
+
+def build_index(doctype: str):
+	"""(Re)build the index of a doctype and keep it up to date from now on."""
+	from frappe.desk.search import get_link_search_fields
+
+	frappe.db.create_link_search_index_table()
+
+	# documents changed from now on are indexed by `update_index`
+	if doctype not in (doctypes := get_indexed_doctypes()):
+		frappe.db.set_default(INDEXED_DOCTYPES_KEY, json.dumps(sorted(doctypes + [doctype])))
+
+	fields = get_link_search_fields(frappe.get_meta(doctype))
+	delete_rows(doctype)
+
+	cursor = ""
+	while cursor is not None:
+		docs = frappe.get_all(
+			doctype, fields=fields, order_by="name asc", limit=BUILD_CHUNK_SIZE, cursor=cursor
+		)
+		insert_rows(get_index_rows(doctype, docs, fields))
+		cursor = docs.next_cursor
+
+		if not frappe.flags.in_test:
+			frappe.db.commit()
+
+
+def drop_index(doctype: str):
+	"""Stop using and maintaining the index of a doctype."""
+	doctypes = get_indexed_doctypes()
+	if doctype in doctypes:
+		doctypes.remove(doctype)
+		frappe.db.set_default(INDEXED_DOCTYPES_KEY, json.dumps(doctypes))
+
+	if INDEX_TABLE in frappe.db.get_tables():
+		delete_rows(doctype)
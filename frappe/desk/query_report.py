@@ -10,6 +10,7 @@ import frappe
 import frappe.desk.reportview
 from frappe import _
 from frappe.core.utils import ljust_list
+from frappe.desk.report_cache import get_cached_report_result
 from frappe.desk.reportview import clean_params, parse_json
 from frappe.model.utils import render_include
 from frappe.modules import get_module_path, scrub
@@ -193,7 +194,12 @@ def run(
 	is_tree=False,
 	parent_field=None,
 	are_default_filters=True,
+	prepared_report_page_length=None,
 ):
+	"""Return the result of the report.
+
+	For prepared reports, only the first `prepared_report_page_length` rows of the result are
+	returned if set, with the total number of rows as `row_count`."""
 	report = get_report_doc(report_name)
 	if not user:
 		user = frappe.session.user
@@ -216,7 +222,12 @@ def run(
 			dn = filters.pop("prepared_report_name", None)
 		else:
 			dn = ""
-		result = get_prepared_report_result(report, filters, dn, user)
+		result = get_prepared_report_result(
+			report, filters, dn, user, page_length=cint(prepared_report_page_length)
+		)
+	elif report.cache_result:
+		result = get_cached_report_result(report, filters, user, custom_columns, is_tree, parent_field)
+		add_data_to_monitor(report=report.reference_report or report.name)
 	else:
 		result = generate_report_result(report, filters, user, custom_columns, is_tree, parent_field)
 		add_data_to_monitor(report=report.reference_report or report.name)
@@ -262,7 +273,7 @@ def add_custom_column_data(custom_columns, result):
 	return result
 
 
-def get_prepared_report_result(report, filters, dn="", user=None):
+def get_prepared_report_result(report, filters, dn="", user=None, page_length=None):
 	from frappe.core.doctype.prepared_report.prepared_report import get_completed_prepared_report
 
 	def get_report_data(doc, data):
@@ -289,7 +300,13 @@ def get_prepared_report_result(report, filters, dn="", user=None):
 	doc = frappe.get_doc("Prepared Report", dn) if dn else None
 	if doc:
 		try:
-			if data := json.loads(doc.get_prepared_data().decode("utf-8")):
+			if page_length and (result := doc.get_chunked_result()):
+				# only read the rows shown first, more are loaded by `get_prepared_report_rows`
+				with result:
+					page = result.get_page(0, page_length)
+					page["result"] += result.get_total_rows()
+					report_data = get_report_data(doc, result.data | page)
+			elif data := json.loads(doc.get_prepared_data().decode("utf-8")):
 				report_data = get_report_data(doc, data)
 		except Exception:
 			doc.log_error("Prepared report render failed")
@@ -302,7 +319,7 @@ def get_prepared_report_result(report, filters, dn="", user=None):
 @frappe.whitelist()
 def export_query():
 	"""export from query reports"""
-	from frappe.desk.utils import get_csv_bytes, pop_csv_params, provide_binary_file
+	from frappe.desk.utils import get_export_file, pop_csv_params, provide_binary_file, write_csv
 
 	form_params = frappe._dict(frappe.local.form_dict)
 	csv_params = pop_csv_params(form_params)
@@ -337,21 +354,52 @@ def export_query():
 		)
 		return
 
+	if data.prepared_report and data.doc:
+		apply_prepared_report_view(
+			data,
+			form_params.prepared_report_order_by,
+			form_params.prepared_report_order,
+			form_params.prepared_report_filters,
+		)
+
 	format_duration_fields(data)
-	xlsx_data, column_widths = build_xlsx_data(
-		data, visible_idx, include_indentation, include_filters=include_filters
-	)
+	# rows are built while they are written, not all at once
+	xlsx_data = iter_xlsx_data(data, visible_idx, include_indentation, include_filters=include_filters)
+	file = get_export_file()
 
 	if file_format_type == "CSV":
-		content = get_csv_bytes(xlsx_data, csv_params)
+		write_csv(xlsx_data, csv_params, file)
 		file_extension = "csv"
 	elif file_format_type == "Excel":
 		from frappe.utils.xlsxutils import make_xlsx
 
 		file_extension = "xlsx"
-		content = make_xlsx(xlsx_data, "Query Report", column_widths=column_widths).getvalue()
+		make_xlsx(
+			xlsx_data, "Query Report", column_widths=get_column_widths(data.columns), file=file
+		)
+
+	provide_binary_file(report_name, file_extension, file)
 
-	provide_binary_file(report_name, file_extension, content)
+
+def apply_prepared_report_view(data: frappe._dict, order_by=None, order="asc", filters=None):
+	"""Keep the rows of a paged prepared report matching the column filters, sorted the way
+	`get_prepared_report_rows` pages them, with the total row last.
+
+	Only the columns filtered and sorted on are read from the result file."""
+	order_by = None if order_by in (None, "") else order_by
+	filters = frappe.parse_json(filters) or {}
+	if order_by is None and not filters:
+		return
+
+	result = data.doc.get_chunked_result()
+	if not result:
+		return
+
+	with result:
+		positions = result.get_positions(order_by, "desc" if order == "desc" else "asc", filters)
+		total_rows = data.result[result.row_count :]
+
+	data.result = [data.result[i] for i in positions] + total_rows
 
 
 def format_duration_fields(data: frappe._dict) -> None:
@@ -368,6 +416,29 @@ def format_duration_fields(data: frappe._dict) -> None:
 def build_xlsx_data(
 	data, visible_idx, include_indentation, include_filters=False, ignore_visible_idx=False
 ):
+	result = list(
+		iter_xlsx_data(data, visible_idx, include_indentation, include_filters, ignore_visible_idx)
+	)
+	return result, get_column_widths(data.columns)
+
+
+def get_column_widths(columns):
+	column_widths = []
+	for column in columns:
+		if column.get("hidden"):
+			continue
+		column_width = cint(column.get("width", 0))
+		# to convert into scale accepted by openpyxl
+		column_width /= 10
+		column_widths.append(column_width)
+
+	return column_widths
+
+
+def iter_xlsx_data(
+	data, visible_idx, include_indentation, include_filters=False, ignore_visible_idx=False
+):
+	"""Yield the rows of the report as exported, starting with filters (optional) and labels."""
 	EXCEL_TYPES = (
 		str,
 		bool,
@@ -380,16 +451,13 @@ def build_xlsx_data(
 		datetime.timedelta,
 	)
 
-	if len(visible_idx) == len(data.result):
+	if visible_idx is None or len(visible_idx) == len(data.result):
 		# It's not possible to have same length and different content.
 		ignore_visible_idx = True
 	else:
 		# Note: converted for faster lookups
 		visible_idx = set(visible_idx)
 
-	result = []
-	column_widths = []
-
 	if cint(include_filters):
 		filter_data = []
 		filters = data.filters
@@ -403,18 +471,9 @@ def build_xlsx_data(
 			)
 			filter_data.append([cstr(filter_name), filter_value])
 		filter_data.append([])
-		result += filter_data
+		yield from filter_data
 
-	column_data = []
-	for column in data.columns:
-		if column.get("hidden"):
-			continue
-		column_data.append(_(column.get("label")))
-		column_width = cint(column.get("width", 0))
-		# to convert into scale accepted by openpyxl
-		column_width /= 10
-		column_widths.append(column_width)
-	result.append(column_data)
+	yield [_(column.get("label")) for column in data.columns if not column.get("hidden")]
 
 	# build table from result
 	for row_idx, row in enumerate(data.result):
@@ -437,9 +496,7 @@ def build_xlsx_data(
 			elif row:
 				row_data = row
 
-			result.append(row_data)
-
-	return result, column_widths
+			yield row_data
 
 
 def add_total_row(result, columns, meta=None, is_tree=False, parent_field=None):
@@ -0,0 +1,142 @@
+# Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+
+"""
+Cache of query and script report results, enabled with "Cache Result" on the Report.
+
+Results are keyed on the report, its filters and the user, they are never shared between users:
+rows a user can see also depend on document ownership, shares, permission query hooks and on
+reports reading `frappe.session.user`.
+Every entry has the version of each table read while running the report (see
+`frappe.database.query_cache`). An entry is fresh until one of these tables changes or it is
+older than the cache duration of the report. A stale entry is still returned for as long again,
+while a background job runs the report to replace it (stale-while-revalidate).
+"""
+
+import hashlib
+import json
+from time import time
+
+import redis
+
+import frappe
+from frappe.database.query_cache import CLOCK_SKEW, get_table_versions, record_read_tables
+from frappe.utils import cint
+
+DEFAULT_CACHE_DURATION = 300
+
+
+def get_cached_report_result(
+	report, filters=None, user=None, custom_columns=None, is_tree=False, parent_field=None
+):
+	"""Return the result of `generate_report_result` from the cache if possible."""
+	user = user or frappe.session.user
+	args = (filters, user, custom_columns, is_tree, parent_field)
+
+	try:
+		key = get_cache_key(report, *args)
+		entry = frappe.cache.get_value(key)
+		if entry and not is_fresh(entry, get_cache_duration(report)):
+			enqueue_refresh(key, report, *args)
+	except redis.exceptions.ConnectionError:
+		return run_report(report, *args)
+
+	if entry:
+		return entry["result"]
+
+	return run_and_cache(key, report, *args)
+
+
+def run_report(report, filters, user, custom_columns, is_tree, parent_field):
+	from frappe.desk.query_report import generate_report_result
+
+	return generate_report_result(report, filters, user, custom_columns, is_tree, parent_field)
+
+
+def run_and_cache(key, report, *args):
+	started = time()
+	with record_read_tables() as tables:
+		result = run_report(report, *args)
+
+	tables = sorted(tables)
+	try:
+		versions = get_table_versions(tables)
+		# a table was changed while the report ran, the result may be older than its version
+		if any(float(version.split(":", 1)[0]) >= started - CLOCK_SKEW for version in versions):
+			started = 0
+
+		frappe.cache.set_value(
+			key,
+			{"result": result, "tables": tables, "versions": versions, "cached_at": started},
+			# stale entries are returned for another cache duration while being refreshed
+			expires_in_sec=2 * get_cache_duration(report),
+		)
+	except redis.exceptions.ConnectionError:
+		pass
+
+	return result
+
+
+def is_fresh(entry, duration):
+	return time() - entry["cached_at"] < duration and (
+		get_table_versions(entry["tables"]) == entry["versions"]
+	)
+
+
+def enqueue_refresh(key, report, filters, user, custom_columns, is_tree, parent_field):
+	frappe.enqueue(
+		refresh_cached_report_result,
+		job_id=key,
+		deduplicate=True,
+		key=key,
+		report_name=report.get("custom_report") or report.name,
+		filters=filters,
+		user=user,
+		custom_columns=custom_columns,
+		is_tree=is_tree,
+		parent_field=parent_field,
+	)
+
+
+def refresh_cached_report_result(
+	key, report_name, filters, user, custom_columns, is_tree, parent_field
+):
+	from frappe.desk.query_report import get_report_doc
+
+	run_and_cache(
+		key, get_report_doc(report_name), filters, user, custom_columns, is_tree, parent_field
+	)
+
+
+def get_cache_duration(report) -> int:
+	return cint(report.cache_duration) or DEFAULT_CACHE_DURATION
+
+
+def get_cache_key(report, filters, user, custom_columns, is_tree, parent_field) -> str:
+	if isinstance(filters, str):
+		filters = json.loads(filters)
+
+	digest = hashlib.sha1(
+		json.dumps(
+			[
+				report.get("custom_report") or report.name,
+				report.modified,
+				filters,
+				custom_columns,
+				bool(is_tree),
+				parent_field,
+				user,
+				get_permission_fingerprint(user),
+			],
+			sort_keys=True,
+			default=str,
+		).encode()
+	).hexdigest()
+	return f"report_cache:{digest}"
+
+
+def get_permission_fingerprint(user) -> list:
+	"""Entries of a user are replaced when their roles or user permissions change."""
+	from frappe.core.doctype.user_permission.user_permission import get_user_permissions
+
+	return [sorted(frappe.get_roles(user)), get_user_permissions(user)]
@@ -3,6 +3,7 @@
 
 """build query for doclistview and return results"""
 
+import itertools
 import json
 
 import frappe
@@ -25,7 +26,10 @@ def get():
 		controller = get_controller(args.doctype)
 		data = compress(controller.get_list(args))
 	else:
-		data = compress(execute(**args), args=args)
+		result = execute(**args)
+		data = compress(result, args=args)
+		if args.cursor is not None and data:
+			data["next_cursor"] = result.next_cursor
 	return data
 
 
@@ -333,11 +337,12 @@ def delete_report(name):
 @frappe.read_only()
 def export_query():
 	"""export from report builder"""
-	from frappe.desk.utils import get_csv_bytes, pop_csv_params, provide_binary_file
+	from frappe.desk.utils import get_export_file, pop_csv_params, provide_binary_file, write_csv
 
 	form_params = get_form_params()
 	form_params["limit_page_length"] = None
 	form_params["as_list"] = True
+	form_params.pop("with_comment_count", None)
 	doctype = form_params.pop("doctype")
 	file_format_type = form_params.pop("file_format_type")
 	title = form_params.pop("title", doctype)
@@ -356,31 +361,61 @@ def export_query():
 		filters=form_params.filters,
 	)
 
+	# rows are streamed from the database and written to the file one by one, no other
+	# queries can be run until all of them are written
 	db_query = DatabaseQuery(doctype)
-	ret = db_query.execute(**form_params)
+	ret = db_query.execute(**form_params, as_iterator=True)
 
-	if add_totals_row:
-		ret = append_totals_row(ret)
-
-	data = [[_("Sr")] + get_labels(db_query.fields, doctype)]
-	data.extend([i + 1] + list(row) for i, row in enumerate(ret))
-	data = handle_duration_fieldtype_values(doctype, data, db_query.fields)
+	header = [_("Sr")] + get_labels(db_query.fields, doctype)
+	rows = get_export_rows(ret, doctype, db_query.fields, add_totals_row)
+	file = get_export_file()
 
 	if file_format_type == "CSV":
 		from frappe.utils.xlsxutils import handle_html
 
 		file_extension = "csv"
-		content = get_csv_bytes(
-			[[handle_html(frappe.as_unicode(v)) if isinstance(v, str) else v for v in r] for r in data],
+		write_csv(
+			(
+				[handle_html(frappe.as_unicode(v)) if isinstance(v, str) else v for v in r]
+				for r in itertools.chain([header], rows)
+			),
 			csv_params,
+			file,
 		)
 	elif file_format_type == "Excel":
 		from frappe.utils.xlsxutils import make_xlsx
 
 		file_extension = "xlsx"
-		content = make_xlsx(data, doctype).getvalue()
+		make_xlsx(itertools.chain([header], rows), doctype, file=file)
+
+	provide_binary_file(title, file_extension, file)
+
+
+def get_export_rows(rows, doctype, fields, add_totals_row=False):
+	"""Yield rows of an export prefixed with their serial number, formatted one at a time.
 
-	provide_binary_file(title, file_extension, content)
+	Fields are looked up before the first row is read, so that `rows` can be read from an
+	unbuffered cursor."""
+	duration_fields = get_duration_fields(doctype, fields)
+	totals = None
+	serial_no = 0
+
+	def format_row(row):
+		for index, df in duration_fields.items():
+			if row[index]:
+				row[index] = format_duration(row[index], df.hide_days)
+		return row
+
+	for serial_no, row in enumerate(rows, 1):
+		row = list(row)
+		if add_totals_row:
+			totals = add_to_totals(totals or [""] * len(row), row)
+		yield [serial_no] + format_row(row)
+
+	if totals:
+		if not isinstance(totals[0], (int, float)):
+			totals[0] = "Total"
+		yield [serial_no + 1] + format_row(totals)
 
 
 def append_totals_row(data):
@@ -391,9 +426,7 @@ def append_totals_row(data):
 	totals.extend([""] * len(data[0]))
 
 	for row in data:
-		for i in range(len(row)):
-			if isinstance(row[i], (float, int)):
-				totals[i] = (totals[i] or 0) + row[i]
+		add_to_totals(totals, row)
 
 	if not isinstance(totals[0], (int, float)):
 		totals[0] = "Total"
@@ -403,6 +436,14 @@ def append_totals_row(data):
 	return data
 
 
+def add_to_totals(totals, row):
+	for i in range(len(row)):
+		if isinstance(row[i], (float, int)):
+			totals[i] = (totals[i] or 0) + row[i]
+
+	return totals
+
+
 def get_labels(fields, doctype):
 	"""get column labels based on column names"""
 	labels = []
@@ -429,8 +470,10 @@ def get_labels(fields, doctype):
 	return labels
 
 
-def handle_duration_fieldtype_values(doctype, data, fields):
-	for field in fields:
+def get_duration_fields(doctype, fields):
+	"""Return Duration docfields of the fields, by their index in `fields`."""
+	duration_fields = {}
+	for index, field in enumerate(fields):
 		try:
 			parenttype, fieldname = parse_field(field)
 		except ValueError:
@@ -440,12 +483,17 @@ def handle_duration_fieldtype_values(doctype, data, fields):
 		df = frappe.get_meta(parenttype).get_field(fieldname)
 
 		if df and df.fieldtype == "Duration":
-			index = fields.index(field) + 1
-			for i in range(1, len(data)):
-				val_in_seconds = data[i][index]
-				if val_in_seconds:
-					duration_val = format_duration(val_in_seconds, df.hide_days)
-					data[i][index] = duration_val
+			duration_fields[index] = df
+
+	return duration_fields
+
+
+def handle_duration_fieldtype_values(doctype, data, fields):
+	for index, df in get_duration_fields(doctype, fields).items():
+		for i in range(1, len(data)):
+			val_in_seconds = data[i][index + 1]
+			if val_in_seconds:
+				data[i][index + 1] = format_duration(val_in_seconds, df.hide_days)
 	return data
 
 
@@ -12,12 +12,25 @@ import frappe
 # Backward compatbility
 from frappe import _, is_whitelisted, validate_and_sanitize_search_inputs
 from frappe.database.schema import SPECIAL_CHAR_PATTERN
+from frappe.desk.link_search_index import get_search_index_condition
 from frappe.model.db_query import get_order_by
 from frappe.permissions import has_permission
 from frappe.utils import cint, cstr, unique
 from frappe.utils.data import make_filter_tuple
 
 
+LINK_SEARCH_FIELD_TYPES = {
+	"Data",
+	"Text",
+	"Small Text",
+	"Long Text",
+	"Link",
+	"Select",
+	"Read Only",
+	"Text Editor",
+}
+
+
 def sanitize_searchfield(searchfield: str):
 	if not searchfield:
 		return
@@ -128,28 +141,14 @@ def search_widget(
 	or_filters = []
 
 	# build from doctype
-	if txt:
-		field_types = {
-			"Data",
-			"Text",
-			"Small Text",
-			"Long Text",
-			"Link",
-			"Select",
-			"Read Only",
-			"Text Editor",
-		}
-		search_fields = ["name"]
-		if meta.title_field:
-			search_fields.append(meta.title_field)
-
-		if meta.search_fields:
-			search_fields.extend(meta.get_search_fields())
-
-		for f in search_fields:
-			fmeta = meta.get_field(f.strip())
-			if not meta.translated_doctype and (f == "name" or (fmeta and fmeta.fieldtype in field_types)):
-				or_filters.append([doctype, f.strip(), "like", f"%{txt}%"])
+	if txt and not meta.translated_doctype:
+		for f in get_link_search_fields(meta):
+			or_filters.append([doctype, f, "like", f"%{txt}%"])
+
+		# narrow down to documents matching the search index, if the doctype has one
+		# (short text then only matches word prefixes, see `frappe.desk.link_search_index`)
+		if condition := get_search_index_condition(doctype, txt):
+			filters.append(condition)
 
 	if meta.get("fields", {"fieldname": "enabled", "fieldtype": "Check"}):
 		filters.append([doctype, "enabled", "=", 1])
@@ -232,6 +231,24 @@ def search_widget(
 	return values
 
 
+def get_link_search_fields(meta) -> list[str]:
+	"""Return fields matched against the text typed in a Link field."""
+	search_fields = ["name"]
+	if meta.title_field:
+		search_fields.append(meta.title_field)
+
+	if meta.search_fields:
+		search_fields.extend(meta.get_search_fields())
+
+	fields = []
+	for f in search_fields:
+		fmeta = meta.get_field(f.strip())
+		if f.strip() == "name" or (fmeta and fmeta.fieldtype in LINK_SEARCH_FIELD_TYPES):
+			fields.append(f.strip())
+
+	return unique(fields)
+
+
 def get_std_fields_list(meta, key):
 	# get additional search fields
 	sflist = ["name"]
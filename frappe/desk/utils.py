@@ -1,8 +1,17 @@
 # Copyright (c) 2020, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 
+import os
+from collections.abc import Iterable
+from typing import IO
+
 import frappe
 
+# exports up to this size are kept in memory, larger ones are written to a temporary file which
+# is streamed to the client
+EXPORT_SPOOL_SIZE = 10 * 1024 * 1024
+CSV_WRITE_BUFFER_SIZE = 64 * 1024
+
 
 def validate_route_conflict(doctype, name):
 	"""
@@ -51,10 +60,45 @@ def get_csv_bytes(data: list[list], csv_params: dict) -> bytes:
 	return file.getvalue().encode("utf-8")
 
 
-def provide_binary_file(filename: str, extension: str, content: bytes) -> None:
-	"""Provide a binary file to the client."""
+def get_export_file() -> IO[bytes]:
+	"""Return a file to write an export to, kept in memory until it grows larger than
+	`EXPORT_SPOOL_SIZE`."""
+	from tempfile import SpooledTemporaryFile
+
+	return SpooledTemporaryFile(max_size=EXPORT_SPOOL_SIZE)
+
+
+def write_csv(data: Iterable[list], csv_params: dict, file: IO[bytes]) -> None:
+	"""Write rows to a binary file as utf-8 csv, without holding all of them in memory."""
+	from csv import writer
+	from io import StringIO
+
+	buffer = StringIO()
+	csv_writer = writer(buffer, **csv_params)
+	for row in data:
+		csv_writer.writerow(row)
+		if buffer.tell() >= CSV_WRITE_BUFFER_SIZE:
+			file.write(buffer.getvalue().encode("utf-8"))
+			buffer.seek(0)
+			buffer.truncate()
+
+	file.write(buffer.getvalue().encode("utf-8"))
+
+
+def provide_binary_file(filename: str, extension: str, content: bytes | IO[bytes]) -> None:
+	"""Provide a binary file to the client.
+
+	`content` can also be a file, which is streamed to the client unless it is small enough
+	to be sent from memory."""
 	from frappe import _
 
+	if not isinstance(content, bytes):
+		content.seek(0, os.SEEK_END)
+		if content.tell() <= EXPORT_SPOOL_SIZE:
+			content.seek(0)
+			with content:
+				content = content.read()
+
 	frappe.response["type"] = "binary"
 	frappe.response["filecontent"] = content
 	frappe.response["filename"] = f"{_(filename)}.{extension}"
@@ -4,7 +4,7 @@
 import json
 import quopri
 import traceback
-from contextlib import suppress
+from contextlib import contextmanager, suppress
 from email.parser import Parser
 from email.policy import SMTP
 
@@ -87,7 +87,9 @@ class EmailQueue(Document):
 		return duplicate
 
 	@classmethod
-	def new(cls, doc_data, ignore_permissions=False) -> "EmailQueue":
+	def new(cls, doc_data, ignore_permissions=False, defer=False) -> "EmailQueue":
+		"""Create an Email Queue, inserted later with others if `defer` is set within
+		`defer_email_queue_inserts`."""
 		data = doc_data.copy()
 		if not data.get("recipients"):
 			return
@@ -96,6 +98,11 @@ class EmailQueue(Document):
 		doc = frappe.new_doc(cls.DOCTYPE)
 		doc.update(data)
 		doc.set_recipients(recipients)
+
+		if defer and frappe.flags.deferred_email_queues is not None:
+			frappe.flags.deferred_email_queues.append(doc)
+			return doc
+
 		doc.insert(ignore_permissions=ignore_permissions)
 		return doc
 
@@ -247,19 +254,23 @@ class SendMailContext:
 
 	def __exit__(self, exc_type, exc_val, exc_tb):
 		if exc_type:
-			update_fields = {"error": "".join(traceback.format_tb(exc_tb))}
-			if self.queue_doc.retry < get_email_retry_limit():
-				update_fields.update(
-					{
-						"status": "Partially Sent" if self.sent_to_atleast_one_recipient else "Not Sent",
-						"retry": self.queue_doc.retry + 1,
-					}
-				)
-			else:
-				update_fields.update({"status": "Error"})
-				self.notify_failed_email()
+			self.update_status_on_failure("".join(traceback.format_tb(exc_tb)))
+		else:
+			self.queue_doc.update_status(status="Sent", commit=True)
+
+	def update_status_on_failure(self, error):
+		"""Set queue back for a retry, or to Error once retries are exhausted."""
+		update_fields = {"error": error}
+		if self.queue_doc.retry < get_email_retry_limit():
+			update_fields.update(
+				{
+					"status": "Partially Sent" if self.sent_to_atleast_one_recipient else "Not Sent",
+					"retry": self.queue_doc.retry + 1,
+				}
+			)
 		else:
-			update_fields = {"status": "Sent"}
+			update_fields.update({"status": "Error"})
+			self.notify_failed_email()
 
 		self.queue_doc.update_status(**update_fields, commit=True)
 
@@ -438,6 +449,31 @@ def on_doctype_update():
 	frappe.db.add_index("Email Queue", ["message_id(140)"])
 
 
+@contextmanager
+def defer_email_queue_inserts():
+	"""Insert the Email Queues of emails queued (not sent now) within the block together, on exit.
+
+	Usage:
+
+		with defer_email_queue_inserts():
+			for doc in docs:
+				frappe.sendmail(...)
+	"""
+	if frappe.flags.deferred_email_queues is not None:
+		# inserted by the outermost block
+		yield
+		return
+
+	frappe.flags.deferred_email_queues = []
+	try:
+		yield
+		email_queues = frappe.flags.deferred_email_queues
+	finally:
+		frappe.flags.deferred_email_queues = None
+
+	frappe.insert_many(email_queues, ignore_permissions=True)
+
+
 def get_email_retry_limit():
 	return cint(frappe.db.get_system_setting("email_retry_limit")) or 3
 
@@ -706,7 +742,9 @@ class QueueBuilder:
 
 		if not queue_separately:
 			recipients = list(set(final_recipients + self.final_cc() + self.bcc))
-			q = EmailQueue.new({**queue_data, **{"recipients": recipients}}, ignore_permissions=True)
+			q = EmailQueue.new(
+				{**queue_data, **{"recipients": recipients}}, ignore_permissions=True, defer=not send_now
+			)
 			send_now and q.send()
 			return q
 		else:
@@ -9,14 +9,22 @@ from frappe import _
 from frappe.core.doctype.role.role import get_info_based_on_role, get_user_info
 from frappe.core.doctype.sms_settings.sms_settings import send_sms
 from frappe.desk.doctype.notification_log.notification_log import enqueue_create_notification
+from frappe.email.doctype.email_queue.email_queue import defer_email_queue_inserts
 from frappe.integrations.doctype.slack_webhook_url.slack_webhook_url import send_slack_message
 from frappe.model.document import Document
 from frappe.modules.utils import export_module_json, get_doc_module
 from frappe.utils import add_to_date, cast, nowdate, validate_email_address
 from frappe.utils.jinja import validate_template
-from frappe.utils.safe_exec import get_safe_globals
+from frappe.utils.safe_exec import (
+	compile_condition,
+	evaluate_condition,
+	get_condition_fields,
+	get_safe_globals,
+)
 
 FORMATS = {"HTML": ".html", "Markdown": ".md", "Plain Text": ".txt"}
+# documents due today fetched, loaded and notified (then committed) together
+DAILY_CHUNK_SIZE = 500
 
 
 class Notification(Document):
@@ -137,8 +145,13 @@ def get_context(context):
 
 	def get_documents_for_today(self):
 		"""get list of documents that will be triggered today"""
-		docs = []
+		return [doc for docs in self.get_documents_for_today_in_chunks() for doc in docs]
 
+	def get_documents_for_today_in_chunks(self, chunk_size=DAILY_CHUNK_SIZE):
+		"""Yield lists of documents that will be triggered today.
+
+		Simple conditions (see `compile_condition`) are evaluated on the fetched rows, only the
+		documents matching them are loaded."""
 		diff_days = self.days_in_advance
 		if self.event == "Days After":
 			diff_days = -diff_days
@@ -147,24 +160,45 @@ def get_context(context):
 		reference_date_start = reference_date + " 00:00:00.000000"
 		reference_date_end = reference_date + " 23:59:59.000000"
 
-		doc_list = frappe.get_all(
-			self.document_type,
-			fields="name",
-			filters=[
-				{self.date_changed: (">=", reference_date_start)},
-				{self.date_changed: ("<=", reference_date_end)},
-			],
-		)
+		predicate = None
+		fields = {"name"}
+		if self.condition and (condition_fields := get_condition_fields(self.condition)) is not None:
+			# other attributes of documents (doctype, properties, etc.) aren't in the rows
+			if condition_fields.issubset(frappe.get_meta(self.document_type).get_valid_columns()):
+				predicate = compile_condition(self.condition)
+				fields.update(condition_fields)
+
+		cursor = ""
+		while cursor is not None:
+			rows = frappe.get_all(
+				self.document_type,
+				fields=list(fields),
+				filters=[
+					{self.date_changed: (">=", reference_date_start)},
+					{self.date_changed: ("<=", reference_date_end)},
+				],
+				order_by="name asc",
+				limit=chunk_size,
+				cursor=cursor,
+			)
+			cursor = rows.next_cursor
 
-		for d in doc_list:
-			doc = frappe.get_doc(self.document_type, d.name)
+			docs = []
+			for row in rows:
+				if predicate and not predicate(row):
+					continue
 
-			if self.condition and not frappe.safe_eval(self.condition, None, get_context(doc)):
-				continue
+				doc = frappe.get_doc(self.document_type, row.name)
+				if (
+					self.condition
+					and not predicate
+					and not frappe.safe_eval(self.condition, None, get_context(doc))
+				):
+					continue
 
-			docs.append(doc)
+				docs.append(doc)
 
-		return docs
+			yield docs
 
 	def send(self, doc):
 		"""Build recipients and send Notification"""
@@ -377,7 +411,7 @@ def get_context(context):
 		if not self.attach_print:
 			return None
 
-		print_settings = frappe.get_doc("Print Settings", "Print Settings")
+		print_settings = frappe.get_cached_doc("Print Settings", "Print Settings")
 		if (doc.docstatus == 0 and not print_settings.allow_print_for_draft) or (
 			doc.docstatus == 2 and not print_settings.allow_print_for_cancelled
 		):
@@ -398,7 +432,7 @@ def get_context(context):
 					"name": doc.name,
 					"print_format": self.print_format,
 					"print_letterhead": print_settings.with_letterhead,
-					"lang": frappe.db.get_value("Print Format", self.print_format, "default_print_language")
+					"lang": frappe.get_cached_value("Print Format", self.print_format, "default_print_language")
 					if self.print_format
 					else "en",
 				}
@@ -434,7 +468,11 @@ def get_context(context):
 				if out:
 					context.update(out)
 
-		self.message = self.get_template(md_as_html=True)
+		# read once for all the documents notified by this instance
+		if self.flags.standard_message is None:
+			self.flags.standard_message = self.get_template(md_as_html=True)
+
+		self.message = self.flags.standard_message
 
 	def on_trash(self):
 		frappe.cache.hdel("notifications", self.document_type)
@@ -463,8 +501,11 @@ def trigger_notifications(doc, method=None):
 		for d in doc_list:
 			alert = frappe.get_doc("Notification", d.name)
 
-			for doc in alert.get_documents_for_today():
-				evaluate_alert(doc, alert, alert.event)
+			for docs in alert.get_documents_for_today_in_chunks():
+				# documents are just loaded and their condition checked, send without `evaluate_alert`
+				with defer_email_queue_inserts():
+					for doc in docs:
+						alert.send(doc)
 				frappe.db.commit()
 
 
@@ -475,11 +516,12 @@ def evaluate_alert(doc: Document, alert, event):
 		if isinstance(alert, str):
 			alert = frappe.get_doc("Notification", alert)
 
-		context = get_context(doc)
+		if alert.condition and not evaluate_condition(alert.condition, doc, get_context):
+			return
 
-		if alert.condition:
-			if not frappe.safe_eval(alert.condition, None, context):
-				return
+		if not isinstance(alert, Document):
+			# notifications of the cached index only have the fields needed to find them
+			alert = frappe.get_doc("Notification", alert.name)
 
 		if event == "Value Change" and not doc.is_new():
 			if not frappe.db.has_column(doc.doctype, alert.value_changed):
@@ -379,6 +379,54 @@ class TestNotification(FrappeTestCase):
 			user.save()
 			self.assertEqual(1, frappe.db.count("Notification Log", {"subject": n.subject}))
 
+	def test_daily_notifications_in_chunks(self):
+		frappe.set_user("Administrator")
+		notification = {
+			"document_type": "ToDo",
+			"subject": "ToDo due tomorrow",
+			"event": "Days Before",
+			"date_changed": "date",
+			"days_in_advance": 1,
+			"condition": "doc.priority == 'High'",
+			"message": "{{ doc.description }} is due tomorrow",
+			"recipients": [{"receiver_by_document_field": "allocated_to"}],
+		}
+
+		tomorrow = frappe.utils.add_days(frappe.utils.nowdate(), 1)
+		todos = [
+			frappe.get_doc(
+				doctype="ToDo",
+				description=f"Due tomorrow {priority}",
+				priority=priority,
+				date=tomorrow,
+				allocated_to="test@example.com",
+			).insert()
+			for priority in ("High", "Low", "High")
+		]
+
+		with get_test_notification(notification) as n:
+			chunks = list(n.get_documents_for_today_in_chunks(chunk_size=1))
+			self.assertGreaterEqual(len(chunks), 3)
+			self.assertEqual(
+				{doc.name for docs in chunks for doc in docs},
+				{todos[0].name, todos[2].name},
+			)
+
+			frappe.get_doc(
+				"Scheduled Job Type",
+				dict(method="frappe.email.doctype.notification.notification.trigger_daily_alerts"),
+			).execute()
+
+			for todo, notified in zip(todos, (True, False, True)):
+				self.assertEqual(
+					bool(
+						frappe.db.exists(
+							"Email Queue", {"reference_doctype": "ToDo", "reference_name": todo.name}
+						)
+					),
+					notified,
+				)
+
 	@classmethod
 	def tearDownClass(cls):
 		frappe.delete_doc_if_exists("Notification", "ToDo Status Update")
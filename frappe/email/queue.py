@@ -1,9 +1,17 @@
 # Copyright (c) 2022, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import suppress
+from queue import Empty, SimpleQueue
+
 import frappe
 from frappe import _, msgprint
-from frappe.utils import cint, cstr, get_url, now_datetime
+from frappe.email.smtp import SMTPServer
+from frappe.utils import cint, create_batch, cstr, flt, get_hook_method, get_url, now_datetime
 from frappe.utils.data import getdate
 from frappe.utils.verified_command import get_signed_params, verify_request
 
@@ -12,6 +20,13 @@ from frappe.utils.verified_command import get_signed_params, verify_request
 EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_PERCENT = 0.33
 EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_COUNT = 10
 
+# Threads sending mails in parallel and SMTP sessions kept open per Email Account while flushing,
+# override with `email_queue_workers` and `email_queue_smtp_sessions` in site config.
+# `email_queue_rate_limit` limits mails sent per second per Email Account.
+EMAIL_QUEUE_DEFAULT_WORKERS = 8
+EMAIL_QUEUE_DEFAULT_SMTP_SESSIONS = 4
+EMAIL_QUEUE_STATUS_UPDATE_BATCH_SIZE = 100
+
 
 def get_emails_sent_this_month(email_account=None):
 	"""Get count of emails sent from a specific email account.
@@ -134,8 +149,6 @@ def flush():
 
 	This should not be called outside of background jobs.
 	"""
-	from frappe.email.doctype.email_queue.email_queue import EmailQueue
-
 	# To avoid running jobs inside unit tests
 	if frappe.are_emails_muted():
 		msgprint(_("Emails are muted"))
@@ -147,20 +160,286 @@ def flush():
 	if not email_queue_batch:
 		return
 
-	failed_email_queues = []
-	for row in email_queue_batch:
+	EmailQueueSender([row.name for row in email_queue_batch]).send()
+
+
+class SMTPSessionPool:
+	"""Persistent SMTP sessions of an Email Account.
+
+	Sessions are opened (connect, login) and handed out by the calling thread, the worker threads
+	only send mails over them and give them back."""
+
+	def __init__(self, config: dict, size: int, rate_limit: float = 0):
+		self.config = config
+		self.size = size
+		self.servers = []
+		self.idle = SimpleQueue()
+		self.lock = threading.Lock()
+		# minimum seconds between two mails, 0 for no limit
+		self.interval = 1 / rate_limit if rate_limit else 0
+		self.next_send_at = 0.0
+
+	def checkout(self) -> SMTPServer | None:
+		"""Return an idle session, open a new one if the pool isn't full yet, None if all are busy.
+
+		Opening sessions uses the site (errors, translations, OAuth tokens), call it from the main
+		thread only."""
+		try:
+			server = self.idle.get_nowait()
+		except Empty:
+			if len(self.servers) >= self.size:
+				return None
+
+			server = SMTPServer(**self.config)
+			self.servers.append(server)
+
 		try:
-			email_queue: EmailQueue = frappe.get_doc("Email Queue", row.name)
-			email_queue.send()
+			if not server._session:
+				# new, or closed by the server while sending
+				server.session
 		except Exception:
-			frappe.get_doc("Email Queue", row.name).log_error()
-			failed_email_queues.append(row.name)
-
-			if (
-				len(failed_email_queues) / len(email_queue_batch) > EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_PERCENT
-				and len(failed_email_queues) > EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_COUNT
-			):
-				frappe.throw(_("Email Queue flushing aborted due to too many failures."))
+			self.servers.remove(server)
+			raise
+
+		return server
+
+	def release(self, server: SMTPServer):
+		self.idle.put(server)
+
+	def wait(self):
+		"""Block until the account's rate limit allows sending the next mail."""
+		if not self.interval:
+			return
+
+		with self.lock:
+			now = time.monotonic()
+			send_at = max(now, self.next_send_at)
+			self.next_send_at = send_at + self.interval
+
+		if send_at > now:
+			time.sleep(send_at - now)
+
+	def quit(self):
+		for server in self.servers:
+			with suppress(Exception):
+				server.quit()
+
+
+class EmailQueueSender:
+	"""Send a batch of Email Queues in parallel over pooled SMTP sessions of their Email Accounts.
+
+	Messages are built, SMTP sessions opened and statuses written by the calling thread, the worker
+	threads only send over open sessions. Queues are marked as Sending in chunks of as many as are
+	kept in flight, statuses of sent queues and recipients are updated in batches.
+	"""
+
+	def __init__(self, names: list[str]):
+		self.names = names
+		self.pools: dict[str, SMTPSessionPool] = {}
+		self.failed = 0
+		self.sent_queues = []
+		self.sent_recipients = []
+
+	def send(self):
+		contexts = self.get_send_contexts()
+		if not contexts:
+			return
+
+		workers = cint(frappe.conf.email_queue_workers) or EMAIL_QUEUE_DEFAULT_WORKERS
+		use_smtp = not get_hook_method("override_email_send") and (
+			not frappe.flags.in_test or frappe.flags.testing_email
+		)
+		executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="email_queue")
+		# built messages are kept in memory until sent, limit how many queues are in flight
+		max_pending = 2 * workers
+		pending = {}
+
+		try:
+			for chunk in create_batch(contexts, max_pending):
+				if self.should_abort():
+					break
+
+				self.set_sending(chunk)
+				for ctx in chunk:
+					if len(pending) >= max_pending:
+						self.process_first_result(pending)
+
+					try:
+						messages = [
+							(recipient, ctx.build_message(recipient.recipient))
+							for recipient in ctx.queue_doc.recipients
+							if not recipient.is_mail_sent()
+						]
+					except Exception:
+						self.finish(ctx, [], traceback.format_exc())
+						continue
+
+					ctx.sent_message = messages[-1][1] if messages else None
+					if not use_smtp:
+						self.finish(ctx, *self.deliver(ctx, messages))
+						continue
+
+					pool = self.get_pool(ctx.email_account_doc)
+					try:
+						while not (server := pool.checkout()):
+							self.process_first_result(pending)
+					except Exception:
+						self.finish(ctx, [], traceback.format_exc())
+						continue
+
+					pending[executor.submit(self.deliver, ctx, messages, pool, server)] = ctx
+
+			self.process_results(pending, wait(pending).done)
+		finally:
+			executor.shutdown(cancel_futures=True)
+			for pool in self.pools.values():
+				pool.quit()
+
+		self.update_sent_status()
+
+		if self.should_abort():
+			frappe.throw(_("Email Queue flushing aborted due to too many failures."))
+
+	def get_send_contexts(self):
+		from frappe.email.doctype.email_queue.email_queue import SendMailContext
+
+		contexts = []
+		for queue in self.load_queues():
+			if not queue.can_send_now():
+				continue
+
+			try:
+				contexts.append(SendMailContext(queue))
+			except Exception:
+				queue.log_error()
+				self.failed += 1
+
+		return contexts
+
+	def load_queues(self):
+		"""Load queues of the batch with two queries instead of loading every document."""
+		queues = {
+			row.name: row
+			for row in frappe.get_all("Email Queue", fields=["*"], filters={"name": ("in", self.names)})
+		}
+		for recipient in frappe.get_all(
+			"Email Queue Recipient",
+			fields=["*"],
+			filters={"parent": ("in", self.names), "parenttype": "Email Queue"},
+			order_by="idx asc",
+		):
+			queues[recipient.parent].setdefault("recipients", []).append(recipient)
+
+		return [
+			frappe.get_doc({**queues[name], "doctype": "Email Queue"}) for name in self.names if name in queues
+		]
+
+	def get_pool(self, email_account) -> SMTPSessionPool:
+		if email_account.name not in self.pools:
+			self.pools[email_account.name] = SMTPSessionPool(
+				email_account.sendmail_config(),
+				size=cint(frappe.conf.email_queue_smtp_sessions) or EMAIL_QUEUE_DEFAULT_SMTP_SESSIONS,
+				rate_limit=flt(frappe.conf.email_queue_rate_limit),
+			)
+
+		return self.pools[email_account.name]
+
+	@staticmethod
+	def set_sending(contexts):
+		"""Mark the next queues to send as being sent with one query, a killed job leaves only the
+		queues it was sending in this state."""
+		set_queue_status([ctx.queue_doc.name for ctx in contexts], "Sending")
+		frappe.db.commit()
+
+	@staticmethod
+	def deliver(ctx, messages, pool=None, server=None):
+		"""Send built messages of a queue, return recipients sent to and the error that stopped it.
+
+		Runs in worker threads when `pool` is passed, it must only use the session then and not the
+		site (`frappe.local`)."""
+		queue = ctx.queue_doc
+		sent = []
+		try:
+			if pool:
+				try:
+					for recipient, message in messages:
+						pool.wait()
+						server.sendmail(
+							from_addr=queue.sender,
+							to_addrs=recipient.recipient,
+							msg=message.decode("utf-8").encode(),
+						)
+						sent.append(recipient)
+				finally:
+					pool.release(server)
+			else:
+				for recipient, message in messages:
+					if method := get_hook_method("override_email_send"):
+						method(queue, queue.sender, recipient.recipient, message)
+					sent.append(recipient)
+
+				if frappe.flags.in_test and not frappe.flags.testing_email and messages:
+					frappe.flags.sent_mail = messages[-1][1]
+		except Exception:
+			return sent, traceback.format_exc()
+
+		return sent, None
+
+	def process_results(self, pending, done):
+		for future in done:
+			self.finish(pending.pop(future), *future.result())
+
+	def process_first_result(self, pending):
+		self.process_results(pending, wait(pending, return_when=FIRST_COMPLETED).done)
+
+	def finish(self, ctx, sent, error=None):
+		queue = ctx.queue_doc
+		if sent:
+			ctx.sent_to_atleast_one_recipient = True
+			self.sent_recipients.extend(recipient.name for recipient in sent)
+
+		if error:
+			self.update_sent_status()
+			ctx.update_status_on_failure(error)
+			queue.log_error(message=error)
+			self.failed += 1
+			return
+
+		self.sent_queues.append(ctx)
+		if len(self.sent_queues) >= EMAIL_QUEUE_STATUS_UPDATE_BATCH_SIZE:
+			self.update_sent_status()
+
+	def update_sent_status(self):
+		"""Mark sent queues and recipients as Sent in one query each."""
+		if self.sent_recipients:
+			frappe.db.set_value(
+				"Email Queue Recipient", {"name": ("in", self.sent_recipients)}, "status", "Sent"
+			)
+
+		if self.sent_queues:
+			set_queue_status([ctx.queue_doc.name for ctx in self.sent_queues], "Sent")
+
+			for communication in {ctx.queue_doc.communication for ctx in self.sent_queues} - {None, ""}:
+				frappe.get_doc("Communication", communication).set_delivery_status()
+
+			if not frappe.flags.in_test or frappe.flags.testing_email:
+				for ctx in self.sent_queues:
+					if ctx.email_account_doc.append_emails_to_sent_folder:
+						if ctx.sent_message:
+							ctx.email_account_doc.append_email_to_sent_folder(ctx.sent_message)
+
+		frappe.db.commit()
+		self.sent_queues, self.sent_recipients = [], []
+
+	def should_abort(self):
+		return (
+			self.failed / len(self.names) > EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_PERCENT
+			and self.failed > EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_COUNT
+		)
+
+
+def set_queue_status(names, status):
+	frappe.db.set_value("Email Queue", {"name": ("in", names)}, "status", status)
 
 
 def get_queue():
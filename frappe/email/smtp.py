@@ -121,6 +121,16 @@ class SMTPServer:
 			except Exception:
 				return False
 
+	def sendmail(self, from_addr, to_addrs, msg):
+		"""Send through the open session without checking its health first or reconnecting, it can
+		be called from threads not using the site. The session is dropped if the server has closed
+		it, `session` opens a new one."""
+		try:
+			return self._session.sendmail(from_addr, to_addrs, msg)
+		except smtplib.SMTPServerDisconnected:
+			self._session = None
+			raise
+
 	def quit(self):
 		if self.is_session_active():
 			self._session.quit()
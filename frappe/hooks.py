@@ -163,8 +163,12 @@ doc_events = {
 			"frappe.automation.doctype.assignment_rule.assignment_rule.apply",
 			"frappe.automation.doctype.assignment_rule.assignment_rule.update_due_date",
 			"frappe.core.doctype.user_type.user_type.apply_permissions_for_non_standard_user_type",
+			"frappe.desk.link_search_index.update_index",
+		],
+		"after_rename": [
+			"frappe.desk.notifications.clear_doctype_notifications",
+			"frappe.desk.link_search_index.rename_in_index",
 		],
-		"after_rename": "frappe.desk.notifications.clear_doctype_notifications",
 		"on_cancel": [
 			"frappe.desk.notifications.clear_doctype_notifications",
 			"frappe.workflow.doctype.workflow_action.workflow_action.process_workflow_actions",
@@ -173,11 +177,13 @@ doc_events = {
 		"on_trash": [
 			"frappe.desk.notifications.clear_doctype_notifications",
 			"frappe.workflow.doctype.workflow_action.workflow_action.process_workflow_actions",
+			"frappe.desk.link_search_index.remove_from_index",
 		],
 		"on_update_after_submit": [
 			"frappe.workflow.doctype.workflow_action.workflow_action.process_workflow_actions",
 			"frappe.automation.doctype.assignment_rule.assignment_rule.apply",
 			"frappe.automation.doctype.assignment_rule.assignment_rule.update_due_date",
+			"frappe.desk.link_search_index.update_index",
 		],
 		"on_change": [
 			"frappe.social.doctype.energy_point_rule.energy_point_rule.process_energy_points",
@@ -203,6 +209,9 @@ doc_events = {
 
 scheduler_events = {
 	"cron": {
+		"* * * * *": [
+			"frappe.integrations.doctype.webhook.webhook.retry_webhook_requests",
+		],
 		"0/15 * * * *": [
 			"frappe.oauth.delete_oauth2_data",
 			"frappe.website.doctype.web_page.web_page.check_publish_status",
@@ -272,6 +281,12 @@ scheduler_events = {
 	],
 }
 
+# scheduled jobs that shouldn't wait behind others, run on their own queue if workers are
+# configured for it (`workers` in common_site_config.json), on the usual queue otherwise
+scheduler_job_queues = {
+	"frappe.integrations.doctype.webhook.webhook.retry_webhook_requests": "webhook_retry",
+}
+
 sounds = [
 	{"name": "email", "src": "/assets/frappe/sounds/email.mp3", "volume": 0.1},
 	{"name": "submit", "src": "/assets/frappe/sounds/submit.mp3", "volume": 0.1},
@@ -181,6 +181,7 @@ def install_db(
 
 	frappe.db.create_auth_table()
 	frappe.db.create_global_search_table()
+	frappe.db.create_link_search_index_table()
 	frappe.db.create_user_settings_table()
 
 	frappe.flags.in_install_db = False
@@ -755,7 +756,12 @@ def extract_files(site_name, file_path):
 	tar_path = os.path.join(abs_site_path, tar_name)
 
 	try:
-		if file_path.endswith(".tar"):
+		if file_path.endswith(".json"):
+			from frappe.utils.backups import restore_files_by_hash
+
+			# stored files are next to the manifest, not to its copy
+			restore_files_by_hash(os.path.abspath(file_path), abs_site_path)
+		elif file_path.endswith(".tar"):
 			subprocess.check_output(["tar", "xvf", tar_path, "--strip", "2"], cwd=abs_site_path)
 		elif file_path.endswith(".tgz"):
 			subprocess.check_output(["tar", "zxvf", tar_path, "--strip", "2"], cwd=abs_site_path)
@@ -857,6 +863,8 @@ def validate_database_sql(path: str, _raise: bool = True) -> None:
 	        _raise (bool, optional): Raise exception if invalid file. Defaults to True.
 	"""
 
+	path = get_dump_file_with_header(path)
+
 	if path.endswith(".gz"):
 		executable_name = "zgrep"
 	else:
@@ -883,6 +891,16 @@ def validate_database_sql(path: str, _raise: bool = True) -> None:
 		raise frappe.InvalidDatabaseFile
 
 
+def get_dump_file_with_header(path: str) -> str:
+	"""Return the schema file of parallel dumps (folders), it has the header and `__Auth`."""
+	from frappe.utils.backups import SCHEMA_FILE
+
+	if os.path.isdir(path):
+		return os.path.join(path, SCHEMA_FILE)
+
+	return path
+
+
 def get_db_dump_header(file_path: str, file_bytes: int = 256) -> str:
 	"""
 	Get the header of a database dump file
@@ -892,6 +910,8 @@ def get_db_dump_header(file_path: str, file_bytes: int = 256) -> str:
 	:return: The first few bytes of the file as requested
 	"""
 
+	file_path = get_dump_file_with_header(file_path)
+
 	# Use `gzip` to open the file if the extension is `.gz`
 	if file_path.endswith(".gz"):
 		with gzip.open(file_path, "rb") as f:
@@ -5,17 +5,25 @@ import frappe
 
 
 def get_all_webhooks():
+	"""Return enabled webhooks by doctype and event: {doctype: {event: [webhook, ...]}}."""
 	# query webhooks
 	webhooks_list = frappe.get_all(
 		"Webhook",
-		fields=["name", "condition", "webhook_docevent", "webhook_doctype"],
+		fields=[
+			"name",
+			"condition",
+			"webhook_docevent",
+			"webhook_doctype",
+			"batch_size",
+			"max_concurrent_requests",
+		],
 		filters={"enabled": True},
 	)
 
 	# make webhooks map
 	webhooks = {}
 	for w in webhooks_list:
-		webhooks.setdefault(w.webhook_doctype, []).append(w)
+		webhooks.setdefault(w.webhook_doctype, {}).setdefault(w.webhook_docevent, []).append(w)
 
 	return webhooks
 
@@ -33,16 +41,6 @@ def run_webhooks(doc, method):
 	):
 		return
 
-	# load all webhooks from cache / DB
-	webhooks = frappe.cache.get_value("webhooks", get_all_webhooks)
-
-	# get webhooks for this doctype
-	webhooks_for_doc = webhooks.get(doc.doctype, None)
-
-	if not webhooks_for_doc:
-		# no webhooks, quit
-		return
-
 	event_list = ["on_update", "after_insert", "on_submit", "on_cancel", "on_trash"]
 
 	if not doc.flags.in_insert:
@@ -50,17 +48,24 @@ def run_webhooks(doc, method):
 		event_list.append("on_change")
 		event_list.append("before_update_after_submit")
 
-	from frappe.integrations.doctype.webhook.webhook import get_context
+	if method not in event_list:
+		return
 
-	for webhook in webhooks_for_doc:
-		trigger_webhook = False
-		event = method if method in event_list else None
-		if not webhook.condition:
-			trigger_webhook = True
-		elif frappe.safe_eval(webhook.condition, eval_locals=get_context(doc)):
-			trigger_webhook = True
+	# load all webhooks from cache / DB
+	webhooks = frappe.cache.get_value("webhooks", get_all_webhooks)
+
+	# get webhooks for this doctype and event
+	webhooks_for_event = webhooks.get(doc.doctype, {}).get(method)
 
-		if trigger_webhook and event and webhook.webhook_docevent == event:
+	if not webhooks_for_event:
+		# no webhooks, quit
+		return
+
+	from frappe.integrations.doctype.webhook.webhook import get_context
+	from frappe.utils.safe_exec import evaluate_condition
+
+	for webhook in webhooks_for_event:
+		if not webhook.condition or evaluate_condition(webhook.condition, doc, get_context):
 			_add_webhook_to_queue(webhook, doc)
 
 
@@ -103,10 +108,21 @@ def flush_webhook_execution_queue():
 	# reverse again, to get back the original order on which to execute webhooks
 	unique_last_instances.reverse()
 
+	# the requests of a webhook are sent together and may be batched, in jobs of one round of
+	# concurrent requests each
+	from frappe.integrations.doctype.webhook.webhook import get_delivery_job_size
+	from frappe.utils import create_batch
+
+	docs_by_webhook = {}
 	for instance in unique_last_instances:
-		frappe.enqueue(
-			"frappe.integrations.doctype.webhook.webhook.enqueue_webhook",
-			doc=instance.doc,
-			webhook=instance.webhook,
-			now=frappe.flags.in_test,
-		)
+		webhook_name = instance.webhook.get("name")
+		docs_by_webhook.setdefault(webhook_name, (instance.webhook, []))[1].append(instance.doc)
+
+	for webhook, docs in docs_by_webhook.values():
+		for job_docs in create_batch(docs, get_delivery_job_size(webhook)):
+			frappe.enqueue(
+				"frappe.integrations.doctype.webhook.webhook.deliver_webhook",
+				webhook=webhook,
+				docs=job_docs,
+				now=frappe.flags.in_test,
+			)
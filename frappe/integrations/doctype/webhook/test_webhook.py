@@ -2,6 +2,7 @@
 # License: MIT. See LICENSE
 import json
 from contextlib import contextmanager
+from unittest.mock import patch
 
 import responses
 from responses.matchers import json_params_matcher
@@ -12,6 +13,7 @@ from frappe.integrations.doctype.webhook.webhook import (
 	enqueue_webhook,
 	get_webhook_data,
 	get_webhook_headers,
+	retry_webhook_requests,
 )
 from frappe.tests.utils import FrappeTestCase
 
@@ -120,7 +122,7 @@ class TestWebhook(FrappeTestCase):
 
 		webhooks = frappe.cache.get_value("webhooks")
 		self.assertTrue("User" in webhooks)
-		self.assertEqual(len(webhooks.get("User")), 1)
+		self.assertEqual(len(webhooks["User"]["after_insert"]), 1)
 
 		# only 1 hook (enabled) must be queued
 		self.assertEqual(len(frappe.local._webhook_queue), 1)
@@ -310,3 +312,103 @@ class TestWebhook(FrappeTestCase):
 			doc = frappe.new_doc("Note")
 			doc.title = "Test Webhook Note"
 			enqueue_webhook(doc, wh)
+
+	def test_batched_delivery(self):
+		wh_config = {
+			"doctype": "Webhook",
+			"webhook_doctype": "Note",
+			"webhook_docevent": "after_insert",
+			"enabled": 1,
+			"request_url": "https://httpbin.org/post",
+			"request_method": "POST",
+			"request_structure": "JSON",
+			"webhook_json": '{"title": "{{ doc.title }}"}',
+			"batch_size": 2,
+		}
+
+		self.responses.add(responses.POST, "https://httpbin.org/post", status=200)
+
+		with get_test_webhook(wh_config) as wh:
+			for i in range(3):
+				frappe.get_doc(doctype="Note", title=f"Test Webhook Batch {i}").insert()
+			flush_webhook_execution_queue()
+
+			logs = frappe.get_all(
+				"Webhook Request Log",
+				filters={"webhook": wh.name},
+				fields=["status", "document_count", "data"],
+				order_by="document_count desc",
+			)
+			# logged as the requests complete, in any order
+			self.assertEqual([log.document_count for log in logs], [2, 1])
+			self.assertEqual({log.status for log in logs}, {"Success"})
+			self.assertEqual(
+				json.loads(logs[0].data), [{"title": "Test Webhook Batch 0"}, {"title": "Test Webhook Batch 1"}]
+			)
+
+	def test_delivery_jobs(self):
+		wh_config = {
+			"doctype": "Webhook",
+			"webhook_doctype": "Note",
+			"webhook_docevent": "after_insert",
+			"enabled": 1,
+			"request_url": "https://httpbin.org/post",
+			"request_method": "POST",
+			"request_structure": "JSON",
+			"webhook_json": "{}",
+			"batch_size": 2,
+			"max_concurrent_requests": 2,
+		}
+
+		with get_test_webhook(wh_config) as wh, patch("frappe.enqueue") as enqueue:
+			for i in range(9):
+				frappe.get_doc(doctype="Note", title=f"Test Webhook Job {i}").insert()
+			flush_webhook_execution_queue()
+
+		# one round of concurrent requests per job
+		self.assertEqual(
+			[
+				len(call.kwargs["docs"])
+				for call in enqueue.call_args_list
+				if call.kwargs["webhook"].get("name") == wh.name
+			],
+			[4, 4, 1],
+		)
+
+	def test_retry_failed_request(self):
+		wh_config = {
+			"doctype": "Webhook",
+			"webhook_doctype": "Note",
+			"webhook_docevent": "after_insert",
+			"enabled": 1,
+			"request_url": "https://httpbin.org/status",
+			"request_method": "POST",
+			"request_structure": "JSON",
+			"webhook_json": "{}",
+		}
+
+		self.responses.add(responses.POST, "https://httpbin.org/status", status=503)
+
+		with get_test_webhook(wh_config) as wh:
+			doc = frappe.new_doc("Note")
+			doc.title = "Test Webhook Note"
+			enqueue_webhook(doc, wh)
+
+			log = frappe.get_last_doc("Webhook Request Log", filters={"webhook": wh.name})
+			self.assertEqual(log.status, "Queued")
+			self.assertEqual(log.status_code, 503)
+			self.assertEqual(log.attempts, 1)
+			self.assertIsNotNone(log.next_retry_at)
+
+			# not due yet
+			retry_webhook_requests()
+			log.reload()
+			self.assertEqual(log.attempts, 1)
+
+			self.responses.replace(responses.POST, "https://httpbin.org/status", status=200)
+			log.db_set("next_retry_at", frappe.utils.add_to_date(None, minutes=-1))
+			retry_webhook_requests()
+			log.reload()
+			self.assertEqual(log.status, "Success")
+			self.assertEqual(log.attempts, 2)
+			self.assertIsNone(log.next_retry_at)
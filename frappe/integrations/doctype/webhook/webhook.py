@@ -5,18 +5,42 @@ import base64
 import hashlib
 import hmac
 import json
-from time import sleep
+import math
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from http.cookiejar import DefaultCookiePolicy
+from time import monotonic, perf_counter
 from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils.jinja import validate_template
+from frappe.utils import add_to_date, cint, create_batch, now_datetime
+from frappe.utils.jinja import precompile_templates, validate_template
 from frappe.utils.safe_exec import get_safe_globals
 
 WEBHOOK_SECRET_HEADER = "X-Frappe-Webhook-Signature"
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+DEFAULT_TIMEOUT_SECONDS = 5
+# keep-alive connections kept per endpoint host
+CONNECTION_POOL_SIZE = 10
+# failed requests are sent again by the scheduler, after 1, 2, 4 and 8 minutes
+MAX_ATTEMPTS = 5
+RETRY_BACKOFF_SECONDS = 60
+# queued requests sent again per commit, by a scheduled job running every minute
+RETRY_BATCH_SIZE = 50
+# a batch of requests all timing out, sent 4 at a time, takes about 65 seconds
+RETRY_BATCH_WORST_CASE_SECONDS = (
+	math.ceil(RETRY_BATCH_SIZE / DEFAULT_MAX_CONCURRENT_REQUESTS) * DEFAULT_TIMEOUT_SECONDS
+)
+# no batch is started after this, so that the job ends within 4 minutes, before it times out
+RETRY_TIME_LIMIT_SECONDS = 240 - RETRY_BATCH_WORST_CASE_SECONDS
+# the request may succeed later, others are client errors
+RETRY_STATUS_CODES = (408, 425, 429)
 
 
 class Webhook(Document):
@@ -30,10 +54,12 @@ class Webhook(Document):
 		from frappe.integrations.doctype.webhook_header.webhook_header import WebhookHeader
 		from frappe.types import DF
 
+		batch_size: DF.Int
 		condition: DF.SmallText | None
 		enable_security: DF.Check
 		enabled: DF.Check
 		is_dynamic_url: DF.Check
+		max_concurrent_requests: DF.Int
 		meets_condition: DF.Data | None
 		preview_document: DF.DynamicLink | None
 		preview_request_body: DF.Code | None
@@ -67,6 +93,7 @@ class Webhook(Document):
 
 	def on_update(self):
 		frappe.cache.delete_value("webhooks")
+		precompile_templates(self.request_url)
 
 	def validate_docevent(self):
 		if self.webhook_doctype:
@@ -153,44 +180,216 @@ def get_context(doc):
 
 
 def enqueue_webhook(doc, webhook) -> None:
-	request_url = headers = data = None
-	try:
-		webhook: Webhook = frappe.get_doc("Webhook", webhook.get("name"))
-		request_url = webhook.request_url
-		if webhook.is_dynamic_url:
-			request_url = frappe.render_template(webhook.request_url, get_context(doc))
-		headers = get_webhook_headers(doc, webhook)
-		data = get_webhook_data(doc, webhook)
+	deliver_webhook(webhook, [doc])
 
-	except Exception as e:
-		frappe.logger().debug({"enqueue_webhook_error": e})
-		log_request(webhook.name, doc.name, request_url, headers, data)
-		return
 
-	for i in range(3):
+def deliver_webhook(webhook, docs) -> None:
+	"""Send the requests of a webhook for documents changed in a transaction.
+
+	Requests are sent concurrently over pooled keep-alive connections and logged as they complete.
+	Failed requests are queued in Webhook Request Log and sent again by `retry_webhook_requests`,
+	without blocking the worker. See `get_delivery_job_size` for the documents sent per job."""
+	webhook: Webhook = frappe.get_cached_doc("Webhook", webhook.get("name"))
+	webhook_requests = get_webhook_requests(webhook, docs)
+
+	for request, result in send_requests(webhook_requests, webhook.max_concurrent_requests):
+		log_delivery(request, *result)
+		if not frappe.flags.in_test:
+			# keep the logs of sent requests if the job times out
+			frappe.db.commit()
+
+
+def get_delivery_job_size(webhook) -> int:
+	"""Return the number of documents delivered by one job, a round of concurrent requests."""
+	concurrent_requests = (
+		cint(webhook.get("max_concurrent_requests")) or DEFAULT_MAX_CONCURRENT_REQUESTS
+	)
+	return max(cint(webhook.get("batch_size")), 1) * concurrent_requests
+
+
+def get_webhook_requests(webhook, docs) -> list[frappe._dict]:
+	"""Return requests to send for the documents, with up to `batch_size` documents each."""
+	payloads = {}
+	for doc in docs:
+		request_url = data = None
 		try:
-			r = requests.request(
-				method=webhook.request_method,
-				url=request_url,
-				data=json.dumps(data, default=str),
-				headers=headers,
-				timeout=webhook.timeout or 5,
+			request_url = webhook.request_url
+			if webhook.is_dynamic_url:
+				request_url = frappe.render_template(webhook.request_url, get_context(doc))
+			data = get_webhook_data(doc, webhook)
+
+		except Exception as e:
+			frappe.logger().debug({"enqueue_webhook_error": e})
+			log_request(webhook.name, doc.name, request_url, None, data)
+			continue
+
+		payloads.setdefault(request_url, []).append((doc.name, data))
+
+	secret = webhook.get_password("webhook_secret") if webhook.enable_security else None
+	batch_size = cint(webhook.batch_size)
+	webhook_requests = []
+	for request_url, url_payloads in payloads.items():
+		for batch in create_batch(url_payloads, max(batch_size, 1)):
+			data = [data for _name, data in batch] if batch_size > 1 else batch[0][1]
+			body = json.dumps(data, default=str)
+			headers = {WEBHOOK_SECRET_HEADER: get_signature(secret, body)} if secret else {}
+			headers.update(get_custom_headers(webhook))
+
+			webhook_requests.append(
+				frappe._dict(
+					webhook=webhook.name,
+					reference_document=batch[0][0],
+					document_count=len(batch),
+					url=request_url,
+					method=webhook.request_method,
+					headers=headers,
+					body=body,
+					timeout=webhook.timeout or DEFAULT_TIMEOUT_SECONDS,
+				)
 			)
-			r.raise_for_status()
-			frappe.logger().debug({"webhook_success": r.text})
-			log_request(webhook.name, doc.name, request_url, headers, data, r)
+
+	return webhook_requests
+
+
+@lru_cache(maxsize=1)
+def get_session() -> requests.Session:
+	"""Return the HTTP session of the process, connections to endpoints are reused between jobs."""
+	session = requests.Session()
+	# don't send cookies set by an endpoint back to it
+	session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+	adapter = HTTPAdapter(pool_connections=CONNECTION_POOL_SIZE, pool_maxsize=CONNECTION_POOL_SIZE)
+	session.mount("http://", adapter)
+	session.mount("https://", adapter)
+	return session
+
+
+def send_requests(webhook_requests, max_concurrent_requests=None):
+	"""Send requests to an endpoint concurrently, yield (request, (response, exception, response
+	time)) of each as soon as it completes."""
+	if len(webhook_requests) <= 1:
+		for request in webhook_requests:
+			yield request, send_request(request)
+		return
+
+	max_workers = cint(max_concurrent_requests) or DEFAULT_MAX_CONCURRENT_REQUESTS
+	with ThreadPoolExecutor(max_workers=min(max_workers, len(webhook_requests))) as executor:
+		futures = {executor.submit(send_request, request): request for request in webhook_requests}
+		for future in as_completed(futures):
+			yield futures[future], future.result()
+
+
+def send_request(request) -> tuple:
+	# runs in a thread, only uses the request and not the site (frappe.local)
+	response = None
+	started = perf_counter()
+	try:
+		response = get_session().request(
+			method=request.method,
+			url=request.url,
+			data=request.body,
+			headers=request.headers,
+			timeout=request.timeout,
+		)
+		response.raise_for_status()
+		return response, None, perf_counter() - started
+
+	except Exception as e:
+		return response, e, perf_counter() - started
+
+
+def log_delivery(request, response, error, response_time, request_log=None):
+	"""Create (or update, when retrying) the request log and schedule the next attempt if needed."""
+	if not request_log:
+		request_log = frappe.get_doc(
+			{
+				"doctype": "Webhook Request Log",
+				"webhook": request.webhook,
+				"reference_document": request.reference_document,
+				"document_count": request.document_count,
+				"user": frappe.session.user if frappe.session.user else None,
+				"url": request.url,
+				"request_method": request.method,
+				"headers": frappe.as_json(request.headers) if request.headers else None,
+				# sent as is when retrying, the signature is computed on it
+				"data": request.body,
+			}
+		)
+
+	request_log.attempts = cint(request_log.attempts) + 1
+	request_log.response = response.text if response is not None else None
+	request_log.status_code = response.status_code if response is not None else None
+	request_log.response_time = response_time
+	request_log.error = "".join(traceback.format_exception(error)) if error else None
+	request_log.next_retry_at = None
+
+	if not error:
+		request_log.status = "Success"
+		frappe.logger().debug({"webhook_success": request_log.response})
+	elif request_log.attempts < MAX_ATTEMPTS and (
+		response is None or response.status_code >= 500 or response.status_code in RETRY_STATUS_CODES
+	):
+		request_log.status = "Queued"
+		request_log.next_retry_at = add_to_date(
+			now_datetime(), seconds=RETRY_BACKOFF_SECONDS * 2 ** (request_log.attempts - 1)
+		)
+		frappe.logger().debug({"webhook_error": error, "try": request_log.attempts})
+	else:
+		request_log.status = "Failed"
+		frappe.logger().debug({"webhook_error": error, "try": request_log.attempts})
+
+	request_log.save(ignore_permissions=True)
+
+
+def retry_webhook_requests():
+	"""Send the queued requests that are due again, called by the scheduler.
+
+	Requests are sent in small batches, committed one at a time, until none are due or the time
+	limit is reached, so the attempts made are saved even if there are many to send."""
+	started = monotonic()
+	while monotonic() - started < RETRY_TIME_LIMIT_SECONDS:
+		request_logs = frappe.get_all(
+			"Webhook Request Log",
+			filters={"status": "Queued", "next_retry_at": ("<=", now_datetime())},
+			pluck="name",
+			order_by="next_retry_at asc",
+			limit=RETRY_BATCH_SIZE,
+		)
+		if not request_logs:
 			break
 
-		except requests.exceptions.ReadTimeout as e:
-			frappe.logger().debug({"webhook_error": e, "try": i + 1})
-			log_request(webhook.name, doc.name, request_url, headers, data)
+		retry_request_logs([frappe.get_doc("Webhook Request Log", name) for name in request_logs])
+		frappe.db.commit()
 
-		except Exception as e:
-			frappe.logger().debug({"webhook_error": e, "try": i + 1})
-			log_request(webhook.name, doc.name, request_url, headers, data, r)
-			sleep(3 * i + 1)
-			if i != 2:
-				continue
+
+def retry_request_logs(request_logs):
+	by_webhook = {}
+	for request_log in request_logs:
+		by_webhook.setdefault(request_log.webhook, []).append(request_log)
+
+	for webhook_name, webhook_logs in by_webhook.items():
+		webhook = frappe.db.get_value(
+			"Webhook", webhook_name, ["enabled", "timeout", "max_concurrent_requests"], as_dict=True
+		)
+		if not (webhook and webhook.enabled):
+			for request_log in webhook_logs:
+				request_log.db_set({"status": "Failed", "next_retry_at": None})
+			continue
+
+		webhook_requests = [
+			frappe._dict(
+				url=request_log.url,
+				method=request_log.request_method or "POST",
+				headers=json.loads(request_log.headers or "{}"),
+				body=request_log.data,
+				timeout=webhook.timeout or DEFAULT_TIMEOUT_SECONDS,
+				request_log=request_log,
+			)
+			for request_log in webhook_logs
+		]
+
+		for request, result in send_requests(webhook_requests, webhook.max_concurrent_requests):
+			log_delivery(request, *result, request_log=request.request_log)
 
 
 def log_request(
@@ -212,6 +411,7 @@ def log_request(
 			"data": frappe.as_json(data) if data else None,
 			"response": res and res.text,
 			"error": frappe.get_traceback(),
+			"status": "Failed",
 		}
 	)
 
@@ -223,23 +423,28 @@ def get_webhook_headers(doc, webhook):
 
 	if webhook.enable_security:
 		data = get_webhook_data(doc, webhook)
-		signature = base64.b64encode(
-			hmac.new(
-				webhook.get_password("webhook_secret").encode("utf8"),
-				json.dumps(data).encode("utf8"),
-				hashlib.sha256,
-			).digest()
+		headers[WEBHOOK_SECRET_HEADER] = get_signature(
+			webhook.get_password("webhook_secret"), json.dumps(data)
 		)
-		headers[WEBHOOK_SECRET_HEADER] = signature
-
-	if webhook.webhook_headers:
-		for h in webhook.webhook_headers:
-			if h.get("key") and h.get("value"):
-				headers[h.get("key")] = h.get("value")
 
+	headers.update(get_custom_headers(webhook))
 	return headers
 
 
+def get_signature(secret: str, body: str) -> str:
+	return base64.b64encode(
+		hmac.new(secret.encode("utf8"), body.encode("utf8"), hashlib.sha256).digest()
+	).decode()
+
+
+def get_custom_headers(webhook) -> dict:
+	return {
+		h.get("key"): h.get("value")
+		for h in webhook.webhook_headers or ()
+		if h.get("key") and h.get("value")
+	}
+
+
 def get_webhook_data(doc, webhook):
 	data = {}
 	doc = doc.as_dict(convert_dates_to_str=True)
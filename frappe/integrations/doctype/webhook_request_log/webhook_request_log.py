@@ -14,11 +14,18 @@ class WebhookRequestLog(Document):
 	if TYPE_CHECKING:
 		from frappe.types import DF
 
+		attempts: DF.Int
 		data: DF.Code | None
+		document_count: DF.Int
 		error: DF.Text | None
 		headers: DF.Code | None
+		next_retry_at: DF.Datetime | None
 		reference_document: DF.Data | None
+		request_method: DF.Data | None
 		response: DF.Code | None
+		response_time: DF.Float
+		status: DF.Literal["", "Success", "Queued", "Failed"]
+		status_code: DF.Int
 		url: DF.Data | None
 		user: DF.Link | None
 		webhook: DF.Link | None
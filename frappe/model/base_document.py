@@ -3,6 +3,8 @@
 import datetime
 import json
 import weakref
+from collections import defaultdict
+from collections.abc import Iterable
 from functools import cached_property
 from typing import TYPE_CHECKING, TypeVar
 
@@ -25,6 +27,7 @@ from frappe.utils import (
 	cast_fieldtype,
 	cint,
 	compare,
+	create_batch,
 	cstr,
 	flt,
 	is_a_property,
@@ -761,8 +764,11 @@ class BaseDocument:
 
 		return missing
 
-	def get_invalid_links(self, is_submittable=False):
-		"""Return list of invalid links and also update fetch values if not set."""
+	def get_invalid_links(self, is_submittable=False, link_values=None):
+		"""Return list of invalid links and also update fetch values if not set.
+
+		:param link_values: Links resolved in bulk using `prefetch_link_values`, optional.
+		"""
 
 		def get_msg(df, docname):
 			# check if parentfield exists (only applicable for child table doctype)
@@ -802,7 +808,11 @@ class BaseDocument:
 					or (_df.get("fetch_if_empty") and not self.get(_df.fieldname))
 				]
 				if not frappe.get_meta(doctype).get("is_virtual"):
-					if not fields_to_fetch:
+					if link_values and (
+						prefetched := _get_prefetched_link_values(link_values, doctype, docname, fields_to_fetch)
+					):
+						values = prefetched
+					elif not fields_to_fetch:
 						# cache a single value type
 						values = _dict(name=frappe.db.get_value(doctype, docname, "name", cache=True))
 					else:
@@ -836,7 +846,12 @@ class BaseDocument:
 						df.fieldname != "amended_from"
 						and (is_submittable or self.meta.is_submittable)
 						and frappe.get_meta(doctype).is_submittable
-						and cint(frappe.db.get_value(doctype, docname, "docstatus")) == DocStatus.cancelled()
+						and cint(
+							values.docstatus
+							if "docstatus" in values
+							else frappe.db.get_value(doctype, docname, "docstatus")
+						)
+						== DocStatus.cancelled()
 					):
 
 						cancelled_links.append((df.fieldname, docname, get_msg(df, docname)))
@@ -849,9 +864,9 @@ class BaseDocument:
 		if df.fieldtype in ["Small Text", "Text", "Data"]:
 			from frappe.model.meta import get_default_df
 
-			fetch_from_df = get_default_df(fetch_from_fieldname) or frappe.get_meta(doctype).get_field(
-				fetch_from_fieldname
-			)
+			fetch_from_df = get_default_df(fetch_from_fieldname) or frappe.get_compiled_meta(
+				doctype
+			).get_field(fetch_from_fieldname)
 
 			if not fetch_from_df:
 				frappe.throw(
@@ -1317,3 +1332,71 @@ def _filter(data, filters, limit=None):
 				break
 
 	return out
+
+
+def prefetch_link_values(docs: Iterable["Document"]) -> dict:
+	"""Resolve links of given documents and their children with one query per linked doctype.
+
+	Values required by `fetch_from` fields and `docstatus` of submittable doctypes are
+	fetched along. Pass the result to `get_invalid_links`, links that can't be resolved
+	from it (e.g. name differs in case) are still looked up individually.
+
+	Returns `{doctype: (fetched columns, {name: values})}`
+	"""
+	names = defaultdict(set)
+	columns = defaultdict(set)
+
+	for doc in docs:
+		for d in (doc, *doc.get_all_children()):
+			meta = d.meta
+			for df in meta.get_link_fields() + meta.get_dynamic_link_fields():
+				docname = d.get(df.fieldname)
+				doctype = df.options if df.fieldtype == "Link" else d.get(df.options)
+				if not (docname and doctype and isinstance(docname, (str, int))):
+					continue
+
+				names[doctype].add(docname)
+				columns[doctype].update(
+					_df.fetch_from.split(".")[-1] for _df in meta.get_fields_to_fetch(df.fieldname)
+				)
+
+	link_values = {}
+	for doctype, docnames in names.items():
+		try:
+			meta = frappe.get_compiled_meta(doctype)
+		except frappe.DoesNotExistError:
+			# raised with the usual message while validating the link
+			continue
+
+		if meta.issingle or meta.is_virtual:
+			continue
+
+		valid_columns = set(meta.valid_columns)
+		fields = ["name", *sorted(c for c in columns[doctype] if c in valid_columns and c != "name")]
+		if meta.is_submittable and "docstatus" not in fields:
+			fields.append("docstatus")
+
+		rows = {}
+		for batch in create_batch(list(docnames), 1000):
+			for row in frappe.db.get_values(
+				doctype, {"name": ("in", batch)}, fields, as_dict=True, order_by=None
+			):
+				rows[row.name] = row
+
+		link_values[doctype] = (frozenset(fields), rows)
+
+	return link_values
+
+
+def _get_prefetched_link_values(link_values, doctype, docname, fields_to_fetch) -> _dict | None:
+	if not (prefetched := link_values.get(doctype)) or not isinstance(docname, (str, int)):
+		return
+
+	columns, rows = prefetched
+	if (row := rows.get(docname)) is None:
+		return
+
+	if not columns.issuperset(_df.fetch_from.split(".")[-1] for _df in fields_to_fetch):
+		return
+
+	return _dict(row)
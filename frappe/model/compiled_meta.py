@@ -0,0 +1,330 @@
+# Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+
+"""
+Compact, immutable representation of a DocType's meta for read-only paths.
+
+`frappe.get_meta` returns full `Meta` documents which are pickled into the
+`doctype_meta` cache. Loading them means rebuilding hundreds of `BaseDocument`
+objects. `CompiledMeta` keeps only what read paths need (field properties,
+permissions and a few precomputed indexes) and is cached as a small versioned
+JSON payload.
+
+Example:
+
+	meta = get_compiled_meta("User")
+	if meta.has_field("first_name"):
+		...
+
+Do not use it where the meta is modified or where `Meta` (Document) methods are needed.
+"""
+
+import json
+
+import frappe
+from frappe.model import no_value_fields, table_fields
+
+# bump this whenever the serialised layout changes, stale payloads are recompiled
+COMPILED_META_VERSION = 1
+
+FIELD_PROPERTIES = (
+	"fieldname",
+	"fieldtype",
+	"label",
+	"options",
+	"default",
+	"reqd",
+	"unique",
+	"permlevel",
+	"hidden",
+	"read_only",
+	"set_only_once",
+	"allow_on_submit",
+	"no_copy",
+	"fetch_from",
+	"fetch_if_empty",
+	"ignore_user_permissions",
+	"ignore_xss_filter",
+	"in_list_view",
+	"in_standard_filter",
+	"in_global_search",
+	"search_index",
+	"translatable",
+	"precision",
+	"length",
+	"non_negative",
+	"not_nullable",
+	"is_virtual",
+	"is_custom_field",
+	"idx",
+)
+
+PERMISSION_PROPERTIES = (
+	"role",
+	"permlevel",
+	"if_owner",
+	"select",
+	"read",
+	"write",
+	"create",
+	"delete",
+	"submit",
+	"cancel",
+	"amend",
+	"report",
+	"export",
+	"import",
+	"share",
+	"print",
+	"email",
+)
+
+DOCTYPE_PROPERTIES = (
+	"name",
+	"module",
+	"custom",
+	"istable",
+	"issingle",
+	"is_virtual",
+	"is_tree",
+	"is_submittable",
+	"track_changes",
+	"track_seen",
+	"track_views",
+	"autoname",
+	"naming_rule",
+	"title_field",
+	"image_field",
+	"search_fields",
+	"sort_field",
+	"sort_order",
+	"show_name_in_global_search",
+	"show_title_field_in_link",
+	"translated_doctype",
+	"allow_rename",
+	"allow_import",
+	"read_only",
+	"has_web_view",
+	"nsm_parent_field",
+)
+
+
+class _Record:
+	"""Immutable record with attribute and `.get` access, like a read-only `frappe._dict`."""
+
+	__slots__ = ()
+
+	def __init__(self, values):
+		for key, value in zip(self.__slots__, values):
+			object.__setattr__(self, key, value)
+
+	def __setattr__(self, key, value):
+		raise AttributeError(f"{type(self).__name__} is read-only")
+
+	def get(self, key, default=None):
+		return getattr(self, key, default)
+
+	def as_tuple(self) -> tuple:
+		return tuple(getattr(self, key) for key in self.__slots__)
+
+	def as_dict(self) -> dict:
+		return {key: getattr(self, key) for key in self.__slots__}
+
+	def __repr__(self):
+		return f"<{type(self).__name__}: {getattr(self, self.__slots__[0])}>"
+
+
+class CompiledField(_Record):
+	__slots__ = FIELD_PROPERTIES
+
+
+class CompiledPermission(_Record):
+	__slots__ = PERMISSION_PROPERTIES
+
+
+class CompiledMeta:
+	__slots__ = DOCTYPE_PROPERTIES + (
+		"fields",
+		"permissions",
+		"valid_columns",
+		"_fields",
+		"_link_fields",
+		"_dynamic_link_fields",
+		"_table_fields",
+		"_permlevel_fields",
+		"_fetch_from_fields",
+	)
+
+	def __init__(self, properties: dict, fields, permissions, valid_columns):
+		_set = object.__setattr__
+
+		for key in DOCTYPE_PROPERTIES:
+			_set(self, key, properties.get(key))
+
+		_set(self, "fields", tuple(fields))
+		_set(self, "permissions", tuple(permissions))
+		_set(self, "valid_columns", tuple(valid_columns))
+
+		# indexes
+		field_map = {}
+		link_fields, dynamic_link_fields, _table_fields = [], [], []
+		permlevel_fields = {}
+		fetch_from_fields = {}
+
+		for df in self.fields:
+			field_map[df.fieldname] = df
+			permlevel_fields.setdefault(df.permlevel or 0, []).append(df)
+
+			if df.fieldtype == "Link" and df.options != "[Select]":
+				link_fields.append(df)
+			elif df.fieldtype == "Dynamic Link":
+				dynamic_link_fields.append(df)
+			elif df.fieldtype in table_fields:
+				_table_fields.append(df)
+
+			if df.fetch_from and "." in df.fetch_from and df.fieldtype not in no_value_fields:
+				link_fieldname = df.fetch_from.split(".", 1)[0]
+				fetch_from_fields.setdefault(link_fieldname, []).append(df)
+
+		_set(self, "_fields", field_map)
+		_set(self, "_link_fields", tuple(link_fields))
+		_set(self, "_dynamic_link_fields", tuple(dynamic_link_fields))
+		_set(self, "_table_fields", tuple(_table_fields))
+		_set(self, "_permlevel_fields", {k: tuple(v) for k, v in permlevel_fields.items()})
+		_set(self, "_fetch_from_fields", {k: tuple(v) for k, v in fetch_from_fields.items()})
+
+	def __setattr__(self, key, value):
+		raise AttributeError("CompiledMeta is read-only")
+
+	def __repr__(self):
+		return f"<CompiledMeta: {self.name}>"
+
+	@classmethod
+	def from_meta(cls, meta) -> "CompiledMeta":
+		"""Compile a `Meta` instance."""
+		return cls(
+			{key: meta.get(key) for key in DOCTYPE_PROPERTIES},
+			(CompiledField([df.get(key) for key in FIELD_PROPERTIES]) for df in meta.get("fields")),
+			(
+				CompiledPermission([perm.get(key) for key in PERMISSION_PROPERTIES])
+				for perm in meta.get("permissions", [])
+			),
+			meta.get_valid_columns(),
+		)
+
+	def dumps(self) -> str:
+		return json.dumps(
+			[
+				COMPILED_META_VERSION,
+				[getattr(self, key) for key in DOCTYPE_PROPERTIES],
+				[df.as_tuple() for df in self.fields],
+				[perm.as_tuple() for perm in self.permissions],
+				self.valid_columns,
+			],
+			separators=(",", ":"),
+			default=str,
+		)
+
+	@classmethod
+	def loads(cls, payload: str) -> "CompiledMeta | None":
+		"""Load serialised meta, return None if it was serialised by an incompatible version."""
+		try:
+			version, properties, fields, permissions, valid_columns = json.loads(payload)
+		except (TypeError, ValueError):
+			return None
+
+		if version != COMPILED_META_VERSION:
+			return None
+
+		return cls(
+			dict(zip(DOCTYPE_PROPERTIES, properties)),
+			map(CompiledField, fields),
+			map(CompiledPermission, permissions),
+			valid_columns,
+		)
+
+	def get(self, key, default=None):
+		return getattr(self, key, default)
+
+	def get_field(self, fieldname) -> CompiledField | None:
+		return self._fields.get(fieldname)
+
+	def has_field(self, fieldname) -> bool:
+		return fieldname in self._fields
+
+	def get_link_fields(self) -> tuple[CompiledField, ...]:
+		return self._link_fields
+
+	def get_dynamic_link_fields(self) -> tuple[CompiledField, ...]:
+		return self._dynamic_link_fields
+
+	def get_table_fields(self) -> tuple[CompiledField, ...]:
+		return self._table_fields
+
+	def get_fields_by_permlevel(self, permlevel: int) -> tuple[CompiledField, ...]:
+		return self._permlevel_fields.get(permlevel, ())
+
+	def get_high_permlevel_fields(self) -> list[CompiledField]:
+		return [df for level, fields in self._permlevel_fields.items() if level > 0 for df in fields]
+
+	def get_fields_to_fetch(self, link_fieldname=None) -> tuple[CompiledField, ...]:
+		"""Return fields whose value is fetched from given link field (or any link field)."""
+		if link_fieldname:
+			return self._fetch_from_fields.get(link_fieldname, ())
+
+		return tuple(
+			df
+			for link_field in self._link_fields
+			for df in self._fetch_from_fields.get(link_field.fieldname, ())
+		)
+
+	def get_valid_columns(self) -> list[str]:
+		return list(self.valid_columns)
+
+	def get_link_doctype(self, fieldname):
+		df = self.get_field(fieldname)
+
+		if df.fieldtype == "Link":
+			return df.options
+
+		if df.fieldtype == "Dynamic Link":
+			return self.get_field(df.options).options
+
+	def get_search_fields(self) -> list[str]:
+		search_fields = [d.strip() for d in (self.search_fields or "name").split(",")]
+		if "name" not in search_fields:
+			search_fields.append("name")
+
+		return search_fields
+
+	def get_title_field(self) -> str:
+		if self.title_field:
+			return self.title_field
+
+		return "title" if self.has_field("title") else "name"
+
+	def is_nested_set(self) -> bool:
+		return self.has_field("lft") and self.has_field("rgt")
+
+
+# process level, keyed on site and doctype: (payload, CompiledMeta)
+_loaded_meta = {}
+
+
+def get_compiled_meta(doctype: str) -> CompiledMeta:
+	"""Return read-only `CompiledMeta` for given doctype, compiling it from `Meta` if required."""
+	payload = frappe.cache.hget("doctype_compiled_meta", doctype)
+
+	if payload:
+		cache_key = (frappe.local.site, doctype)
+		loaded = _loaded_meta.get(cache_key)
+		if loaded and loaded[0] == payload:
+			return loaded[1]
+
+		if meta := CompiledMeta.loads(payload):
+			_loaded_meta[cache_key] = (payload, meta)
+			return meta
+
+	meta = CompiledMeta.from_meta(frappe.get_meta(doctype))
+	frappe.cache.hset("doctype_compiled_meta", doctype, meta.dumps())
+	return meta
@@ -2,11 +2,15 @@
 # License: MIT. See LICENSE
 """build query for doclistview and return results"""
 
+import base64
+import binascii
 import copy
 import datetime
 import json
+import math
 import re
 from collections import Counter
+from contextlib import nullcontext
 
 import frappe
 import frappe.defaults
@@ -14,6 +18,8 @@ import frappe.permissions
 import frappe.share
 from frappe import _
 from frappe.core.doctype.server_script.server_script_utils import get_server_script_map
+from frappe.database.database import SQL_ITERATOR_BATCH_SIZE
+from frappe.database.query_cache import cached_sql
 from frappe.database.utils import DefaultOrderBy, FallBackDateTimeStr, NestedSetHierarchy
 from frappe.model import get_permitted_fields, optional_fields
 from frappe.model.meta import get_table_columns
@@ -53,6 +59,9 @@ STRICT_FIELD_PATTERN = re.compile(r".*/\*.*")
 STRICT_UNION_PATTERN = re.compile(r".*\s(union).*\s")
 ORDER_GROUP_PATTERN = re.compile(r".*[^a-z0-9-_ ,`'\"\.\(\)].*")
 FN_PARAMS_PATTERN = re.compile(r".*?\((.*)\).*")
+ORDER_COLUMN_PATTERN = re.compile(
+	r"^(?:[`\"]?tab([^`\".]+)[`\"]?\.)?[`\"]?(\w+)[`\"]?(?:\s+(asc|desc))?$", flags=re.IGNORECASE
+)
 SPECIAL_FIELD_CHARS = frozenset(("(", "`", ".", "'", '"', "*"))
 
 
@@ -117,6 +126,10 @@ class DatabaseQuery:
 		ignore_ddl=False,
 		*,
 		parent_doctype=None,
+		as_iterator=False,
+		chunk_size=None,
+		cursor=None,
+		cache=False,
 	) -> list:
 
 		if not ignore_permissions:
@@ -167,6 +180,9 @@ class DatabaseQuery:
 		self.strict = strict
 		self.ignore_ddl = ignore_ddl
 		self.parent_doctype = parent_doctype
+		self.cursor = cursor
+		self.cursor_columns = []
+		self.cache = cache
 
 		# for contextual user permission check
 		# to determine which user permission is applicable on link field of specific doctype
@@ -199,8 +215,21 @@ class DatabaseQuery:
 		if not self.columns:
 			return []
 
+		if as_iterator and self.run:
+			if sbool(with_comment_count):
+				frappe.throw(_("`with_comment_count` is not supported with `as_iterator`"))
+			if cursor is not None:
+				frappe.throw(_("`cursor` is not supported with `as_iterator`"))
+
+			# build the query (and apply permission conditions) right away, run it lazily
+			self.run = False
+			return self.iterate(self.build_and_run(), pluck=pluck, chunk_size=chunk_size)
+
 		result = self.build_and_run()
 
+		if self.cursor is not None and self.run:
+			result = self.get_cursor_page(result)
+
 		if sbool(with_comment_count) and not as_list and self.doctype:
 			self.add_comment_count(result)
 
@@ -209,7 +238,8 @@ class DatabaseQuery:
 			self.update_user_settings()
 
 		if pluck:
-			return [d[pluck] for d in result]
+			plucked = [d[pluck] for d in result]
+			return CursorPage(plucked, result.next_cursor) if self.cursor is not None else plucked
 
 		return result
 
@@ -239,6 +269,16 @@ class DatabaseQuery:
 			% args
 		)
 
+		if self.cache and self.run:
+			return cached_sql(
+				query,
+				ttl=self.cache,
+				as_dict=not self.as_list,
+				debug=self.debug,
+				update=self.update,
+				ignore_ddl=self.ignore_ddl,
+			)
+
 		return frappe.db.sql(
 			query,
 			as_dict=not self.as_list,
@@ -248,6 +288,26 @@ class DatabaseQuery:
 			run=self.run,
 		)
 
+	def iterate(self, query, pluck=None, chunk_size=None):
+		"""Yield rows of the query, streamed through an unbuffered cursor where supported.
+
+		No other queries can be run on the connection until iteration is complete."""
+		chunk_size = chunk_size or SQL_ITERATOR_BATCH_SIZE
+		cursor = frappe.db.unbuffered_cursor() if frappe.db.db_type == "mariadb" else nullcontext()
+
+		with cursor:
+			for row in frappe.db.sql(
+				query,
+				as_dict=not self.as_list,
+				as_list=self.as_list,
+				debug=self.debug,
+				update=self.update,
+				ignore_ddl=self.ignore_ddl,
+				as_iterator=True,
+				chunk_size=chunk_size,
+			):
+				yield row[pluck] if pluck else row
+
 	def prepare_args(self):
 		self.parse_args()
 		self.sanitize_fields()
@@ -313,6 +373,9 @@ class DatabaseQuery:
 
 		self.set_order_by(args)
 
+		if self.cursor is not None:
+			self.apply_cursor(args)
+
 		self.validate_order_by_and_group_by(args.order_by)
 		args.order_by = args.order_by and (" order by " + args.order_by) or ""
 
@@ -1142,8 +1205,104 @@ class DatabaseQuery:
 			if function in blacklisted_sql_functions:
 				frappe.throw(_("Cannot use {0} in order/group by").format(field))
 
+	def apply_cursor(self, args):
+		"""Seek past the row the cursor points to instead of using an offset.
+
+		Every ordering column is a column of the main table and `name` is always part of the
+		ordering, so that rows are in a stable order and the cursor identifies a single row."""
+		if self.group_by or self.distinct:
+			frappe.throw(_("Cursor pagination is not supported with group by or distinct"))
+
+		table = f"`tab{self.doctype}`"
+		order_by = []
+
+		for part in filter(None, (p.strip() for p in (args.order_by or "").split(","))):
+			match = ORDER_COLUMN_PATTERN.match(part)
+			if (
+				not match
+				or (match.group(1) and match.group(1) != self.doctype)
+				or match.group(2) not in self.columns
+			):
+				frappe.throw(
+					_("Cursor pagination requires ordering by columns of {0}, got {1}").format(
+						self.doctype, part
+					)
+				)
+
+			column = match.group(2)
+			if column not in (c for c, _direction in order_by):
+				order_by.append((column, (match.group(3) or "asc").lower()))
+
+		if "name" not in (c for c, _direction in order_by):
+			order_by.append(("name", order_by[-1][1] if order_by else "asc"))
+
+		self.cursor_columns = order_by
+		args.order_by = ", ".join(f"{table}.`{column}` {direction}" for column, direction in order_by)
+		args.fields += "".join(
+			f", {table}.`{column}` as `_cursor_{i}`" for i, (column, _direction) in enumerate(order_by)
+		)
+
+		if self.cursor:
+			seek = self.get_seek_condition(decode_cursor(self.cursor, order_by))
+			args.conditions = f"({args.conditions}) and ({seek})" if args.conditions else seek
+
+	def get_seek_condition(self, values) -> str:
+		"""Condition matching rows that come after the row having given values for ordering columns."""
+		# NULLs are the smallest values on MariaDB and the largest on Postgres
+		nulls_small = frappe.db.db_type != "postgres"
+		table = f"`tab{self.doctype}`"
+		equal, conditions = [], []
+
+		for (column, direction), value in zip(self.cursor_columns, values):
+			field = f"{table}.`{column}`"
+			nulls_first = nulls_small == (direction == "asc")
+
+			if value is None:
+				after = f"{field} is not null" if nulls_first else None
+				equal_to = f"{field} is null"
+			else:
+				if isinstance(value, int | float):
+					value = str(value)
+				else:
+					value = frappe.db.escape(cstr(value), percent=False)
+				after = f"{field} {'>' if direction == 'asc' else '<'} {value}"
+				if not nulls_first and column != "name":
+					after = f"({after} or {field} is null)"
+				equal_to = f"{field} = {value}"
+
+			if after:
+				conditions.append(" and ".join([*equal, after]))
+			equal.append(equal_to)
+
+		return " or ".join(f"({c})" for c in conditions) if conditions else "1=0"
+
+	def get_cursor_page(self, result) -> "CursorPage":
+		"""Strip cursor columns from rows and compute the cursor for the next page."""
+		count = len(self.cursor_columns)
+		next_cursor = None
+
+		if result and self.limit_page_length and len(result) >= self.limit_page_length:
+			last = result[-1]
+			if self.as_list:
+				values = last[-count:]
+			else:
+				values = [last[f"_cursor_{i}"] for i in range(count)]
+			next_cursor = encode_cursor(self.cursor_columns, values)
+
+		if self.as_list:
+			rows = [row[:-count] for row in result]
+		else:
+			rows = result
+			for row in rows:
+				for i in range(count):
+					del row[f"_cursor_{i}"]
+
+		return CursorPage(rows, next_cursor)
+
 	def add_limit(self):
 		if self.limit_page_length:
+			if self.cursor is not None:
+				return f"limit {self.limit_page_length}"
 			return f"limit {self.limit_page_length} offset {self.limit_start}"
 		else:
 			return ""
@@ -1170,6 +1329,49 @@ class DatabaseQuery:
 		update_user_settings(self.doctype, user_settings)
 
 
+class CursorPage(list):
+	"""Page of rows fetched with cursor pagination.
+
+	`next_cursor` is passed as `cursor` to fetch the next page, it is None on the last page."""
+
+	__slots__ = ("next_cursor",)
+
+	def __init__(self, rows=(), next_cursor: str | None = None):
+		super().__init__(rows)
+		self.next_cursor = next_cursor
+
+
+def encode_cursor(order_by: list[tuple[str, str]], values) -> str:
+	"""Return an opaque cursor pointing to a row having given values for ordering columns."""
+	payload = json.dumps(
+		[", ".join(f"{c} {d}" for c, d in order_by), list(values)], separators=(",", ":"), default=str
+	)
+	return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: list[tuple[str, str]]) -> list:
+	"""Return values of ordering columns from cursor, the ordering must match the cursor's."""
+	try:
+		payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+		ordering, values = json.loads(payload, parse_constant=reject_json_constant)
+	except (binascii.Error, TypeError, ValueError):
+		frappe.throw(_("Invalid cursor"))
+
+	if ordering != ", ".join(f"{c} {d}" for c, d in order_by) or len(values) != len(order_by):
+		frappe.throw(_("Cursor does not match the ordering of the query"))
+
+	# e.g. 1e999, values are put in the query as is
+	if any(isinstance(value, float) and not math.isfinite(value) for value in values):
+		frappe.throw(_("Invalid cursor"))
+
+	return values
+
+
+def reject_json_constant(constant: str):
+	# NaN and Infinity aren't valid JSON nor SQL
+	raise ValueError(f"Invalid constant {constant}")
+
+
 def cast_name(column: str) -> str:
 	"""Casts name field to varchar for postgres
 
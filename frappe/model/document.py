@@ -1,8 +1,10 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 import hashlib
+import itertools
 import json
 import time
+from collections import defaultdict
 from collections.abc import Generator, Iterable
 from typing import TYPE_CHECKING, Any, Optional
 
@@ -15,9 +17,14 @@ from frappe.core.doctype.server_script.server_script_utils import run_server_scr
 from frappe.desk.form.document_follow import follow_document
 from frappe.integrations.doctype.webhook import run_webhooks
 from frappe.model import optional_fields, table_fields
-from frappe.model.base_document import BaseDocument, get_controller
+from frappe.model.base_document import (
+	DOCTYPES_FOR_DOCTYPE,
+	BaseDocument,
+	get_controller,
+	prefetch_link_values,
+)
 from frappe.model.docstatus import DocStatus
-from frappe.model.naming import set_new_name, validate_name
+from frappe.model.naming import reserve_series, set_new_name, validate_name
 from frappe.model.utils import is_virtual_doctype
 from frappe.model.workflow import set_workflow_state_on_action, validate_workflow
 from frappe.types import DF
@@ -258,6 +265,36 @@ class Document(BaseDocument):
 		if self.flags.in_print:
 			return self
 
+		self._prepare_insert(
+			ignore_permissions=ignore_permissions,
+			ignore_links=ignore_links,
+			ignore_mandatory=ignore_mandatory,
+			set_name=set_name,
+			set_child_names=set_child_names,
+		)
+
+		# parent
+		if getattr(self.meta, "issingle", 0):
+			self.update_single(self.get_valid_dict())
+		else:
+			self.db_insert(ignore_if_duplicate=ignore_if_duplicate)
+
+		# children
+		for d in self.get_all_children():
+			d.db_insert()
+
+		self._finish_insert()
+		return self
+
+	def _prepare_insert(
+		self,
+		ignore_permissions=None,
+		ignore_links=None,
+		ignore_mandatory=None,
+		set_name=None,
+		set_child_names=True,
+	):
+		"""Set defaults, name and run validations and hooks that precede writing a new document."""
 		self.flags.notifications_executed = []
 
 		if ignore_permissions is not None:
@@ -288,18 +325,8 @@ class Document(BaseDocument):
 		self.set_docstatus()
 		self.flags.in_insert = False
 
-		# run validate, on update etc.
-
-		# parent
-		if getattr(self.meta, "issingle", 0):
-			self.update_single(self.get_valid_dict())
-		else:
-			self.db_insert(ignore_if_duplicate=ignore_if_duplicate)
-
-		# children
-		for d in self.get_all_children():
-			d.db_insert()
-
+	def _finish_insert(self):
+		"""Run hooks that follow writing a new document."""
 		self.run_method("after_insert")
 		self.flags.in_insert = True
 
@@ -323,7 +350,6 @@ class Document(BaseDocument):
 		):
 			if frappe.get_cached_value("User", frappe.session.user, "follow_created_documents"):
 				follow_document(self.doctype, self.name, frappe.session.user)
-		return self
 
 	def check_if_locked(self):
 		if self.creation and self.is_locked:
@@ -910,10 +936,16 @@ class Document(BaseDocument):
 		if self.flags.ignore_links or self._action == "cancel":
 			return
 
-		invalid_links, cancelled_links = self.get_invalid_links()
+		# resolve links of the whole tree with one query per linked doctype,
+		# unless already resolved along with other documents by `insert_many`
+		link_values = self.flags.link_values
+		if link_values is None:
+			link_values = prefetch_link_values([self])
+
+		invalid_links, cancelled_links = self.get_invalid_links(link_values=link_values)
 
 		for d in self.get_all_children():
-			result = d.get_invalid_links(is_submittable=self.meta.is_submittable)
+			result = d.get_invalid_links(is_submittable=self.meta.is_submittable, link_values=link_values)
 			invalid_links.extend(result[0])
 			cancelled_links.extend(result[1])
 
@@ -979,13 +1011,17 @@ class Document(BaseDocument):
 		if self.flags.notifications is None:
 
 			def _get_notifications():
-				"""Return enabled notifications for the current doctype."""
-
-				return frappe.get_all(
+				"""Return enabled notifications for the current doctype by (event, method)."""
+				notifications = {}
+				for alert in frappe.get_all(
 					"Notification",
-					fields=["name", "event", "method"],
+					fields=["name", "event", "method", "condition"],
 					filters={"enabled": 1, "document_type": self.doctype},
-				)
+				):
+					method = alert.method if alert.event == "Method" else None
+					notifications.setdefault((alert.event, method), []).append(alert)
+
+				return notifications
 
 			self.flags.notifications = frappe.cache.hget("notifications", self.doctype, _get_notifications)
 
@@ -996,7 +1032,7 @@ class Document(BaseDocument):
 			if alert.name in self.flags.notifications_executed:
 				return
 
-			evaluate_alert(self, alert.name, alert.event)
+			evaluate_alert(self, alert, alert.event)
 			self.flags.notifications_executed.append(alert.name)
 
 		event_map = {
@@ -1010,13 +1046,13 @@ class Document(BaseDocument):
 			# value change is not applicable in insert
 			event_map["on_change"] = "Value Change"
 
-		for alert in self.flags.notifications:
-			event = event_map.get(method, None)
-			if event and alert.event == event:
-				_evaluate_alert(alert)
-			elif alert.event == "Method" and method == alert.method:
+		if event := event_map.get(method):
+			for alert in self.flags.notifications.get((event, None), ()):
 				_evaluate_alert(alert)
 
+		for alert in self.flags.notifications.get(("Method", method), ()):
+			_evaluate_alert(alert)
+
 	def _submit(self):
 		"""Submit the document. Sets `docstatus` = 1, then saves."""
 		self.docstatus = DocStatus.submitted()
@@ -1649,6 +1685,120 @@ def execute_action(__doctype, __name, __action, **kwargs):
 	doc.notify_update()
 
 
+def insert_many(
+	docs: Iterable["Document | dict"],
+	ignore_permissions=None,
+	ignore_links=None,
+	ignore_mandatory=None,
+	chunk_size: int = 500,
+) -> list["Document"]:
+	"""Insert new documents, running the same validations and hooks as `Document.insert`.
+
+	Documents are processed in chunks. Within a chunk, links of all documents are
+	validated with one query per linked doctype, naming series counters are reserved
+	once per series and parents and child rows are written using multi-row INSERTs.
+
+	Unlike calling `insert` in a loop:
+	        - `after_insert` and later hooks run once every document of the chunk is written.
+	        - documents can't link to other documents of the same chunk.
+
+	:param docs: Documents or dicts with `doctype` set.
+	:param ignore_permissions: Do not check permissions if True.
+	:param ignore_links: Do not check validity of links if True.
+	:param ignore_mandatory: Do not check missing mandatory fields if True.
+	:param chunk_size: Number of documents validated and written together.
+	"""
+	inserted = []
+	docs = (frappe.get_doc(doc) if isinstance(doc, dict) else doc for doc in docs)
+
+	while chunk := list(itertools.islice(docs, chunk_size)):
+		link_values = {} if ignore_links else prefetch_link_values(chunk)
+
+		with reserve_series(len(chunk)):
+			for doc in chunk:
+				doc.flags.link_values = link_values
+				try:
+					doc._prepare_insert(
+						ignore_permissions=ignore_permissions,
+						ignore_links=ignore_links,
+						ignore_mandatory=ignore_mandatory,
+					)
+				finally:
+					doc.flags.link_values = None
+
+		_db_insert_many(chunk)
+
+		for doc in chunk:
+			doc._finish_insert()
+
+		inserted.extend(chunk)
+
+	return inserted
+
+
+def _db_insert_many(docs: list["Document"]) -> None:
+	"""Write new documents and their children with one INSERT per table.
+
+	Documents of virtual doctypes or with a controller overriding `db_insert` are written by their
+	own `db_insert`. On conflicts, fall back to `db_insert` per document for its retry and error
+	handling."""
+	rows = defaultdict(list)
+	own_inserts = []
+
+	for doc in docs:
+		if getattr(doc.meta, "issingle", 0):
+			doc.update_single(doc.get_valid_dict())
+			continue
+
+		for d in (doc, *doc.get_all_children()):
+			if _has_own_db_insert(d):
+				own_inserts.append(d)
+				continue
+
+			if not d.creation:
+				d.creation = d.modified = now()
+				d.created_by = d.modified_by = frappe.session.user
+
+			values = d.get_valid_dict(
+				convert_dates_to_str=True,
+				ignore_nulls=d.doctype in DOCTYPES_FOR_DOCTYPE,
+				ignore_virtual=True,
+			)
+			rows[(d.doctype, tuple(values))].append(tuple(values.values()))
+
+	savepoint = "insert_many_" + frappe.generate_hash(length=10)
+	frappe.db.savepoint(savepoint)
+
+	try:
+		for (doctype, columns), values in rows.items():
+			frappe.db.bulk_insert(doctype, columns, values)
+
+	except Exception as e:
+		if not (frappe.db.is_primary_key_violation(e) or frappe.db.is_unique_key_violation(e)):
+			raise
+
+		frappe.db.rollback(save_point=savepoint)
+		for doc in docs:
+			if not getattr(doc.meta, "issingle", 0):
+				doc.db_insert()
+				for d in doc.get_all_children():
+					d.db_insert()
+
+		return
+
+	frappe.db.release_savepoint(savepoint)
+	for d in own_inserts:
+		d.db_insert()
+
+	for doc in docs:
+		for d in (doc, *doc.get_all_children()):
+			d.set("__islocal", False)
+
+
+def _has_own_db_insert(doc: "BaseDocument") -> bool:
+	return bool(getattr(doc.meta, "is_virtual", 0)) or type(doc).db_insert is not BaseDocument.db_insert
+
+
 def bulk_insert(
 	doctype: str,
 	documents: Iterable["Document"],
@@ -1663,7 +1813,7 @@ def bulk_insert(
 	        - Documents can be any iterable / generator containing Document objects
 	"""
 
-	doctype_meta = frappe.get_meta(doctype)
+	doctype_meta = frappe.get_compiled_meta(doctype)
 	documents = list(documents)
 
 	valid_column_map = {
@@ -1674,7 +1824,9 @@ def bulk_insert(
 	}
 
 	for child_table in doctype_meta.get_table_fields():
-		valid_column_map[child_table.options] = frappe.get_meta(child_table.options).get_valid_columns()
+		valid_column_map[child_table.options] = frappe.get_compiled_meta(
+			child_table.options
+		).get_valid_columns()
 		values_map[child_table.options] = _document_values_generator(
 			(
 				ch_doc
@@ -4,6 +4,7 @@
 import datetime
 import re
 from collections.abc import Callable
+from contextlib import contextmanager
 from typing import TYPE_CHECKING, Optional
 
 import frappe
@@ -352,6 +353,9 @@ def determine_consecutive_week_number(datetime):
 
 
 def getseries(key, digits):
+	if (reservation := getattr(frappe.local, "series_reservation", None)) is not None:
+		return ("%0" + str(digits) + "d") % reservation.get_next(key)
+
 	# series created ?
 	# Using frappe.qb as frappe.get_values does not allow order_by=None
 	series = DocType("Series")
@@ -369,6 +373,81 @@ def getseries(key, digits):
 	return ("%0" + str(digits) + "d") % current
 
 
+class SeriesReservation:
+	"""Hands out series counters from ranges reserved in one UPDATE per series key.
+
+	Each key reserves as many values as the remaining budget when it's first used,
+	values that weren't handed out are given back by `release`."""
+
+	def __init__(self, budget: int):
+		self.budget = budget
+		self.used = 0
+		# key -> [next value, last reserved value]
+		self.ranges = {}
+
+	def get_next(self, key) -> int:
+		series_range = self.ranges.get(key)
+		if not series_range or series_range[0] > series_range[1]:
+			series_range = self.ranges[key] = self.reserve(key, max(self.budget - self.used, 1))
+
+		current = series_range[0]
+		series_range[0] += 1
+		self.used += 1
+		return current
+
+	@staticmethod
+	def reserve(key, count: int) -> list[int]:
+		series = DocType("Series")
+		current = (frappe.qb.from_(series).where(series.name == key).for_update().select("current")).run()
+
+		if current and current[0][0] is not None:
+			current = cint(current[0][0])
+			frappe.db.sql(
+				"UPDATE `tabSeries` SET `current` = `current` + %s WHERE `name`=%s", (count, key)
+			)
+		else:
+			current = 0
+			frappe.db.sql("INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, %s)", (key, count))
+
+		return [current + 1, current + count]
+
+	def release(self):
+		"""Give back unused values, the series row stays locked by this transaction till then."""
+		for key, (next_value, last_value) in self.ranges.items():
+			if unused := last_value - next_value + 1:
+				frappe.db.sql(
+					"UPDATE `tabSeries` SET `current` = `current` - %s WHERE `name`=%s AND `current`=%s",
+					(unused, key, last_value),
+				)
+
+		self.ranges = {}
+
+
+@contextmanager
+def reserve_series(count: int):
+	"""Reserve naming series counters for up to `count` documents named in this block.
+
+	Instead of one locking SELECT + UPDATE on `tabSeries` per document, each series
+	is bumped once. Unused counters are released at exit so no gaps are left.
+
+	Usage:
+	        with reserve_series(len(docs)):
+	                for doc in docs:
+	                        set_new_name(doc)
+	"""
+	if getattr(frappe.local, "series_reservation", None) is not None:
+		# already reserving
+		yield
+		return
+
+	frappe.local.series_reservation = reservation = SeriesReservation(count)
+	try:
+		yield
+	finally:
+		frappe.local.series_reservation = None
+		reservation.release()
+
+
 def revert_series_if_last(key, name, doc=None):
 	"""
 	Reverts the series for particular naming series:
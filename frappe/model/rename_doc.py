@@ -223,7 +223,7 @@ def rename_doc(
 	new_doc.clear_cache()
 	frappe.clear_cache()
 	if rebuild_search:
-		frappe.enqueue("frappe.utils.global_search.rebuild_for_doctype", doctype=doctype)
+		frappe.enqueue("frappe.utils.global_search.rebuild_for_doctype", doctype=doctype, full=True)
 
 	if show_alert:
 		frappe.msgprint(
@@ -695,7 +695,7 @@ def bulk_rename(
 				else:
 					rename_log.append(msg)
 
-	frappe.enqueue("frappe.utils.global_search.rebuild_for_doctype", doctype=doctype)
+	frappe.enqueue("frappe.utils.global_search.rebuild_for_doctype", doctype=doctype, full=True)
 
 	if not via_console:
 		return rename_log
@@ -2,6 +2,7 @@
 # License: MIT. See LICENSE
 
 import datetime
+import heapq
 import json
 import os
 import traceback
@@ -14,6 +15,9 @@ import frappe
 
 MONITOR_REDIS_KEY = "monitor-transactions"
 MONITOR_MAX_ENTRIES = 1000000
+# slowest queries kept per transaction when profiling, queries are truncated to this length
+PROFILE_TOP_QUERIES = 5
+PROFILE_MAX_QUERY_LENGTH = 1000
 
 
 def start(transaction_type="request", method=None, kwargs=None):
@@ -39,15 +43,26 @@ def get_trace_id() -> str | None:
 		return monitor.data.uuid
 
 
+def get_profile() -> "Profile | None":
+	"""Get profile of current transaction, if enabled using `monitor_profiling` site config."""
+	if monitor := getattr(frappe.local, "monitor", None):
+		return monitor.profile
+
+
 def log_file():
 	return os.path.join(frappe.utils.get_bench_path(), "logs", "monitor.json.log")
 
 
 class Monitor:
-	__slots__ = ("data",)
+	__slots__ = ("data", "profile")
 
 	def __init__(self, transaction_type, method, kwargs):
+		self.profile = None
+
 		try:
+			if frappe.conf.monitor_profiling:
+				self.profile = Profile(frappe.conf.monitor_profiling_top_queries or PROFILE_TOP_QUERIES)
+
 			self.data = frappe._dict(
 				{
 					"site": frappe.local.site,
@@ -110,15 +125,69 @@ class Monitor:
 					if limiter.rejected:
 						self.data.request.reset = limiter.reset
 
+			if self.profile:
+				self.data.profile = self.profile.as_dict()
+
 			self.store()
 		except Exception:
 			traceback.print_exc()
 
 	def store(self):
-		if frappe.cache.llen(MONITOR_REDIS_KEY) > MONITOR_MAX_ENTRIES:
-			frappe.cache.ltrim(MONITOR_REDIS_KEY, 1, -1)
 		serialized = json.dumps(self.data, sort_keys=True, default=str, separators=(",", ":"))
-		frappe.cache.rpush(MONITOR_REDIS_KEY, serialized)
+		key = frappe.cache.make_key(MONITOR_REDIS_KEY)
+
+		# one round trip, drop the oldest entries if logs aren't being flushed
+		pipeline = frappe.cache.pipeline(transaction=False)
+		pipeline.rpush(key, serialized)
+		pipeline.ltrim(key, -MONITOR_MAX_ENTRIES, -1)
+		pipeline.execute()
+
+
+class Profile:
+	"""Counters of database and cache calls made in a transaction, with its slowest queries.
+
+	Recording a call is a few additions, queries are only normalised when the profile is dumped."""
+
+	__slots__ = ("queries", "db_time", "redis_calls", "redis_time", "slowest", "top")
+
+	def __init__(self, top=PROFILE_TOP_QUERIES):
+		self.queries = 0
+		self.db_time = 0.0
+		self.redis_calls = 0
+		self.redis_time = 0.0
+		self.slowest = []  # min-heap of (duration, query)
+		self.top = top
+
+	def record_query(self, query: str, duration: float):
+		self.queries += 1
+		self.db_time += duration
+
+		if len(self.slowest) < self.top:
+			heapq.heappush(self.slowest, (duration, query))
+		elif duration > self.slowest[0][0]:
+			heapq.heapreplace(self.slowest, (duration, query))
+
+	def record_redis_call(self, duration: float):
+		self.redis_calls += 1
+		self.redis_time += duration
+
+	def as_dict(self) -> dict:
+		from frappe.recorder import normalize_query
+
+		# durations in microseconds, like the transaction's duration
+		return {
+			"queries": self.queries,
+			"db_time": int(self.db_time * 1000000),
+			"redis_calls": self.redis_calls,
+			"redis_time": int(self.redis_time * 1000000),
+			"slow_queries": [
+				{
+					"query": normalize_query(query[:PROFILE_MAX_QUERY_LENGTH]),
+					"duration": int(duration * 1000000),
+				}
+				for duration, query in sorted(self.slowest, reverse=True)
+			],
+		}
 
 
 def flush():
@@ -131,6 +200,6 @@ def flush():
 				f.write("\n".join(logs))
 				f.write("\n")
 			# Remove fetched entries from cache
-			frappe.cache.ltrim(MONITOR_REDIS_KEY, len(logs) - 1, -1)
+			frappe.cache.ltrim(MONITOR_REDIS_KEY, len(logs), -1)
 	except Exception:
 		traceback.print_exc()
@@ -5,6 +5,7 @@ import frappe
 from frappe import _
 from frappe.model.document import Document
 from frappe.utils import flt, is_image
+from frappe.utils.jinja import precompile_templates
 
 
 class LetterHead(Document):
@@ -106,6 +107,7 @@ class LetterHead(Document):
 
 		# clear the cache so that the new letter head is uploaded
 		frappe.clear_cache()
+		precompile_templates(self.content, self.footer)
 
 	def set_as_default(self):
 		from frappe.utils import set_default
@@ -137,7 +137,10 @@ frappe.ui.form.Toolbar = class Toolbar {
 					// handle document renaming queued action
 					if (input_name != docname) {
 						frappe.realtime.on("list_update", (data) => {
-							if (data.doctype == doctype && data.name == input_name) {
+							if (
+								data.doctype == doctype &&
+								(data.names || [data.name]).includes(input_name)
+							) {
 								reload_form(input_name);
 								frappe.show_alert({
 									message: __("Document renamed from {0} to {1}", [
@@ -1431,7 +1431,16 @@ frappe.views.ListView = class ListView extends frappe.views.BaseList {
 				return;
 			}
 
-			this.pending_document_refreshes.push(data);
+			if (data.names) {
+				// coalesced updates of multiple documents
+				data.names.forEach((name) => this.pending_document_refreshes.push({ ...data, name }));
+			} else if (!data.name) {
+				// too many documents were updated to list them, reload the list
+				this.refresh();
+				return;
+			} else {
+				this.pending_document_refreshes.push(data);
+			}
 			this.debounced_refresh();
 		});
 		this.realtime_events_setup = true;
@@ -58,6 +58,8 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 		this.refresh = frappe.utils.throttle(this.refresh, 300);
 
 		this.ignore_prepared_report = false;
+		// rows of prepared reports shown at first, more are loaded on demand
+		this.prepared_report_page_length = 500;
 		this.menu_items = [];
 	}
 
@@ -664,6 +666,7 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 					is_tree: this.report_settings.tree,
 					parent_field: this.report_settings.parent_field,
 					are_default_filters: are_default_filters,
+					prepared_report_page_length: this.prepared_report_page_length,
 				},
 				callback: resolve,
 				always: () => this.page.btn_secondary.prop("disabled", false),
@@ -709,6 +712,7 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 				if (data.message && !data.prepared_report) this.show_status(data.message);
 
 				this.toggle_message(false);
+				this.setup_prepared_report_paging(data);
 				if (data.result && data.result.length) {
 					this.prepare_report_data(data);
 					this.chart_options = this.get_chart_options(data);
@@ -949,9 +953,96 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 		this.tree_report = this.data.some((d) => "indent" in d);
 	}
 
+	setup_prepared_report_paging(data) {
+		this.prepared_report_paging = null;
+		// row_count is only sent if the rows can be loaded page by page
+		if (!data.prepared_report || data.row_count == null) return;
+
+		const rows = data.result.slice();
+		const total_row = data.add_total_row && rows.length ? rows.pop() : null;
+		this.prepared_report_paging = {
+			rows,
+			total_row,
+			row_count: data.row_count,
+			order_by: null,
+			order: "asc",
+		};
+	}
+
+	has_more_prepared_report_rows() {
+		const paging = this.prepared_report_paging;
+		return paging && paging.rows.length < paging.row_count;
+	}
+
+	load_prepared_report_rows({ reset = false } = {}) {
+		const paging = this.prepared_report_paging;
+		return frappe
+			.xcall("frappe.core.doctype.prepared_report.prepared_report.get_prepared_report_rows", {
+				name: this.prepared_report_document.name,
+				start: reset ? 0 : paging.rows.length,
+				page_length: this.prepared_report_page_length,
+				order_by: paging.order_by,
+				order: paging.order,
+			})
+			.then((r) => {
+				paging.rows = reset ? r.result : paging.rows.concat(r.result);
+				paging.row_count = r.row_count;
+
+				const result = paging.total_row ? paging.rows.concat([paging.total_row]) : paging.rows;
+				this.prepare_report_data(Object.assign({}, this.raw_data, { result }));
+				this.render_datatable();
+				this.show_footer_message();
+			});
+	}
+
+	load_more_prepared_report_rows() {
+		this.load_prepared_report_rows();
+	}
+
+	get_prepared_report_column_key(column) {
+		// rows are stored as lists (by column index) or dicts (by fieldname) on the server
+		const is_list = Array.isArray(this.prepared_report_paging.rows[0]);
+		return is_list ? this.columns.findIndex((col) => col.id === column.id) : column.id;
+	}
+
+	get_prepared_report_column_filters() {
+		// inline filters of the datatable, to be applied to all rows on the server
+		const applied = this.datatable.columnmanager.getAppliedFilters();
+		const filters = {};
+		for (const [col_index, value] of Object.entries(applied)) {
+			const column = this.datatable.getColumn(col_index);
+			if (column && column.id && value) {
+				filters[this.get_prepared_report_column_key(column)] = value;
+			}
+		}
+		return filters;
+	}
+
+	sort_prepared_report(column, order) {
+		// sort all rows on the server, not only the ones loaded
+		const paging = this.prepared_report_paging;
+		paging.order_by = this.get_prepared_report_column_key(column);
+		paging.order = order;
+		this.load_prepared_report_rows({ reset: true });
+	}
+
+	get_prepared_report_header_dropdown() {
+		return [
+			{
+				label: __("Sort All Rows Ascending"),
+				action: (column) => this.sort_prepared_report(column, "asc"),
+			},
+			{
+				label: __("Sort All Rows Descending"),
+				action: (column) => this.sort_prepared_report(column, "desc"),
+			},
+		];
+	}
+
 	render_datatable() {
 		let data = this.data;
 		let columns = this.columns.filter((col) => !col.hidden);
+		const paged = Boolean(this.prepared_report_paging);
 
 		if (this.raw_data.add_total_row && !this.report_settings.tree) {
 			data = data.slice();
@@ -962,7 +1053,8 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 		if (
 			this.datatable &&
 			this.datatable.options &&
-			this.datatable.options.showTotalRow === this.raw_data.add_total_row
+			this.datatable.options.showTotalRow === this.raw_data.add_total_row &&
+			this.datatable_paged === paged
 		) {
 			this.datatable.options.treeView = this.tree_report;
 			this.datatable.refresh(data, columns);
@@ -983,10 +1075,15 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 				},
 			};
 
+			if (paged) {
+				datatable_options.headerDropdown = this.get_prepared_report_header_dropdown();
+			}
+
 			if (this.report_settings.get_datatable_options) {
 				datatable_options = this.report_settings.get_datatable_options(datatable_options);
 			}
 			this.datatable = new window.DataTable(this.$report[0], datatable_options);
+			this.datatable_paged = paged;
 		}
 
 		if (typeof this.report_settings.initial_depth == "number") {
@@ -1520,11 +1617,6 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 					])
 				);
 
-				const visible_idx = this.datatable.bodyRenderer.visibleRowIndices;
-				if (visible_idx.length + 1 === this.data.length) {
-					visible_idx.push(visible_idx.length);
-				}
-
 				const args = {
 					cmd: "frappe.desk.query_report.export_query",
 					report_name: this.report_name,
@@ -1532,13 +1624,32 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 					file_format_type: file_format,
 					filters: filters,
 					applied_filters: applied_filters,
-					visible_idx,
 					csv_delimiter,
 					csv_quoting,
 					include_indentation,
 					include_filters,
 				};
 
+				const paging = this.prepared_report_paging;
+				if (paging) {
+					// only some rows of a paged prepared report are loaded, so export all of them
+					// matching the column filters, in the order they are sorted on the server
+					if (paging.order_by != null) {
+						args.prepared_report_order_by = paging.order_by;
+						args.prepared_report_order = paging.order;
+					}
+					const column_filters = this.get_prepared_report_column_filters();
+					if (Object.keys(column_filters).length) {
+						args.prepared_report_filters = column_filters;
+					}
+				} else {
+					const visible_idx = this.datatable.bodyRenderer.visibleRowIndices;
+					if (visible_idx.length + 1 === this.data.length) {
+						visible_idx.push(visible_idx.length);
+					}
+					args.visible_idx = visible_idx;
+				}
+
 				open_url_post(frappe.request.url, args);
 
 				this.export_dialog.hide();
@@ -1963,6 +2074,19 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 		this.$report_footer.append(`<div class="col-md-12">
 			<span">${message}</span><span class="pull-right">${execution_time_msg}</span>
 		</div>`);
+
+		if (this.has_more_prepared_report_rows()) {
+			const paging = this.prepared_report_paging;
+			const rows_msg = __(
+				"Showing {0} of {1} rows. Filters apply to the rows shown, exports include all rows matching them.",
+				[paging.rows.length, paging.row_count]
+			);
+			this.$report_footer.append(`<div class="col-md-12">
+				<span>${rows_msg}</span>
+				<button class="btn btn-xs btn-default" data-action="load_more_prepared_report_rows">
+					${__("Load More")}</button>
+			</div>`);
+		}
 	}
 
 	expand_all_rows() {
@@ -236,7 +236,10 @@ frappe.views.ReportView = class ReportView extends frappe.views.ListView {
 	}
 
 	on_update(data) {
-		if (this.doctype === data.doctype && data.name) {
+		if (this.doctype === data.doctype && !data.name) {
+			// coalesced updates of multiple documents
+			this.refresh();
+		} else if (this.doctype === data.doctype && data.name) {
 			// flash row when doc is updated by some other user
 			const flash_row = data.user !== frappe.session.user;
 			if (this.data.find((d) => d.name === data.name)) {
@@ -1,12 +1,20 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and contributors
 # License: MIT. See LICENSE
 
+import time
 from contextlib import suppress
 
 import redis
 
 import frappe
-from frappe.utils.data import cstr
+from frappe.utils.data import cint, cstr, flt
+
+# list_update events of a doctype are held for this many seconds and sent as one event
+LIST_UPDATE_COALESCE_WINDOW = 1
+MAX_COALESCED_NAMES = 100
+# events published per request or job, beyond it bulk updates are sent without document names
+# and doc_update events are skipped
+DEFAULT_EVENT_BUDGET = 100
 
 
 def publish_progress(
@@ -86,33 +94,125 @@ def publish_realtime(
 
 
 def flush_realtime_log():
-	for args in frappe.local._realtime_log:
-		frappe.realtime.emit_via_redis(*args)
+	events = []
+	for event, message, room in frappe.local._realtime_log:
+		if event == "list_update":
+			add_pending_list_update(message, room)
+		else:
+			events.append((event, message, room))
 
 	clear_realtime_log()
 
+	pending_list_updates = getattr(frappe.local, "_pending_list_updates", {})
+	over_budget = get_events_published() + len(events) + len(pending_list_updates) > get_event_budget()
+	if over_budget:
+		# documents of a bulk operation, list views are refreshed by the coalesced list_update
+		events = [params for params in events if params[0] != "doc_update"]
+
+	events.extend(pop_pending_list_updates(without_names=over_budget))
+	emit_via_redis(events=events)
+
 
 def clear_realtime_log():
 	if hasattr(frappe.local, "_realtime_log"):
 		del frappe.local._realtime_log
 
 
-def emit_via_redis(event, message, room):
+def add_pending_list_update(message, room):
+	"""Hold list_update events to send one event per doctype for updates of the coalescing window."""
+	if not hasattr(frappe.local, "_pending_list_updates"):
+		frappe.local._pending_list_updates = {}
+		if frappe.request and hasattr(frappe.request, "after_response"):
+			frappe.request.after_response.add(flush_pending_list_updates)
+		elif frappe.job:
+			frappe.job.after_job.add(flush_pending_list_updates)
+
+	pending = frappe.local._pending_list_updates.setdefault(
+		room, {"since": time.monotonic(), "messages": []}
+	)
+	if message not in pending["messages"]:
+		pending["messages"].append(message)
+
+
+def pop_pending_list_updates(force=False, without_names=False):
+	"""Return coalesced list_update events of rooms whose coalescing window has passed."""
+	pending_list_updates = getattr(frappe.local, "_pending_list_updates", {})
+
+	# there is no end of request or job to wait for
+	if not (frappe.request or frappe.job):
+		force = True
+
+	window = flt(frappe.conf.realtime_coalesce_window, LIST_UPDATE_COALESCE_WINDOW)
+	events = []
+
+	for room, pending in list(pending_list_updates.items()):
+		if force or time.monotonic() - pending["since"] >= window:
+			del pending_list_updates[room]
+			events.append(("list_update", merge_list_updates(pending["messages"], without_names), room))
+
+	return events
+
+
+def flush_pending_list_updates():
+	pending_list_updates = getattr(frappe.local, "_pending_list_updates", {})
+	over_budget = get_events_published() + len(pending_list_updates) > get_event_budget()
+	emit_via_redis(events=pop_pending_list_updates(force=True, without_names=over_budget))
+
+
+def merge_list_updates(messages, without_names=False):
+	"""Merge list_update messages of a doctype.
+
+	A single update is sent as is. Otherwise names of updated documents are sent as `names`,
+	or not at all for large updates, clients then refresh the whole list."""
+	if len(messages) == 1 and not without_names:
+		return messages[0]
+
+	merged = {"doctype": messages[0]["doctype"]}
+	if len(users := {m.get("user") for m in messages}) == 1:
+		merged["user"] = users.pop()
+
+	names = list(dict.fromkeys(m["name"] for m in messages if m.get("name")))
+	if not without_names and len(names) <= MAX_COALESCED_NAMES:
+		merged["names"] = names
+
+	return merged
+
+
+def get_event_budget():
+	return cint(frappe.conf.realtime_event_budget) or DEFAULT_EVENT_BUDGET
+
+
+def get_events_published():
+	return getattr(frappe.local, "_realtime_events_published", 0)
+
+
+def emit_via_redis(event=None, message=None, room=None, *, events=None):
 	"""Publish real-time updates via redis
 
 	:param event: Event name, like `task_progress` etc.
 	:param message: JSON message object. For async must contain `task_id`
-	:param room: name of the room"""
+	:param room: name of the room
+	:param events: List of (event, message, room) to publish in a single pipeline instead"""
 	from frappe.utils.background_jobs import get_redis_connection_without_auth
 
+	if events is None:
+		events = [(event, message, room)]
+
+	if not events:
+		return
+
+	frappe.local._realtime_events_published = get_events_published() + len(events)
+
 	with suppress(redis.exceptions.ConnectionError):
-		r = get_redis_connection_without_auth()
-		r.publish(
-			"events",
-			frappe.as_json(
-				{"event": event, "message": message, "room": room, "namespace": frappe.local.site}
-			),
-		)
+		pipeline = get_redis_connection_without_auth().pipeline(transaction=False)
+		for event, message, room in events:
+			pipeline.publish(
+				"events",
+				frappe.as_json(
+					{"event": event, "message": message, "room": room, "namespace": frappe.local.site}
+				),
+			)
+		pipeline.execute()
 
 
 @frappe.whitelist(allow_guest=True)
@@ -2,8 +2,11 @@
 # License: MIT. See LICENSE
 import datetime
 import functools
+import hashlib
 import inspect
 import json
+import math
+import random
 import re
 import time
 from collections import Counter
@@ -14,18 +17,41 @@ import sqlparse
 import frappe
 from frappe import _
 from frappe.database.database import is_query_type
+from frappe.utils import cint, flt
 
 RECORDER_INTERCEPT_FLAG = "recorder-intercept"
 RECORDER_REQUEST_SPARSE_HASH = "recorder-requests-sparse"
 RECORDER_REQUEST_HASH = "recorder-requests"
 TRACEBACK_PATH_PATTERN = re.compile(".*/apps/")
 
+# Sampling mode: queries of sampled requests are aggregated by normalized query (fingerprint).
+# All keys start with `RECORDER_FINGERPRINTS` so that they can be cleared together.
+RECORDER_FINGERPRINTS = "recorder-fingerprints"  # sorted set of fingerprints by count
+RECORDER_FINGERPRINT_STATS = "recorder-fingerprints|stats|"  # hash per fingerprint
+RECORDER_FINGERPRINT_ENDPOINTS = "recorder-fingerprints|endpoints|"  # sorted set per fingerprint
+SAMPLING_EXPIRY = 12 * 60 * 60
+MAX_FINGERPRINTS = 1000
+MAX_ENDPOINTS = 20
+MAX_EXAMPLE_LENGTH = 10000
+# query durations are counted in buckets growing by `HISTOGRAM_FACTOR`, percentiles are estimated
+# as the upper bound of the bucket they fall in
+HISTOGRAM_BASE = 0.05  # ms
+HISTOGRAM_FACTOR = 1.25
+HISTOGRAM_BUCKETS = 64
+
 
 def sql(*args, **kwargs):
 	start_time = time.monotonic()
 	result = frappe.db._sql(*args, **kwargs)
 	end_time = time.monotonic()
 
+	recorder = frappe.local._recorder
+	if recorder.sampling:
+		recorder.register(
+			{"query": str(frappe.db.last_query), "duration": (end_time - start_time) * 1000}
+		)
+		return result
+
 	stack = list(get_current_stack_frames())
 
 	data = {
@@ -88,6 +114,8 @@ def post_process():
 		mark_duplicates(request)
 		frappe.cache.hset(RECORDER_REQUEST_HASH, request["uuid"], request)
 
+	explain_fingerprints()
+
 
 def mark_duplicates(request):
 	exact_duplicates = Counter([call["query"] for call in request["calls"]])
@@ -133,8 +161,23 @@ def normalize_query(query: str) -> str:
 
 def record(force=False):
 	if __debug__:
-		if frappe.cache.get_value(RECORDER_INTERCEPT_FLAG) or force:
+		if force:
 			frappe.local._recorder = Recorder()
+			return
+
+		flag = frappe.cache.get_value(RECORDER_INTERCEPT_FLAG, expires=True)
+		if not flag:
+			return
+
+		if not isinstance(flag, dict):
+			frappe.local._recorder = Recorder()
+			return
+
+		# sampling, slow requests are only known at the end so all of them are recorded if required
+		sample_rate = cint(flag.get("sample_rate"))
+		sampled = bool(sample_rate) and random.random() * sample_rate < 1
+		if sampled or flag.get("latency_threshold"):
+			frappe.local._recorder = Recorder(sampling=flag, sampled=sampled)
 
 
 def dump():
@@ -144,10 +187,12 @@ def dump():
 
 
 class Recorder:
-	def __init__(self):
+	def __init__(self, sampling=None, sampled=False):
 		self.uuid = frappe.generate_hash(length=10)
 		self.time = datetime.datetime.now()
 		self.calls = []
+		self.sampling = sampling
+		self.sampled = sampled
 		if frappe.request:
 			self.path = frappe.request.path
 			self.cmd = frappe.local.form_dict.cmd or ""
@@ -176,6 +221,13 @@ class Recorder:
 		self.calls.append(data)
 
 	def dump(self):
+		if self.sampling:
+			duration = (datetime.datetime.now() - self.time).total_seconds() * 1000
+			threshold = flt(self.sampling.get("latency_threshold"))
+			if self.sampled or (threshold and duration >= threshold):
+				aggregate_calls(self.calls, self.cmd or self.path)
+			return
+
 		request_data = {
 			"uuid": self.uuid,
 			"path": self.path,
@@ -200,6 +252,147 @@ class Recorder:
 		frappe.cache.hset(RECORDER_REQUEST_HASH, self.uuid, request_data)
 
 
+@functools.lru_cache(maxsize=4096)
+def get_fingerprint(query: str) -> tuple[str, str]:
+	"""Return (fingerprint, normalized query) of the query."""
+	normalized = normalize_query(query)
+	return hashlib.sha1(normalized.encode()).hexdigest()[:16], normalized
+
+
+def get_histogram_bucket(duration: float) -> int:
+	if duration <= HISTOGRAM_BASE:
+		return 0
+	bucket = math.ceil(math.log(duration / HISTOGRAM_BASE, HISTOGRAM_FACTOR))
+	return min(bucket, HISTOGRAM_BUCKETS - 1)
+
+
+def aggregate_calls(calls: list[dict], endpoint: str | None) -> None:
+	"""Add queries of a sampled request to the aggregates of their fingerprints, in one round trip."""
+	aggregates = {}
+	for call in calls:
+		fingerprint, normalized = get_fingerprint(call["query"])
+		if fingerprint not in aggregates:
+			aggregates[fingerprint] = frappe._dict(
+				query=normalized, example=call["query"], count=0, time=0.0, buckets=Counter()
+			)
+		aggregate = aggregates[fingerprint]
+		aggregate.count += 1
+		aggregate.time += call["duration"]
+		aggregate.buckets[get_histogram_bucket(call["duration"])] += 1
+
+	if not aggregates:
+		return
+
+	cache = frappe.cache
+	index_key = cache.make_key(RECORDER_FINGERPRINTS)
+	pipeline = cache.pipeline(transaction=False)
+
+	for fingerprint, aggregate in aggregates.items():
+		stats_key = cache.make_key(RECORDER_FINGERPRINT_STATS + fingerprint)
+		endpoints_key = cache.make_key(RECORDER_FINGERPRINT_ENDPOINTS + fingerprint)
+
+		pipeline.zincrby(index_key, aggregate.count, fingerprint)
+		pipeline.hset(
+			stats_key,
+			mapping={
+				"query": aggregate.query,
+				"example": aggregate.example[:MAX_EXAMPLE_LENGTH],
+				"last_seen": time.time(),
+			},
+		)
+		pipeline.hincrby(stats_key, "count", aggregate.count)
+		pipeline.hincrbyfloat(stats_key, "time", aggregate.time)
+		for bucket, count in aggregate.buckets.items():
+			pipeline.hincrby(stats_key, f"b{bucket}", count)
+		pipeline.expire(stats_key, SAMPLING_EXPIRY)
+
+		if endpoint:
+			pipeline.zincrby(endpoints_key, aggregate.count, endpoint)
+			pipeline.zremrangebyrank(endpoints_key, 0, -(MAX_ENDPOINTS + 1))
+			pipeline.expire(endpoints_key, SAMPLING_EXPIRY)
+
+	# least frequent fingerprints are dropped, their stats expire
+	pipeline.zremrangebyrank(index_key, 0, -(MAX_FINGERPRINTS + 1))
+	pipeline.expire(index_key, SAMPLING_EXPIRY)
+	pipeline.execute()
+
+
+def get_percentile(buckets: dict[int, int], count: int, percentile: float) -> float:
+	rank, seen = percentile * count, 0
+	for bucket in sorted(buckets):
+		seen += buckets[bucket]
+		if seen >= rank:
+			return round(HISTOGRAM_BASE * HISTOGRAM_FACTOR**bucket, 3)
+	return 0.0
+
+
+def get_fingerprint_stats(limit: int = 100) -> list[dict]:
+	"""Return aggregates of the most frequent fingerprints, slowest (in total) first."""
+	cache = frappe.cache
+	index_key = cache.make_key(RECORDER_FINGERPRINTS)
+	fingerprints = [frappe.safe_decode(f) for f in cache.zrevrange(index_key, 0, limit - 1)]
+
+	pipeline = cache.pipeline(transaction=False)
+	for fingerprint in fingerprints:
+		pipeline.hgetall(cache.make_key(RECORDER_FINGERPRINT_STATS + fingerprint))
+		pipeline.zrevrange(
+			cache.make_key(RECORDER_FINGERPRINT_ENDPOINTS + fingerprint), 0, -1, withscores=True
+		)
+	results = pipeline.execute()
+
+	stats = []
+	for fingerprint, values, endpoints in zip(fingerprints, results[::2], results[1::2]):
+		if not values:
+			continue
+
+		values = {frappe.safe_decode(k): frappe.safe_decode(v) for k, v in values.items()}
+		count = cint(values.get("count"))
+		buckets = {int(k[1:]): cint(v) for k, v in values.items() if k[0] == "b"}
+		stats.append(
+			{
+				"fingerprint": fingerprint,
+				"query": values.get("query"),
+				"count": count,
+				"time": round(flt(values.get("time")), 3),
+				"average": round(flt(values.get("time")) / count, 3) if count else 0,
+				"p50": get_percentile(buckets, count, 0.5),
+				"p95": get_percentile(buckets, count, 0.95),
+				"p99": get_percentile(buckets, count, 0.99),
+				"rows_examined": cint(values["rows_examined"]) if "rows_examined" in values else None,
+				"endpoints": [(frappe.safe_decode(e), int(c)) for e, c in endpoints],
+				"last_seen": flt(values.get("last_seen")),
+			}
+		)
+
+	return sorted(stats, key=lambda s: s["time"], reverse=True)
+
+
+def explain_fingerprints() -> None:
+	"""Set rows examined, as estimated by `EXPLAIN` of an example query, on fingerprints lacking it."""
+	cache = frappe.cache
+	pipeline = cache.pipeline(transaction=False)
+
+	for fingerprint in cache.zrange(cache.make_key(RECORDER_FINGERPRINTS), 0, -1):
+		stats_key = cache.make_key(RECORDER_FINGERPRINT_STATS + frappe.safe_decode(fingerprint))
+		example, rows_examined = cache.hmget(stats_key, ["example", "rows_examined"])
+		if not example or rows_examined is not None:
+			continue
+
+		query = frappe.safe_decode(example)
+		if not is_query_type(query, ("select", "update", "delete")):
+			continue
+
+		try:
+			explain_result = frappe.db.sql(f"EXPLAIN {query}", as_dict=True)
+		except Exception:
+			continue
+
+		rows_examined = sum(cint(row.get("rows")) for row in explain_result)
+		pipeline.hset(stats_key, "rows_examined", rows_examined)
+
+	pipeline.execute()
+
+
 def _patch():
 	frappe.db._sql = frappe.db.sql
 	frappe.db.sql = sql
@@ -240,8 +433,16 @@ def status(*args, **kwargs):
 @frappe.whitelist()
 @do_not_record
 @administrator_only
-def start(*args, **kwargs):
-	frappe.cache.set_value(RECORDER_INTERCEPT_FLAG, 1, expires_in_sec=60 * 60)
+def start(sample_rate=None, latency_threshold=None, *args, **kwargs):
+	"""Start recording requests and jobs.
+
+	If `sample_rate` (record 1 in N) or `latency_threshold` (in ms) is set, only queries are
+	recorded and they are aggregated by fingerprint instead of being stored per request."""
+	if cint(sample_rate) or flt(latency_threshold):
+		flag = {"sample_rate": cint(sample_rate), "latency_threshold": flt(latency_threshold)}
+		frappe.cache.set_value(RECORDER_INTERCEPT_FLAG, flag, expires_in_sec=SAMPLING_EXPIRY)
+	else:
+		frappe.cache.set_value(RECORDER_INTERCEPT_FLAG, 1, expires_in_sec=60 * 60)
 
 
 @frappe.whitelist()
@@ -276,6 +477,14 @@ def export_data(*args, **kwargs):
 def delete(*args, **kwargs):
 	frappe.cache.delete_value(RECORDER_REQUEST_SPARSE_HASH)
 	frappe.cache.delete_value(RECORDER_REQUEST_HASH)
+	frappe.cache.delete_keys(RECORDER_FINGERPRINTS)
+
+
+@frappe.whitelist()
+@do_not_record
+@administrator_only
+def get_fingerprints(limit=100, *args, **kwargs):
+	return get_fingerprint_stats(cint(limit))
 
 
 def record_queries(func: Callable):
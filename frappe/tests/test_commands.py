@@ -8,6 +8,7 @@ import json
 import os
 import secrets
 import shlex
+import shutil
 import string
 import subprocess
 import unittest
@@ -675,6 +676,85 @@ class TestBackups(BaseTestCommands):
 		)
 		self.assertEqual(self.returncode, 0)
 
+	@skipIf(
+		not (frappe.conf.db_type == "mariadb"),
+		"Only for MariaDB",
+	)
+	def test_parallel_backup_restore(self):
+		"""Take a parallel backup twice, files are only copied once, and restore it"""
+		# tables are dumped in separate transactions, only while they can't change
+		self.execute("bench --site {site} backup --parallel")
+		self.assertEqual(self.returncode, 1)
+
+		self.execute("bench --site {site} set-maintenance-mode on")
+		self.addCleanup(self.execute, "bench --site {site} set-maintenance-mode off")
+
+		self.execute("bench --site {site} backup --with-files --parallel --jobs 2")
+		self.assertEqual(self.returncode, 0)
+		self.execute("bench --site {site} backup --with-files --parallel --jobs 2")
+		self.assertEqual(self.returncode, 0)
+
+		database = max(glob(f"{self.site_backup_path}/*-database"), key=os.path.getmtime)
+		with open(os.path.join(database, "manifest.json")) as f:
+			self.assertIn("__Auth", [table["name"] for table in json.load(f)["tables"]])
+
+		files = max(
+			(path for path in glob(f"{self.site_backup_path}/*-files.json") if "-private-" not in path),
+			key=os.path.getmtime,
+		)
+		with open(files) as f:
+			self.assertEqual(json.load(f)["copied"], 0)
+
+		self.execute(
+			"bench --site {site} restore {database} --with-public-files {files}",
+			{"database": database, "files": files},
+		)
+		self.assertEqual(self.returncode, 0)
+
+	@skipIf(
+		not (frappe.conf.db_type == "postgres"),
+		"Only for Postgres",
+	)
+	def test_parallel_backup_restore_postgres(self):
+		"""Take a parallel backup with pg_dump and restore it"""
+		self.execute("bench --site {site} backup --parallel --jobs 2")
+		self.assertEqual(self.returncode, 0)
+
+		database = max(glob(f"{self.site_backup_path}/*-database"), key=os.path.getmtime)
+		with open(os.path.join(database, "manifest.json")) as f:
+			self.assertTrue(os.path.isdir(os.path.join(database, json.load(f)["data"])))
+
+		self.execute("bench --site {site} restore {database}", {"database": database})
+		self.assertEqual(self.returncode, 0)
+
+	def test_cleanup_of_running_parallel_backups(self):
+		"""Dumps and stored files of backups still being taken are kept"""
+		from frappe.utils.backups import delete_temp_backups, prune_file_objects
+
+		backup_path = frappe.get_site_path("private", "backups", "test-cleanup")
+		self.addCleanup(shutil.rmtree, backup_path, ignore_errors=True)
+		os.makedirs(os.path.join(backup_path, "file-objects", "ab"))
+		os.makedirs(os.path.join(backup_path, "20240101_000000-site-database"))
+
+		def store(name):
+			open(os.path.join(backup_path, "file-objects", "ab", name), "w").close()
+
+		store("ab-unused")
+		with patch("frappe.utils.backups.get_backup_path", return_value=backup_path):
+			delete_temp_backups()
+		self.assertEqual(os.listdir(os.path.join(backup_path, "file-objects", "ab")), [])
+		# a dump without a manifest is still being taken
+		self.assertTrue(os.path.isdir(os.path.join(backup_path, "20240101_000000-site-database")))
+
+		open(os.path.join(backup_path, "20240101_000000-site-files.json.running"), "w").close()
+		store("ab-copied")
+		store("ab-copied.1.tmp")
+		prune_file_objects(backup_path)
+		self.assertEqual(
+			sorted(os.listdir(os.path.join(backup_path, "file-objects", "ab"))),
+			["ab-copied", "ab-copied.1.tmp"],
+		)
+
 	def test_backup_fails_with_exit_code(self):
 		"""Provide incorrect options to check if exit code is 1"""
 		odb = BackupGenerator(
@@ -0,0 +1,71 @@
+# Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+import json
+
+import frappe
+from frappe.model.compiled_meta import COMPILED_META_VERSION, CompiledMeta
+from frappe.tests.utils import FrappeTestCase
+
+
+class TestCompiledMeta(FrappeTestCase):
+	def test_compiled_meta_matches_meta(self):
+		meta = frappe.get_meta("User")
+		compiled = frappe.get_compiled_meta("User")
+
+		self.assertEqual([df.fieldname for df in compiled.fields], [df.fieldname for df in meta.fields])
+		self.assertEqual(compiled.get_valid_columns(), meta.get_valid_columns())
+		self.assertEqual(
+			[df.fieldname for df in compiled.get_link_fields()],
+			[df.fieldname for df in meta.get_link_fields()],
+		)
+		self.assertEqual(
+			[df.fieldname for df in compiled.get_table_fields()],
+			[df.fieldname for df in meta.get_table_fields()],
+		)
+		self.assertEqual(
+			{df.fieldname for df in compiled.get_high_permlevel_fields()},
+			{df.fieldname for df in meta.get_high_permlevel_fields()},
+		)
+		self.assertEqual(
+			[df.fieldname for df in compiled.get_fields_to_fetch()],
+			[df.fieldname for df in meta.get_fields_to_fetch()],
+		)
+		self.assertEqual(compiled.get_search_fields(), meta.get_search_fields())
+		self.assertEqual(compiled.get_title_field(), meta.get_title_field())
+		self.assertEqual(compiled.get_field("email").fieldtype, meta.get_field("email").fieldtype)
+
+	def test_serialisation_roundtrip(self):
+		compiled = CompiledMeta.from_meta(frappe.get_meta("ToDo"))
+		loaded = CompiledMeta.loads(compiled.dumps())
+
+		self.assertEqual(loaded.name, "ToDo")
+		self.assertEqual(
+			[df.as_dict() for df in loaded.fields], [df.as_dict() for df in compiled.fields]
+		)
+		self.assertEqual(
+			[perm.as_dict() for perm in loaded.permissions],
+			[perm.as_dict() for perm in compiled.permissions],
+		)
+
+	def test_incompatible_payload_is_recompiled(self):
+		payload = json.loads(frappe.get_compiled_meta("ToDo").dumps())
+		payload[0] = COMPILED_META_VERSION + 1
+		self.assertIsNone(CompiledMeta.loads(json.dumps(payload)))
+
+		frappe.cache.hset("doctype_compiled_meta", "ToDo", json.dumps(payload))
+		self.assertEqual(frappe.get_compiled_meta("ToDo").name, "ToDo")
+
+	def test_compiled_meta_is_read_only(self):
+		compiled = frappe.get_compiled_meta("ToDo")
+		with self.assertRaises(AttributeError):
+			compiled.istable = 1
+		with self.assertRaises(AttributeError):
+			compiled.get_field("description").reqd = 1
+
+	def test_cache_invalidation(self):
+		frappe.get_compiled_meta("ToDo")
+		with self.assertQueryCount(0):
+			frappe.get_compiled_meta("ToDo")
+
+		frappe.clear_cache(doctype="ToDo")
+		self.assertIsNone(frappe.cache.hget("doctype_compiled_meta", "ToDo"))
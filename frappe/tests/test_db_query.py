@@ -11,7 +11,12 @@ from frappe.custom.doctype.property_setter.property_setter import make_property_
 from frappe.database.utils import DefaultOrderBy
 from frappe.desk.reportview import get_filters_cond
 from frappe.handler import execute_cmd
-from frappe.model.db_query import DatabaseQuery, get_between_date_filter
+from frappe.model.db_query import (
+	DatabaseQuery,
+	decode_cursor,
+	encode_cursor,
+	get_between_date_filter,
+)
 from frappe.permissions import add_user_permission, clear_user_permissions_for_doctype
 from frappe.query_builder import Column
 from frappe.tests.utils import FrappeTestCase
@@ -769,6 +774,83 @@ class TestDBQuery(FrappeTestCase):
 		owners = DatabaseQuery("DocType").execute(filters={"name": "DocType"}, pluck="owner")
 		self.assertEqual(owners, ["Administrator"])
 
+	def test_as_iterator(self):
+		kwargs = dict(fields=["name", "module"], order_by="name")
+		result = frappe.get_all("DocType", as_iterator=True, chunk_size=7, **kwargs)
+
+		self.assertNotIsInstance(result, list)
+		self.assertEqual(list(result), frappe.get_all("DocType", **kwargs))
+		self.assertEqual(
+			list(frappe.get_all("DocType", pluck="name", as_iterator=True)),
+			frappe.get_all("DocType", pluck="name"),
+		)
+		self.assertEqual(
+			list(frappe.get_all("DocType", as_list=True, as_iterator=True, **kwargs)),
+			[list(row) for row in frappe.get_all("DocType", as_list=True, **kwargs)],
+		)
+
+	def test_as_iterator_applies_permissions(self):
+		with setup_test_user(set_user=True):
+			self.assertEqual(
+				list(frappe.get_list("Blog Post", pluck="name", as_iterator=True)),
+				frappe.get_list("Blog Post", pluck="name"),
+			)
+			self.assertRaises(
+				frappe.PermissionError, frappe.get_list, "Error Log", as_iterator=True
+			)
+		frappe.set_user("Administrator")
+
+	def test_cursor_pagination(self):
+		for order_by, tiebreaker in (
+			("modified desc", "name desc"),
+			("creation asc, module desc", "name desc"),
+			("", "name asc"),
+		):
+			# ties are broken by name, in the direction of the last ordering column
+			expected = frappe.get_all(
+				"DocType", pluck="name", order_by=", ".join(filter(None, (order_by, tiebreaker))), limit=50
+			)
+			names, cursor = [], ""
+			while len(names) < 50:
+				page = frappe.get_all("DocType", pluck="name", order_by=order_by, limit=10, cursor=cursor)
+				names.extend(page)
+				cursor = page.next_cursor
+			self.assertEqual(names, expected)
+
+		page = frappe.get_all("DocType", fields=["name", "module"], limit=5, cursor="")
+		self.assertEqual(list(page[0]), ["name", "module"])
+		page = frappe.get_all("DocType", fields=["name"], limit=5, cursor="", as_list=True)
+		self.assertEqual(len(page[0]), 1)
+
+		last_page = frappe.get_all("DocType", filters={"name": "User"}, limit=5, cursor="")
+		self.assertIsNone(last_page.next_cursor)
+
+	def test_cursor_pagination_validation(self):
+		self.assertRaises(
+			frappe.ValidationError, frappe.get_all, "DocType", order_by="rand()", cursor=""
+		)
+		self.assertRaises(frappe.ValidationError, frappe.get_all, "DocType", cursor="not a cursor")
+
+		cursor = frappe.get_all("DocType", order_by="modified desc", limit=1, cursor="").next_cursor
+		self.assertRaises(
+			frappe.ValidationError,
+			frappe.get_all,
+			"DocType",
+			order_by="creation desc",
+			cursor=cursor,
+		)
+
+	def test_non_finite_cursor_values(self):
+		import base64
+
+		order_by = [("idx", "asc")]
+		self.assertEqual(decode_cursor(encode_cursor(order_by, [1.5]), order_by), [1.5])
+
+		for value in ("NaN", "Infinity", "-Infinity", "1e999"):
+			payload = f'["idx asc",[{value}]]'.encode()
+			cursor = base64.urlsafe_b64encode(payload).decode().rstrip("=")
+			self.assertRaises(frappe.ValidationError, decode_cursor, cursor, order_by)
+
 	def test_prepare_select_args(self):
 		# frappe.get_all inserts modified field into order_by clause
 		# test to make sure this is inserted into select field when postgres
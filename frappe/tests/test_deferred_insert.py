@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import frappe
 from frappe.deferred_insert import deferred_insert, save_to_db
 from frappe.tests.utils import FrappeTestCase
@@ -10,3 +12,29 @@ class TestDeferredInsert(FrappeTestCase):
 
 		save_to_db()
 		self.assertTrue(frappe.db.exists("Route History", route_history))
+
+	def test_deferred_insert_isolates_failing_records(self):
+		routes = [
+			{"route": frappe.generate_hash(), "user": "Administrator"},
+			{"route": frappe.generate_hash(), "user": "not-a-user@example.com"},
+			{"route": frappe.generate_hash(), "user": "Administrator"},
+		]
+		deferred_insert("Route History", routes[:2])
+		deferred_insert("Route History", routes[2])
+
+		save_to_db()
+		self.assertTrue(frappe.db.exists("Route History", routes[0]))
+		self.assertFalse(frappe.db.exists("Route History", {"route": routes[1]["route"]}))
+		self.assertTrue(frappe.db.exists("Route History", routes[2]))
+		self.assertFalse(frappe.cache.llen("insert_queue_for_Route History"))
+
+	def test_deferred_insert_batch_size(self):
+		routes = [{"route": frappe.generate_hash(), "user": "Administrator"} for _ in range(5)]
+		for route in routes:
+			deferred_insert("Route History", route)
+
+		with patch.dict(frappe.conf, {"deferred_insert_batch_size": 2}):
+			save_to_db()
+
+		for route in routes:
+			self.assertTrue(frappe.db.exists("Route History", route))
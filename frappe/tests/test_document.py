@@ -8,6 +8,7 @@ import frappe
 from frappe.app import make_form_dict
 from frappe.core.doctype.doctype.test_doctype import new_doctype
 from frappe.desk.doctype.note.note import Note
+from frappe.model.base_document import BaseDocument
 from frappe.model.naming import make_autoname, parse_naming_series, revert_series_if_last
 from frappe.tests.utils import FrappeTestCase
 from frappe.utils import cint, now_datetime, set_request
@@ -175,6 +176,93 @@ class TestDocument(FrappeTestCase):
 
 		self.assertEqual(frappe.db.get_value("User", d.name), d.name)
 
+	def test_link_validation_is_batched(self):
+		def get_user(roles):
+			return frappe.get_doc(
+				{
+					"doctype": "User",
+					"email": "test_batched_link_validation@example.com",
+					"first_name": "Link Validation",
+					"roles": [{"role": role} for role in roles],
+				}
+			)
+
+		get_user(["Guest"])._validate_links()  # warm up meta
+
+		# one query for all rows linking to Role, on the first validation
+		d = get_user(["System Manager", "Blogger", "Website Manager", "Report Manager"])
+		with self.assertQueryCount(1):
+			d._validate_links()
+
+		d.append("roles", {"role": "ABC"})
+		self.assertRaisesRegex(frappe.LinkValidationError, "ABC", d._validate_links)
+
+	def test_insert_many(self):
+		events = frappe.insert_many(
+			{
+				"doctype": "Event",
+				"subject": f"test-doc-test-insert-many {i}",
+				"starts_on": "2014-01-01",
+				"event_type": "Public",
+			}
+			for i in range(5)
+		)
+
+		self.assertEqual(len(events), 5)
+		for i, event in enumerate(events):
+			self.assertTrue(event.name.startswith("EV"))
+			self.assertFalse(event.is_new())
+			self.assertEqual(frappe.db.get_value("Event", event.name, "subject"), event.subject)
+			# defaults are set as with insert
+			self.assertEqual(event.send_reminder, 1)
+
+		# series counters are consecutive and none are left unused
+		counters = [cint(event.name[2:]) for event in events]
+		self.assertEqual(counters, list(range(counters[0], counters[0] + 5)))
+		self.assertEqual(
+			cint(frappe.db.get_value("Series", "EV", "current", order_by="name")), counters[-1]
+		)
+
+	def test_insert_many_with_children(self):
+		users = frappe.insert_many(
+			{
+				"doctype": "User",
+				"email": f"test_insert_many_{i}@example.com",
+				"first_name": "Insert Many",
+				"roles": [{"role": "System Manager"}],
+			}
+			for i in range(3)
+		)
+
+		for user in users:
+			self.assertEqual(frappe.get_roles(user.name).count("System Manager"), 1)
+
+	def test_insert_many_with_own_db_insert(self):
+		# controllers overriding `db_insert` (like virtual doctypes) write their documents themselves
+		with patch.object(
+			Note, "db_insert", autospec=True, side_effect=BaseDocument.db_insert
+		) as db_insert:
+			notes = frappe.insert_many(
+				{"doctype": "Note", "title": f"test-insert-many-own-db-insert {i}"} for i in range(2)
+			)
+
+		self.assertEqual(
+			[call.args[0].name for call in db_insert.call_args_list], [note.name for note in notes]
+		)
+		for note in notes:
+			self.assertTrue(frappe.db.exists("Note", note.name))
+
+	def test_insert_many_link_validation(self):
+		docs = [
+			{
+				"doctype": "User",
+				"email": "test_insert_many_links@example.com",
+				"first_name": "Link Validation",
+				"roles": [{"role": "ABC"}],
+			}
+		]
+		self.assertRaises(frappe.LinkValidationError, frappe.insert_many, docs)
+
 	def test_validate(self):
 		d = self.test_insert()
 		d.starts_on = "2014-01-01"
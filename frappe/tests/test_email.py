@@ -3,7 +3,8 @@
 
 import email
 import re
-from unittest.mock import patch
+import threading
+from unittest.mock import PropertyMock, patch
 
 import requests
 
@@ -82,6 +83,53 @@ class TestEmail(FrappeTestCase):
 		self.assertEqual(len(queue_recipients), 2)
 		self.assertTrue("Unsubscribe" in frappe.safe_decode(frappe.flags.sent_mail))
 
+	def test_flush_over_pooled_sessions(self):
+		from frappe.email.queue import flush, set_queue_status
+		from frappe.email.smtp import SMTPServer
+
+		recipients = [f"test{i}@example.com" for i in range(6)]
+		for recipient in recipients:
+			frappe.sendmail(
+				recipients=[recipient],
+				sender="admin@example.com",
+				subject="Testing Pooled Sessions",
+				message="This mail is queued!",
+			)
+
+		sent, servers = [], set()
+
+		def sendmail(server, from_addr, to_addrs, msg):
+			servers.add(server)
+			sent.append(to_addrs)
+
+		frappe.flags.testing_email = True
+		self.addCleanup(setattr, frappe.flags, "testing_email", False)
+
+		session = PropertyMock(side_effect=lambda: opened_in.append(threading.current_thread()))
+		opened_in = []
+
+		with patch.object(SMTPServer, "sendmail", sendmail), patch.object(
+			SMTPServer, "session", session
+		), patch.dict(
+			frappe.conf, {"email_queue_smtp_sessions": 2, "email_queue_workers": 2}
+		), patch(
+			"frappe.email.queue.set_queue_status", wraps=set_queue_status
+		) as set_status:
+			flush()
+
+		self.assertCountEqual(sent, recipients)
+		# queues are marked as Sending in chunks of as many as are in flight (2 per worker)
+		sending = [call.args[0] for call in set_status.call_args_list if call.args[1] == "Sending"]
+		self.assertEqual([len(names) for names in sending], [4, 2])
+		self.assertLessEqual(len(servers), 2)
+		# sessions are opened by the flushing thread, the sending threads only use them
+		self.assertTrue(opened_in)
+		self.assertEqual(set(opened_in), {threading.main_thread()})
+		self.assertEqual(frappe.db.count("Email Queue", {"status": "Sent"}), len(recipients))
+		self.assertEqual(
+			frappe.db.count("Email Queue Recipient", {"status": "Sent"}), len(recipients)
+		)
+
 	def test_cc_header(self):
 		# test if sending with cc's makes it into header
 		frappe.sendmail(
@@ -1,6 +1,9 @@
 # Copyright (c) 2022, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 
+from contextlib import contextmanager
+from unittest.mock import patch
+
 import frappe
 from frappe.custom.doctype.property_setter.property_setter import make_property_setter
 from frappe.desk.page.setup_wizard.install_fixtures import update_global_search_doctypes
@@ -86,6 +89,59 @@ class TestGlobalSearch(FrappeTestCase):
 		results = global_search.search("Monthly")
 		self.assertEqual(len(results), 3)
 
+	def test_incremental_rebuild(self):
+		self.insert_test_events()
+		with rebuild_job():
+			global_search.rebuild_for_doctype("Event", full=True)
+
+		with rebuild_job(), patch.object(global_search, "sync_values") as sync_values:
+			global_search.rebuild_for_doctype("Event")
+			sync_values.assert_not_called()
+
+		event = frappe.get_last_doc("Event")
+		event.subject = "incremental rebuild"
+		event.save()
+
+		with rebuild_job(), patch.object(global_search, "sync_values") as sync_values:
+			global_search.rebuild_for_doctype("Event")
+			sync_values.assert_called_once()
+			self.assertEqual([v[1] for v in sync_values.call_args.args[0]], [event.name])
+
+	def test_resume_rebuild(self):
+		self.insert_test_events()
+
+		with rebuild_job(), patch.object(global_search, "REBUILD_CHUNK_SIZE", 1), patch.object(
+			global_search, "index_records", side_effect=[None, RuntimeError]
+		):
+			self.assertRaises(RuntimeError, global_search.rebuild_for_doctype, "Event", full=True)
+
+		checkpoint = frappe.cache.hget(global_search.REBUILD_CHECKPOINTS, "Event")
+		self.assertFalse(checkpoint.get("completed"))
+
+		with rebuild_job(), patch.object(
+			global_search, "index_records", wraps=global_search.index_records
+		) as index_records:
+			global_search.rebuild_for_doctype("Event")
+
+		indexed = [doc.name for call in index_records.call_args_list for doc in call.args[2]]
+		self.assertEqual(indexed, frappe.get_all("Event", order_by="name asc", pluck="name")[1:])
+		self.assertTrue(frappe.cache.hget(global_search.REBUILD_CHECKPOINTS, "Event")["completed"])
+
+	def test_inline_rebuild(self):
+		self.insert_test_events()
+		frappe.cache.hdel(global_search.REBUILD_CHECKPOINTS, "Event")
+
+		# e.g. on saving a DocType, the caller's transaction isn't committed
+		with patch.object(global_search, "REBUILD_CHUNK_SIZE", 1), patch.object(
+			frappe.db, "commit"
+		) as commit:
+			global_search.rebuild_for_doctype("Event", full=True)
+			commit.assert_not_called()
+
+		self.assertIsNone(frappe.cache.hget(global_search.REBUILD_CHECKPOINTS, "Event"))
+		frappe.db.after_commit.run()
+		self.assertTrue(frappe.cache.hget(global_search.REBUILD_CHECKPOINTS, "Event")["completed"])
+
 	def test_delete_doc(self):
 		self.insert_test_events()
 		event_name = frappe.get_all("Event")[0].name
@@ -205,3 +261,14 @@ class TestGlobalSearch(FrappeTestCase):
 			text="unsubscribe", scope='manufacturing" UNION ALL SELECT 1,2,3,4,doctype from __global_search'
 		)
 		self.assertTrue(results == [])
+
+
+@contextmanager
+def rebuild_job():
+	"""Run `rebuild_for_doctype` as if in its background job, which checkpoints its progress."""
+	job = getattr(frappe.local, "job", None)
+	frappe.local.job = frappe._dict(method="frappe.utils.global_search.rebuild_for_doctype")
+	try:
+		yield
+	finally:
+		frappe.local.job = job
@@ -88,3 +88,25 @@ class TestMonitor(FrappeTestCase):
 		frappe.db.sql("select 1")
 		self.assertIn(get_trace_id(), str(frappe.db.last_query))
 		frappe.monitor.stop(response)
+
+	def test_profiling(self):
+		frappe.conf.monitor_profiling = 1
+		self.addCleanup(frappe.conf.pop, "monitor_profiling")
+
+		set_request(method="GET", path="/api/method/frappe.ping")
+		response = build_response("json")
+		frappe.monitor.start()
+		frappe.db.sql("select 1")
+		frappe.db.sql("select name from tabUser where name = 'Administrator'")
+		frappe.cache.get_value("monitor-profiling-test")
+		frappe.monitor.stop(response)
+
+		logs = frappe.cache.lrange(MONITOR_REDIS_KEY, 0, -1)
+		profile = frappe.parse_json(logs[0].decode()).profile
+		self.assertEqual(profile.queries, 2)
+		self.assertGreaterEqual(profile.redis_calls, 1)
+		self.assertIsInstance(profile.db_time, int)
+		self.assertIn(
+			"select name from tabUser where name = ?", [q["query"] for q in profile.slow_queries]
+		)
+		self.assertNotIn("FRAPPE_TRACE_ID", str(profile.slow_queries))
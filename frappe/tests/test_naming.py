@@ -12,6 +12,7 @@ from frappe.model.naming import (
 	determine_consecutive_week_number,
 	getseries,
 	parse_naming_series,
+	reserve_series,
 	revert_series_if_last,
 )
 from frappe.tests.utils import FrappeTestCase, patch_hooks
@@ -141,6 +142,33 @@ class TestNaming(FrappeTestCase):
 
 		self.assertEqual(todo.name, f"TODO-{week}-{series}")
 
+	def test_reserve_series(self):
+		key = "TEST-RESERVE-"
+		frappe.db.delete("Series", {"name": key})
+
+		# reserve, insert series and release unused counters
+		with self.assertQueryCount(3):
+			with reserve_series(10):
+				series = [getseries(key, 3) for _ in range(4)]
+
+		self.assertEqual(series, ["001", "002", "003", "004"])
+		# unused counters are released
+		self.assertEqual(frappe.db.get_value("Series", key, "current", order_by="name"), 4)
+
+		with reserve_series(2):
+			series = [getseries(key, 3) for _ in range(3)]
+
+		self.assertEqual(series, ["005", "006", "007"])
+		self.assertEqual(frappe.db.get_value("Series", key, "current", order_by="name"), 7)
+
+		# released even if the block fails
+		with self.assertRaises(RuntimeError), reserve_series(5):
+			getseries(key, 3)
+			raise RuntimeError
+
+		self.assertEqual(frappe.db.get_value("Series", key, "current", order_by="name"), 8)
+		frappe.db.delete("Series", {"name": key})
+
 	def test_revert_series(self):
 		from datetime import datetime
 
@@ -14,6 +14,7 @@ from frappe.utils.nestedset import (
 	NestedSetChildExistsError,
 	NestedSetInvalidMergeError,
 	NestedSetRecursionError,
+	defer_nsm_updates,
 	get_descendants_of,
 	rebuild_tree,
 	remove_subtree,
@@ -148,6 +149,38 @@ class TestNestedSet(FrappeTestCase):
 		rebuild_tree(TEST_DOCTYPE)
 		self.test_basic_tree()
 
+	def test_rebuild_tree_after_corruption(self):
+		frappe.db.set_value(TEST_DOCTYPE, "Parent 1", {"lft": 0, "rgt": 0}, update_modified=False)
+		rebuild_tree(TEST_DOCTYPE)
+		self.test_basic_tree()
+
+	def test_defer_nsm_updates(self):
+		with patch("frappe.utils.nestedset.update_add_node") as update_add_node:
+			with defer_nsm_updates(TEST_DOCTYPE):
+				for i in range(5):
+					frappe.get_doc(
+						doctype=TEST_DOCTYPE,
+						some_fieldname=f"Deferred {i}",
+						parent_test_tree_doctype="Parent 2",
+						is_group=0,
+					).insert()
+
+				child_2 = frappe.get_doc(TEST_DOCTYPE, "Child 2")
+				child_2.parent_test_tree_doctype = "Parent 2"
+				child_2.save()
+
+		update_add_node.assert_not_called()
+		self.test_basic_tree()
+		self.assertEqual(self.nsu.get_no_of_children("Parent 2"), 7)
+		self.assertEqual(self.nsu.get_no_of_children("Parent 1"), 1)
+
+	def test_defer_nsm_updates_recursion(self):
+		with self.assertRaises(NestedSetRecursionError):
+			with defer_nsm_updates(TEST_DOCTYPE):
+				parent_2 = frappe.get_doc(TEST_DOCTYPE, "Parent 2")
+				parent_2.parent_test_tree_doctype = "Child 3"
+				parent_2.save()
+
 	def test_move_group_into_another(self):
 		old_lft, old_rgt = frappe.db.get_value(TEST_DOCTYPE, "Parent 2", ["lft", "rgt"])
 
@@ -0,0 +1,81 @@
+# Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+
+from unittest.mock import patch
+
+import frappe
+from frappe.database.query_cache import get_tables, get_written_tables
+from frappe.tests.utils import FrappeTestCase
+
+
+class TestQueryCache(FrappeTestCase):
+	def setUp(self):
+		# commits below record their time, readers only cache when they started later
+		patcher = patch("frappe.database.query_cache.CLOCK_SKEW", 0)
+		patcher.start()
+		self.addCleanup(patcher.stop)
+
+	def test_get_tables(self):
+		self.assertEqual(
+			get_tables("select `tabToDo`.name from `tabToDo` left join `tabHas Role` on 1=1"),
+			{"tabToDo", "tabHas Role"},
+		)
+		self.assertEqual(
+			get_written_tables("insert into `tabToDo` (`name`, `description`) values ('tabNote', '')"),
+			{"tabToDo"},
+		)
+		self.assertEqual(get_written_tables("update tabNote set title='x'"), {"tabNote"})
+
+	def test_cached_get_all(self):
+		todo = frappe.get_doc(doctype="ToDo", description="query cache").insert()
+		frappe.db.commit()
+		self.addCleanup(self.delete_and_commit, todo)
+
+		def get_description():
+			return frappe.get_all("ToDo", filters={"name": todo.name}, pluck="description", cache=True)
+
+		self.assertEqual(get_description(), ["query cache"])
+		with self.assertQueryCount(0):
+			self.assertEqual(get_description(), ["query cache"])
+
+		# uncommitted writes are visible in the same transaction
+		frappe.db.set_value("ToDo", todo.name, "description", "changed")
+		self.assertEqual(get_description(), ["changed"])
+
+		frappe.db.commit()
+		with self.assertQueryCount(1):
+			self.assertEqual(get_description(), ["changed"])
+
+		with self.assertQueryCount(0):
+			self.assertEqual(get_description(), ["changed"])
+
+	def test_cached_get_values(self):
+		todo = frappe.get_doc(doctype="ToDo", description="query cache").insert()
+		frappe.db.commit()
+		self.addCleanup(self.delete_and_commit, todo)
+
+		def get_description():
+			return frappe.db.get_value("ToDo", todo.name, "description", query_cache=60)
+
+		self.assertEqual(get_description(), "query cache")
+		with self.assertQueryCount(0):
+			self.assertEqual(get_description(), "query cache")
+
+		frappe.db.set_value("ToDo", todo.name, "description", "changed")
+		frappe.db.commit()
+		self.assertEqual(get_description(), "changed")
+
+	def test_rollback_does_not_invalidate(self):
+		frappe.get_all("Role", cache=True)
+		frappe.db.sql("update `tabRole` set modified=modified where name='Administrator'")
+		self.assertIn("tabRole", frappe.db.written_tables)
+
+		frappe.db.rollback()
+		self.assertFalse(frappe.db.written_tables)
+		with self.assertQueryCount(0):
+			self.assertIn("Administrator", frappe.get_all("Role", pluck="name", cache=True))
+
+	@staticmethod
+	def delete_and_commit(doc):
+		doc.delete()
+		frappe.db.commit()
@@ -1,10 +1,13 @@
 # Copyright (c) 2019, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 
+from unittest.mock import patch
+
 import frappe
 import frappe.utils
 from frappe.core.doctype.doctype.test_doctype import new_doctype
-from frappe.desk.query_report import build_xlsx_data, export_query, run
+from frappe.desk.query_report import build_xlsx_data, export_query, generate_report_result, run
+from frappe.desk.report_cache import get_cache_key, refresh_cached_report_result
 from frappe.tests.utils import FrappeTestCase
 from frappe.utils.xlsxutils import make_xlsx
 
@@ -130,6 +133,56 @@ class TestQueryReport(FrappeTestCase):
 
 		frappe.delete_doc("Report", REPORT_NAME, delete_permanently=True)
 
+	def test_cached_report_result(self):
+		report = frappe.get_doc(
+			{
+				"doctype": "Report",
+				"ref_doctype": "ToDo",
+				"report_name": "Cached ToDo Report",
+				"report_type": "Query Report",
+				"is_standard": "No",
+				"query": "select name, description from tabToDo",
+				"cache_result": 1,
+				"cache_duration": 60,
+			}
+		).insert(ignore_if_duplicate=True)
+		frappe.db.commit()
+		self.addCleanup(frappe.db.commit)
+		self.addCleanup(frappe.delete_doc, "Report", report.name, delete_permanently=True)
+
+		with (
+			patch("frappe.desk.report_cache.frappe.enqueue") as enqueue,
+			patch(
+				"frappe.desk.query_report.generate_report_result", wraps=generate_report_result
+			) as generate,
+		):
+			first = run(report.name)
+			second = run(report.name)
+			self.assertEqual(generate.call_count, 1)
+			self.assertEqual(first["result"], second["result"])
+
+			todo = frappe.get_doc({"doctype": "ToDo", "description": "cached report"}).insert()
+			frappe.db.commit()
+			self.addCleanup(todo.delete)
+
+			# the stale result is returned while it is refreshed in the background
+			enqueue.reset_mock()
+			self.assertEqual(run(report.name)["result"], first["result"])
+			self.assertEqual(generate.call_count, 1)
+			enqueue.assert_called_once()
+
+		# results are not shared between users, even with the same roles
+		self.assertNotEqual(
+			get_cache_key(report, None, "test@example.com", None, False, None),
+			get_cache_key(report, None, "test1@example.com", None, False, None),
+		)
+
+		job_kwargs = enqueue.call_args.kwargs
+		refresh_cached_report_result(
+			**{key: value for key, value in job_kwargs.items() if key not in ("job_id", "deduplicate")}
+		)
+		self.assertIn(todo.name, [row[0] for row in run(report.name)["result"]])
+
 	def test_report_for_duplicate_column_names(self):
 		"""Test report with duplicate column names"""
 
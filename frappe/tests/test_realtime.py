@@ -0,0 +1,47 @@
+# Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+
+class TestRealtime(FrappeTestCase):
+	def setUp(self):
+		frappe.local._realtime_events_published = 0
+
+	def publish_updates(self, count):
+		for i in range(count):
+			message = {"doctype": "ToDo", "name": f"todo-{i}", "user": "Administrator"}
+			frappe.publish_realtime("list_update", message, after_commit=True)
+			frappe.publish_realtime(
+				"doc_update", message, doctype="ToDo", docname=f"todo-{i}", after_commit=True
+			)
+
+		with patch("frappe.realtime.emit_via_redis") as emit_via_redis:
+			frappe.db.commit()
+
+		emit_via_redis.assert_called_once()
+		return emit_via_redis.call_args.kwargs["events"]
+
+	def test_coalesce_list_updates(self):
+		events = self.publish_updates(3)
+
+		self.assertEqual([event for event, _message, _room in events].count("doc_update"), 3)
+		self.assertEqual(
+			events[-1],
+			(
+				"list_update",
+				{"doctype": "ToDo", "user": "Administrator", "names": ["todo-0", "todo-1", "todo-2"]},
+				"doctype:ToDo",
+			),
+		)
+
+	def test_event_budget(self):
+		with patch.dict(frappe.conf, {"realtime_event_budget": 5}):
+			events = self.publish_updates(10)
+
+		self.assertEqual(
+			events, [("list_update", {"doctype": "ToDo", "user": "Administrator"}, "doctype:ToDo")]
+		)
@@ -2,6 +2,7 @@
 # License: MIT. See LICENSE
 
 import time
+from collections import Counter
 
 import sqlparse
 
@@ -142,6 +143,63 @@ class TestRecorder(FrappeTestCase):
 		self.assertIn("Error", content)
 
 
+class TestSamplingRecorder(FrappeTestCase):
+	def setUp(self):
+		frappe.recorder.stop()
+		frappe.recorder.delete()
+		set_request(path="/api/method/frappe.ping")
+
+	def tearDown(self):
+		frappe.recorder.stop()
+		frappe.recorder.delete()
+
+	def record_request(self, *queries):
+		frappe.recorder.record()
+		for query in queries:
+			frappe.db.sql(query)
+		frappe.recorder.dump()
+		if hasattr(frappe.local, "_recorder"):
+			frappe.recorder._unpatch()
+			del frappe.local._recorder
+
+	def test_sampling_aggregates_fingerprints(self):
+		frappe.recorder.start(sample_rate=1)
+
+		self.record_request("select name from tabDocType where name = 'User'", "select 1")
+		self.record_request("select name from tabDocType where name = 'Role'")
+
+		# requests aren't stored individually
+		self.assertEqual(frappe.recorder.get(), [])
+
+		stats = {s["query"]: s for s in frappe.recorder.get_fingerprints()}
+		stat = stats["select name from tabDocType where name = ?"]
+		self.assertEqual(stat["count"], 2)
+		self.assertLessEqual(stat["p50"], stat["p99"])
+		self.assertEqual(stat["endpoints"], [("/api/method/frappe.ping", 2)])
+		self.assertIsNone(stat["rows_examined"])
+
+		frappe.recorder.explain_fingerprints()
+		stats = {s["query"]: s for s in frappe.recorder.get_fingerprints()}
+		self.assertIsNotNone(stats["select name from tabDocType where name = ?"]["rows_examined"])
+
+		frappe.recorder.delete()
+		self.assertEqual(frappe.recorder.get_fingerprints(), [])
+
+	def test_latency_threshold(self):
+		frappe.recorder.start(latency_threshold=60 * 1000)
+		self.record_request("select 1")
+		self.assertEqual(frappe.recorder.get_fingerprints(), [])
+
+		frappe.recorder.start(latency_threshold=0.001)
+		self.record_request("select 1")
+		self.assertEqual(len(frappe.recorder.get_fingerprints()), 1)
+
+	def test_percentiles(self):
+		buckets = Counter(map(frappe.recorder.get_histogram_bucket, [1] * 90 + [100] * 10))
+		self.assertAlmostEqual(frappe.recorder.get_percentile(buckets, 100, 0.5), 1, delta=0.25)
+		self.assertAlmostEqual(frappe.recorder.get_percentile(buckets, 100, 0.95), 100, delta=25)
+
+
 class TestRecorderDeco(FrappeTestCase):
 	def test_recorder_flag(self):
 		frappe.recorder.delete()
@@ -1,4 +1,5 @@
 import functools
+import time
 from unittest.mock import patch
 
 import redis
@@ -8,6 +9,7 @@ from frappe.tests.utils import FrappeTestCase
 from frappe.utils import get_bench_id
 from frappe.utils.background_jobs import get_redis_conn
 from frappe.utils.redis_queue import RedisQueue
+from frappe.utils.redis_wrapper import RedisWrapper
 
 
 def version_tuple(version):
@@ -75,3 +77,77 @@ class TestRedisAuth(FrappeTestCase):
 
 		frappe.conf.update({"bench_id": bench_id})
 		conn.acl_deluser(username)
+
+
+class TestClientCache(FrappeTestCase):
+	def setUp(self):
+		# two wrappers with their own client cache simulate two worker processes
+		self.worker_1 = RedisWrapper.from_url(frappe.conf.redis_cache)
+		self.worker_2 = RedisWrapper.from_url(frappe.conf.redis_cache)
+		for worker in (self.worker_1, self.worker_2):
+			worker.enable_client_cache(maxsize=10, ttl=60)
+			self.wait_for(lambda: worker.client_cache.active)
+
+	def wait_for(self, condition, timeout=5):
+		start = time.monotonic()
+		while not condition():
+			if time.monotonic() - start > timeout:
+				self.fail("condition not met in time")
+			time.sleep(0.01)
+
+	def write(self, method, *args):
+		"""Write via worker 1 and wait until worker 2 has seen the invalidation"""
+		generation = self.worker_2.client_cache.generation
+		getattr(self.worker_1, method)(*args)
+		self.wait_for(lambda: self.worker_2.client_cache.generation > generation)
+
+	def test_hget_served_from_client_cache(self):
+		self.write("hset", "test_client_cache", "key", "value")
+		frappe.local.cache = {}
+		self.assertEqual(self.worker_2.hget("test_client_cache", "key"), "value")
+
+		frappe.local.cache = {}
+		with patch.object(redis.Redis, "hget") as hget:
+			self.assertEqual(self.worker_2.hget("test_client_cache", "key"), "value")
+			hget.assert_not_called()
+
+	def test_invalidation_across_workers(self):
+		self.write("set_value", "test_client_cache_value", 1)
+		frappe.local.cache = {}
+		self.assertEqual(self.worker_2.get_value("test_client_cache_value"), 1)
+
+		key = self.worker_2.make_key("test_client_cache_value")
+		self.write("set_value", "test_client_cache_value", 2)
+		self.assertFalse(self.worker_2.client_cache.get(key)[0])
+		frappe.local.cache = {}
+		self.assertEqual(self.worker_2.get_value("test_client_cache_value"), 2)
+
+		self.assertTrue(self.worker_2.client_cache.get(key)[0])
+		self.write("delete_keys", "test_client_cache")
+		self.assertFalse(self.worker_2.client_cache.get(key)[0])
+
+	def test_client_cache_returns_copies(self):
+		self.write("set_value", "test_client_cache_value", {"messages": []})
+		frappe.local.cache = {}
+		self.worker_2.get_value("test_client_cache_value")["messages"].append("for one user")
+
+		frappe.local.cache = {}
+		self.assertEqual(self.worker_2.get_value("test_client_cache_value"), {"messages": []})
+
+	def test_immutable_values_are_not_unpickled(self):
+		self.write("hset", "test_client_cache", "key", "value")
+		frappe.local.cache = {}
+		self.worker_2.hget("test_client_cache", "key")
+
+		frappe.local.cache = {}
+		with patch("frappe.utils.redis_wrapper.pickle.loads") as loads:
+			self.assertEqual(self.worker_2.hget("test_client_cache", "key"), "value")
+			loads.assert_not_called()
+
+	def test_client_cache_is_bounded(self):
+		for i in range(20):
+			self.worker_1.hset("test_client_cache", str(i), i)
+			frappe.local.cache = {}
+			self.worker_1.hget("test_client_cache", str(i))
+
+		self.assertEqual(len(self.worker_1.client_cache.data), 10)
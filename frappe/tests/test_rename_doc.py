@@ -247,6 +247,7 @@ class TestRenameDoc(FrappeTestCase):
 			enqueue.assert_called_with(
 				"frappe.utils.global_search.rebuild_for_doctype",
 				doctype=self.test_doctype,
+				full=True,
 			)
 
 	def test_doc_rename_method(self):
@@ -1,6 +1,8 @@
 # Copyright (c) 2019, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 
+from unittest.mock import patch
+
 import frappe
 from frappe.desk.reportview import export_query
 from frappe.tests.utils import FrappeTestCase
@@ -32,3 +34,27 @@ class TestReportview(FrappeTestCase):
 					for row in reader:
 						self.assertEqual(int(row["Is Single"]), 1)
 						self.assertEqual(row["Module"], "Core")
+
+	def test_streamed_export(self):
+		from openpyxl import load_workbook
+
+		frappe.local.form_dict = frappe._dict(
+			doctype="DocType",
+			file_format_type="Excel",
+			fields=("name", "module"),
+			filters={"module": "Core"},
+			add_totals_row="1",
+		)
+
+		# larger exports are written to a temporary file that is sent as is
+		with patch("frappe.desk.utils.EXPORT_SPOOL_SIZE", 0):
+			export_query()
+
+		file = frappe.response["filecontent"]
+		self.assertTrue(frappe.response["filename"].endswith(".xlsx"))
+		rows = list(load_workbook(file, read_only=True).active.values)
+		file.close()
+
+		self.assertEqual(rows[0], ("Sr", "ID", "Module"))
+		self.assertEqual(len(rows) - 2, frappe.db.count("DocType", {"module": "Core"}))
+		self.assertEqual(rows[-1][1], "Total")
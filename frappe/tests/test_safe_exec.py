@@ -1,8 +1,16 @@
 import types
+from unittest.mock import patch
+
+from RestrictedPython import compile_restricted
 
 import frappe
 from frappe.tests.utils import FrappeTestCase
-from frappe.utils.safe_exec import ServerScriptNotEnabled, get_safe_globals, safe_exec
+from frappe.utils.safe_exec import (
+	ServerScriptNotEnabled,
+	compile_condition,
+	get_safe_globals,
+	safe_exec,
+)
 
 
 class TestSafeExec(FrappeTestCase):
@@ -121,6 +129,50 @@ class TestSafeExec(FrappeTestCase):
 		# dont Allow modifying _dict class
 		self.assertRaises(Exception, safe_exec, "_dict.x = 1")
 
+	def test_compiled_code_cache(self):
+		script = f"out = '{frappe.generate_hash()}'"
+		with patch(
+			"frappe.utils.safe_exec.compile_restricted", wraps=compile_restricted
+		) as compile_restricted_:
+			for _i in range(3):
+				safe_exec(script, None, {})
+				frappe.safe_eval("1 + 1")
+
+		self.assertLessEqual(compile_restricted_.call_count, 2)
+
+	def test_compile_condition(self):
+		doc = frappe._dict(status="Open", priority="High", grand_total=1500, customer=None)
+		conditions = [
+			"doc.status == 'Open'",
+			"doc.status != 'Open' or doc.grand_total > 1000",
+			"doc.priority in ('High', 'Urgent') and not doc.customer",
+			"doc.get('priority') not in ['Low'] and 1000 <= doc.grand_total < 2000",
+			"doc.customer is None",
+			"doc.customer or doc.status",
+		]
+		for condition in conditions:
+			self.assertIsNotNone(compile_condition(condition), condition)
+			self.assertEqual(
+				compile_condition(condition)(doc), frappe.safe_eval(condition, None, {"doc": doc}), condition
+			)
+
+		for condition in (
+			"doc._private == 1",
+			"doc.status.lower() == 'open'",
+			"frappe.utils.cint(doc.grand_total) > 0",
+			"len(doc.status) > 2",
+			"doc.status == set()",
+		):
+			self.assertIsNone(compile_condition(condition), condition)
+
+	def test_globals_are_not_shared(self):
+		safe_exec("frappe.utils.cint = None; frappe.flags.changed = 1", restrict_commit_rollback=True)
+
+		exec_globals = get_safe_globals()
+		self.assertIsNotNone(exec_globals.frappe.utils.cint)
+		self.assertIsNone(exec_globals.frappe.flags.changed)
+		self.assertIn("commit", exec_globals.frappe.db)
+
 	def test_print(self):
 		test_str = frappe.generate_hash()
 		safe_exec(f"print('{test_str}')")
@@ -119,6 +119,50 @@ class TestSearch(FrappeTestCase):
 		finally:
 			frappe.local.lang = "en"
 
+	def test_link_search_index(self):
+		from frappe.desk.link_search_index import (
+			build_index,
+			drop_index,
+			get_search_index_condition,
+		)
+
+		todos = [
+			frappe.get_doc(doctype="ToDo", description=description).insert()
+			for description in ("Éclair recipe for the bakery", "Bakery supplier invoice")
+		]
+		build_index("ToDo")
+		self.addCleanup(drop_index, "ToDo")
+
+		def search(txt):
+			return [r[0] for r in search_widget("ToDo", txt, page_length=100)]
+
+		self.assertEqual(search("eclair rec"), [todos[0].name])
+		self.assertEqual(set(search("bakery")), {t.name for t in todos})
+		# short text matches word prefixes
+		self.assertIn(todos[1].name, search("in"))
+		self.assertNotIn(todos[0].name, search("ak"))
+
+		todos[0].description = "Croissant recipe"
+		todos[0].save()
+		self.assertEqual(search("croissant"), [todos[0].name])
+		self.assertEqual(search("eclair"), [])
+
+		# updates without the ORM are indexed too
+		todos[0].db_set("description", "Baguette recipe")
+		self.assertEqual(search("baguette"), [todos[0].name])
+		frappe.db.set_value(
+			"ToDo", {"name": todos[1].name}, "description", "Flour supplier invoice"
+		)
+		self.assertEqual(search("flour"), [todos[1].name])
+		self.assertEqual(search("bakery"), [])
+
+		# wildcards are searched without the index
+		self.assertIsNone(get_search_index_condition("ToDo", "bak%ry"))
+		self.assertEqual(search("bague%recipe"), [todos[0].name])
+
+		todos[1].delete()
+		self.assertEqual(search("supplier"), [])
+
 	def test_validate_and_sanitize_search_inputs(self):
 
 		# should raise error if searchfield is injectable
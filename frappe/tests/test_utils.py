@@ -486,6 +486,29 @@ class TestPythonExpressions(FrappeTestCase):
 			self.assertRaises(frappe.ValidationError, validate_python_code, expr)
 
 
+class TestTemplateCache(FrappeTestCase):
+	def test_compiled_template_cache(self):
+		from frappe.utils.jinja import get_template_cache_info
+
+		template = "{{ doc.name }} " + frappe.generate_hash()
+		before = get_template_cache_info()
+		for name in ("a", "b", "c"):
+			self.assertTrue(frappe.render_template(template, {"doc": {"name": name}}).startswith(name))
+
+		after = get_template_cache_info()
+		self.assertEqual(after["misses"] - before["misses"], 1)
+		self.assertEqual(after["hits"] - before["hits"], 2)
+
+	def test_cached_template_uses_current_globals(self):
+		template = "{{ frappe.session.user }}"
+		frappe.render_template(template)
+
+		frappe.local.jenv = None
+		with self.set_user("Guest"):
+			self.assertEqual(frappe.render_template(template), "Guest")
+		frappe.local.jenv = None
+
+
 class TestDiffUtils(FrappeTestCase):
 	@classmethod
 	def setUpClass(cls):
@@ -948,7 +948,13 @@ def get_html_for_route(route):
 
 
 def get_file_size(path, format=False):
-	num = os.path.getsize(path)
+	"""Return size of the file, or of all files in the folder."""
+	if os.path.isdir(path):
+		num = sum(
+			os.path.getsize(os.path.join(root, file)) for root, _dirs, files in os.walk(path) for file in files
+		)
+	else:
+		num = os.path.getsize(path)
 
 	if not format:
 		return num
@@ -4,9 +4,15 @@ import contextlib
 
 # imports - standard imports
 import gzip
+import hashlib
+import json
 import os
+import shlex
+import shutil
 import sys
+import threading
 from calendar import timegm
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from glob import glob
 from shutil import which
@@ -29,6 +35,17 @@ base_tables = ["__Auth", "__global_search", "__UserSettings"]
 
 BACKUP_ENCRYPTION_CONFIG_KEY = "backup_encryption_key"
 
+# parallel backups, see `BackupGenerator.take_parallel_dump` and `backup_files_by_hash`
+MANIFEST_FILE = "manifest.json"
+SCHEMA_FILE = "schema.sql.gz"
+TABLES_FOLDER = "tables"
+DATA_FOLDER = "data"
+FILE_OBJECTS_FOLDER = "file-objects"
+FILES_MANIFEST_SUFFIX = "-files.json"
+# marks files backups copying to the store, see `prune_file_objects`
+RUNNING_SUFFIX = ".running"
+DEFAULT_BACKUP_JOBS = 4
+
 
 class BackupGenerator:
 	"""
@@ -36,6 +53,9 @@ class BackupGenerator:
 
 	To initialize, specify (db_name, user, password, db_file_name=None, db_host="127.0.0.1")
 	If specifying db_file_name, also append ".sql.gz"
+
+	With `parallel`, the tables of the database are dumped in parallel to a folder and files are
+	backed up by content hash, copying only the ones not in an earlier backup.
 	"""
 
 	def __init__(
@@ -57,6 +77,8 @@ class BackupGenerator:
 		exclude_doctypes="",
 		verbose=False,
 		old_backup_metadata=False,
+		parallel=False,
+		jobs=None,
 	):
 		global _verbose
 		self.compress_files = compress_files or compress
@@ -76,6 +98,8 @@ class BackupGenerator:
 		self.exclude_doctypes = exclude_doctypes
 		self.partial = False
 		self.old_backup_metadata = old_backup_metadata
+		self.parallel = parallel
+		self.jobs = cint(jobs) or min(DEFAULT_BACKUP_JOBS, os.cpu_count() or 1)
 
 		site = frappe.local.site or frappe.generate_hash(length=8)
 		self.site_slug = site.replace(".", "_")
@@ -186,6 +210,9 @@ class BackupGenerator:
 		):
 			self.set_backup_file_name()
 
+		if self.parallel and frappe.get_system_settings("encrypt_backup"):
+			frappe.throw(_("Parallel backups can't be encrypted, take a backup without --parallel instead."))
+
 		if not (last_db and last_file and last_private_file and site_config_backup_path):
 			self.take_dump()
 			self.copy_site_config()
@@ -211,6 +238,12 @@ class BackupGenerator:
 		for_db = f"{self.todays_date}-{self.site_slug}{partial}-database{enc}.sql.gz"
 		for_public_files = f"{self.todays_date}-{self.site_slug}-files{enc}.{ext}"
 		for_private_files = f"{self.todays_date}-{self.site_slug}-private-files{enc}.{ext}"
+
+		if self.parallel:
+			# a folder and file manifests
+			for_db = f"{self.todays_date}-{self.site_slug}{partial}-database"
+			for_public_files = f"{self.todays_date}-{self.site_slug}{FILES_MANIFEST_SUFFIX}"
+			for_private_files = f"{self.todays_date}-{self.site_slug}-private{FILES_MANIFEST_SUFFIX}"
 		backup_path = self.backup_path or get_backup_path()
 
 		if not self.backup_path_conf:
@@ -346,6 +379,9 @@ class BackupGenerator:
 			print(template.format(_type.title(), os.path.abspath(info["path"]), info["size"]))
 
 	def backup_files(self):
+		if self.parallel:
+			return self.backup_files_by_hash()
+
 		for folder in ("public", "private"):
 			files_path = frappe.get_site_path(folder, "files")
 			backup_path = self.backup_path_files if folder == "public" else self.backup_path_private_files
@@ -362,6 +398,63 @@ class BackupGenerator:
 				check_exit_code=True,
 			)
 
+	def backup_files_by_hash(self):
+		"""Copy files to a store shared by backups, named by the hash of their contents, and write
+		a manifest of the paths and hashes of all files (see `restore_files_by_hash`).
+
+		Files with the same size and modification time as in the previous manifest aren't hashed
+		again and files already in the store aren't copied."""
+		for folder in ("public", "private"):
+			manifest_path = self.backup_path_files if folder == "public" else self.backup_path_private_files
+			backup_folder = os.path.dirname(os.path.abspath(manifest_path))
+			objects_path = os.path.join(backup_folder, FILE_OBJECTS_FOLDER)
+			files_path = frappe.get_site_path(folder, "files")
+			previous = get_previous_files_manifest(backup_folder, manifest_path, folder)
+			running_path = f"{manifest_path}{RUNNING_SUFFIX}"
+
+			def backup_file(relative_path):
+				path = os.path.join(files_path, relative_path)
+				stat = os.stat(path)
+				entry = previous.get(relative_path)
+				if (
+					not entry
+					or entry["size"] != stat.st_size
+					or entry["mtime"] != stat.st_mtime_ns
+					or not os.path.exists(get_object_path(objects_path, entry["hash"]))
+				):
+					entry = {"hash": get_file_hash(path), "size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+				object_path = get_object_path(objects_path, entry["hash"])
+				copied = not os.path.exists(object_path)
+				if copied:
+					os.makedirs(os.path.dirname(object_path), exist_ok=True)
+					# copy aside first, an interrupted copy mustn't look like a stored file
+					temp_path = f"{object_path}.{threading.get_ident()}.tmp"
+					shutil.copy2(path, temp_path)
+					os.replace(temp_path, object_path)
+
+				return relative_path, entry, copied
+
+			# stored files aren't referred to by a manifest until it's written
+			open(running_path, "w").close()
+			try:
+				with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+					results = list(executor.map(backup_file, walk_files(files_path)))
+
+				manifest = {
+					"folder": folder,
+					"objects": FILE_OBJECTS_FOLDER,
+					"files": {relative_path: entry for relative_path, entry, _copied in results},
+					"copied": sum(copied for _path, _entry, copied in results),
+				}
+				with open(manifest_path, "w") as f:
+					json.dump(manifest, f)
+			finally:
+				os.remove(running_path)
+
+			if self.verbose:
+				print(f"Backed up {len(results)} {folder} files, {manifest['copied']} changed")
+
 	def copy_site_config(self):
 		site_config_backup_path = self.backup_path_conf
 		site_config_path = os.path.join(frappe.get_site_path(), "site_config.json")
@@ -369,16 +462,9 @@ class BackupGenerator:
 		with open(site_config_backup_path, "w") as n, open(site_config_path) as c:
 			n.write(c.read())
 
-	def take_dump(self):
-		import frappe.utils
+	def get_dump_header(self) -> str:
 		from frappe.utils.change_log import get_app_branch
 
-		gzip_exc = which("gzip")
-		if not gzip_exc:
-			frappe.throw(
-				_("gzip not found in PATH! This is required to take a backup."), exc=frappe.ExecutableNotFound
-			)
-
 		if self.old_backup_metadata:
 			database_header_content = [
 				f"Backup generated by Frappe {frappe.__version__} on branch {get_app_branch('frappe') or 'N/A'}",
@@ -410,12 +496,10 @@ class BackupGenerator:
 				]
 			)
 
-		generated_header = "\n".join(f"-- {x}" for x in database_header_content) + "\n"
-
-		with gzip.open(self.backup_path_db, "wt") as f:
-			f.write(generated_header)
+		return "\n".join(f"-- {x}" for x in database_header_content) + "\n"
 
-		cmd = []
+	def get_dump_filters(self) -> list[str]:
+		"""Return arguments of the dump command selecting the included (or excluded) tables."""
 		extra = []
 		if self.db_type == "mariadb":
 			if self.backup_includes:
@@ -429,6 +513,9 @@ class BackupGenerator:
 			elif self.backup_excludes:
 				extra.extend([f"--exclude-table-data='public.\"{table}\"'" for table in self.backup_excludes])
 
+		return extra
+
+	def get_dump_command(self, extra: list[str]) -> str:
 		from frappe.database import get_command
 
 		bin, args, bin_name = get_command(
@@ -445,15 +532,141 @@ class BackupGenerator:
 				_("{} not found in PATH! This is required to take a backup.").format(bin_name),
 				exc=frappe.ExecutableNotFound,
 			)
-		cmd.append(bin)
-		cmd.extend(args)
 
-		command = " ".join(["set -o pipefail;"] + cmd + ["|", gzip_exc, ">>", self.backup_path_db])
+		return " ".join([bin, *args])
+
+	def get_gzip(self) -> str:
+		gzip_exc = which("gzip")
+		if not gzip_exc:
+			frappe.throw(
+				_("gzip not found in PATH! This is required to take a backup."), exc=frappe.ExecutableNotFound
+			)
+
+		return gzip_exc
+
+	def take_dump(self):
+		if self.parallel:
+			return self.take_parallel_dump()
+
+		gzip_exc = self.get_gzip()
+
+		with gzip.open(self.backup_path_db, "wt") as f:
+			f.write(self.get_dump_header())
+
+		dump = self.get_dump_command(self.get_dump_filters())
+		command = " ".join(["set -o pipefail;", dump, "|", gzip_exc, ">>", self.backup_path_db])
 		if self.verbose:
 			print(command.replace(frappe.utils.esc(self.password, "$ "), "*" * 10) + "\n")
 
 		frappe.utils.execute_in_shell(command, low_priority=True, check_exit_code=True)
 
+	def take_parallel_dump(self):
+		"""Dump the schema, then the rows of the tables in parallel, to a folder with a manifest
+		(see `restore_parallel_dump`). Rows are dumped as of a single point in time.
+
+		On Postgres, `pg_dump` dumps the rows in parallel from a snapshot shared by its
+		connections. Dumps of MariaDB tables are separate transactions, they are only taken while
+		the site is in maintenance mode, so that the tables aren't changed in between."""
+		if self.db_type == "mariadb" and not frappe.conf.maintenance_mode:
+			frappe.throw(
+				_(
+					"Parallel backups of MariaDB sites need the site in maintenance mode, enable it with"
+					" `bench --site {0} set-maintenance-mode on` or take a backup without --parallel."
+				).format(frappe.local.site)
+			)
+
+		gzip_exc = self.get_gzip()
+		os.makedirs(self.backup_path_db, exist_ok=True)
+
+		schema_path = os.path.join(self.backup_path_db, SCHEMA_FILE)
+		with gzip.open(schema_path, "wt") as f:
+			f.write(self.get_dump_header())
+
+		schema_only = "--no-data" if self.db_type == "mariadb" else "--schema-only"
+		frappe.utils.execute_in_shell(
+			self.get_dump_to_file_command([schema_only, *self.get_dump_filters()], schema_path, gzip_exc),
+			check_exit_code=True,
+		)
+
+		manifest = {
+			"frappe_version": frappe.__version__,
+			"db_type": self.db_type,
+			"partial": bool(self.partial),
+			"jobs": self.jobs,
+			"schema": SCHEMA_FILE,
+		}
+		if self.db_type == "postgres":
+			manifest["data"] = self.take_postgres_data_dump()
+		else:
+			manifest["tables"] = self.take_mariadb_table_dumps(gzip_exc)
+
+		with open(os.path.join(self.backup_path_db, MANIFEST_FILE), "w") as f:
+			json.dump(manifest, f, indent=1)
+
+	def take_postgres_data_dump(self) -> str:
+		"""Dump rows with `pg_dump` to a folder in its directory format, return its name."""
+		path = os.path.join(self.backup_path_db, DATA_FOLDER)
+		dump = self.get_dump_command(
+			[
+				"--data-only",
+				"--format=directory",
+				f"--jobs={self.jobs}",
+				f"--file={shlex.quote(path)}",
+				*self.get_dump_filters(),
+			]
+		)
+		frappe.utils.execute_in_shell(" ".join(["nice", dump]), check_exit_code=True)
+		return DATA_FOLDER
+
+	def take_mariadb_table_dumps(self, gzip_exc: str) -> list[dict]:
+		"""Dump rows of each table to a compressed file, in parallel."""
+		os.makedirs(os.path.join(self.backup_path_db, TABLES_FOLDER), exist_ok=True)
+
+		tables = self.get_tables_to_dump()
+		commands = []
+		for table in tables:
+			path = os.path.join(self.backup_path_db, TABLES_FOLDER, f"{table}.sql.gz")
+			commands.append(
+				(
+					table,
+					self.get_dump_to_file_command(["--no-create-info", shlex.quote(table)], path, gzip_exc),
+				)
+			)
+
+		def dump_table(args):
+			table, command = args
+			frappe.utils.execute_in_shell(command, check_exit_code=True)
+			if self.verbose:
+				print(f"Dumped {table}")
+
+		# site locals aren't available in the threads, they only run the commands
+		with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+			list(executor.map(dump_table, commands))
+
+		return [
+			{"name": table, "file": os.path.join(TABLES_FOLDER, f"{table}.sql.gz")} for table in tables
+		]
+
+	def get_dump_to_file_command(self, extra: list[str], path: str, gzip_exc: str) -> str:
+		dump = self.get_dump_command(extra)
+		# `low_priority` of `execute_in_shell` isn't safe to use from threads
+		return " ".join(["set -o pipefail;", "nice", dump, "|", "nice", gzip_exc, ">>", shlex.quote(path)])
+
+	def get_tables_to_dump(self) -> list[str]:
+		"""Return MariaDB tables (and sequences) with rows to dump, biggest first."""
+		tables = frappe.db.sql(
+			"""select table_name, coalesce(data_length, 0) + coalesce(index_length, 0)
+			from information_schema.tables
+			where table_schema = %s and table_type in ('BASE TABLE', 'SEQUENCE')""",
+			self.db_name,
+		)
+
+		tables = sorted(tables, key=lambda t: -t[1])
+		if self.backup_includes:
+			return [table for table, _size in tables if table in self.backup_includes]
+
+		return [table for table, _size in tables if table not in self.backup_excludes]
+
 	def send_email(self):
 		"""
 		Sends the link to backup file located at erpnext/backups
@@ -522,6 +735,8 @@ def scheduled_backup(
 	force=False,
 	verbose=False,
 	old_backup_metadata=False,
+	parallel=False,
+	jobs=None,
 ):
 	"""this function is called from scheduler
 	deletes backups older than 7 days
@@ -541,6 +756,8 @@ def scheduled_backup(
 		force=force,
 		verbose=verbose,
 		old_backup_metadata=old_backup_metadata,
+		parallel=parallel,
+		jobs=jobs,
 	)
 
 
@@ -559,6 +776,8 @@ def new_backup(
 	force=False,
 	verbose=False,
 	old_backup_metadata=False,
+	parallel=False,
+	jobs=None,
 ):
 	delete_temp_backups()
 	odb = BackupGenerator(
@@ -579,6 +798,8 @@ def new_backup(
 		verbose=verbose,
 		compress_files=compress,
 		old_backup_metadata=old_backup_metadata,
+		parallel=parallel,
+		jobs=jobs,
 	)
 	odb.get_backup(older_than, ignore_files, force=force)
 	return odb
@@ -594,13 +815,25 @@ def delete_temp_backups(older_than=24):
 		file_list = os.listdir(get_backup_path())
 		for this_file in file_list:
 			this_file_path = os.path.join(get_backup_path(), this_file)
-			if is_file_old(this_file_path, older_than):
+			if this_file == FILE_OBJECTS_FOLDER:
+				continue
+			if os.path.isdir(this_file_path):
+				# the manifest is written last, without it the dump is still being taken, unless it
+				# was interrupted long ago
+				manifest_path = os.path.join(this_file_path, MANIFEST_FILE)
+				if not os.path.exists(manifest_path):
+					manifest_path = this_file_path
+				if is_file_old(manifest_path, older_than):
+					shutil.rmtree(this_file_path)
+			elif is_file_old(this_file_path, older_than):
 				os.remove(this_file_path)
 
+		prune_file_objects(backup_path)
+
 
 def is_file_old(file_path, older_than=24) -> bool:
-	"""Return True if file exists and is older than specified hours."""
-	if os.path.isfile(file_path):
+	"""Return True if file (or folder) exists and is older than specified hours."""
+	if os.path.exists(file_path):
 		from datetime import timedelta
 
 		# Get timestamp of the file
@@ -619,6 +852,136 @@ def is_file_old(file_path, older_than=24) -> bool:
 		return True
 
 
+def walk_files(path: str):
+	"""Yield paths of all files under the path, relative to it."""
+	for root, _dirs, files in os.walk(path):
+		for file in files:
+			yield os.path.relpath(os.path.join(root, file), path)
+
+
+def get_file_hash(path: str) -> str:
+	file_hash = hashlib.sha256()
+	with open(path, "rb") as f:
+		while chunk := f.read(1024 * 1024):
+			file_hash.update(chunk)
+
+	return file_hash.hexdigest()
+
+
+def get_object_path(objects_path: str, file_hash: str) -> str:
+	return os.path.join(objects_path, file_hash[:2], file_hash)
+
+
+def get_files_manifests(backup_folder: str) -> list[str]:
+	return glob(os.path.join(backup_folder, f"*{FILES_MANIFEST_SUFFIX}"))
+
+
+def get_previous_files_manifest(backup_folder: str, manifest_path: str, folder: str) -> dict:
+	"""Return files of the latest earlier manifest of the folder ("public" or "private")."""
+	manifests = sorted(
+		(path for path in get_files_manifests(backup_folder) if path != os.path.abspath(manifest_path)),
+		key=os.path.getmtime,
+		reverse=True,
+	)
+	for path in manifests:
+		with contextlib.suppress(ValueError, OSError):
+			with open(path) as f:
+				manifest = json.load(f)
+			if manifest.get("folder") == folder:
+				return manifest["files"]
+
+	return {}
+
+
+def prune_file_objects(backup_folder: str):
+	"""Delete stored files not referred to by any files manifest in the backup folder.
+
+	Stored files (and copies in progress) since the start of the oldest running files backup are
+	kept, they are referred to by its manifest once written. Marks of interrupted backups are
+	deleted with other old files by `delete_temp_backups`."""
+	objects_path = os.path.join(backup_folder, FILE_OBJECTS_FOLDER)
+	if not os.path.isdir(objects_path):
+		return
+
+	running = glob(os.path.join(backup_folder, f"*{RUNNING_SUFFIX}"))
+	running_since = min((os.stat(path).st_mtime for path in running), default=None)
+
+	used = set()
+	for path in get_files_manifests(backup_folder):
+		with open(path) as f:
+			used.update(entry["hash"] for entry in json.load(f)["files"].values())
+
+	for relative_path in list(walk_files(objects_path)):
+		if os.path.basename(relative_path) in used:
+			continue
+
+		path = os.path.join(objects_path, relative_path)
+		# copies keep the modification time of the file, the change time is when they were stored
+		if running_since is not None and os.stat(path).st_ctime >= running_since:
+			continue
+
+		os.remove(path)
+
+
+def restore_files_by_hash(manifest_path: str, site_path: str, jobs: int | None = None):
+	"""Restore files listed in a manifest written by `BackupGenerator.backup_files_by_hash`."""
+	with open(manifest_path) as f:
+		manifest = json.load(f)
+
+	backup_folder = os.path.dirname(os.path.abspath(manifest_path))
+	objects_path = os.path.join(backup_folder, manifest["objects"])
+	files_path = os.path.join(site_path, manifest["folder"], "files")
+
+	def restore_file(item):
+		relative_path, entry = item
+		path = os.path.join(files_path, relative_path)
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		shutil.copy2(get_object_path(objects_path, entry["hash"]), path)
+
+	with ThreadPoolExecutor(max_workers=jobs or DEFAULT_BACKUP_JOBS) as executor:
+		list(executor.map(restore_file, manifest["files"].items()))
+
+
+def is_parallel_dump(path: str) -> bool:
+	return os.path.isfile(os.path.join(path, MANIFEST_FILE))
+
+
+def restore_parallel_dump(path: str, get_restore_command, verbose=False):
+	"""Restore a dump written by `BackupGenerator.take_parallel_dump`.
+
+	The schema is restored first, then rows of the tables in parallel. `get_restore_command`
+	returns the shell command restoring one (compressed) sql file, or a folder dumped by
+	`pg_dump` with the given number of jobs."""
+	with open(os.path.join(path, MANIFEST_FILE)) as f:
+		manifest = json.load(f)
+
+	jobs = manifest.get("jobs") or DEFAULT_BACKUP_JOBS
+	frappe.utils.execute_in_shell(
+		get_restore_command(os.path.join(path, manifest["schema"])),
+		check_exit_code=True,
+		verbose=verbose,
+	)
+
+	if data := manifest.get("data"):
+		command = get_restore_command(os.path.join(path, data), jobs=jobs)
+		frappe.utils.execute_in_shell(command, check_exit_code=True, verbose=verbose)
+		return
+
+	commands = [
+		(table["name"], get_restore_command(os.path.join(path, table["file"])))
+		for table in manifest["tables"]
+	]
+
+	def restore_table(args):
+		table, command = args
+		frappe.utils.execute_in_shell(command, check_exit_code=True)
+		if verbose:
+			print(f"Restored {table}")
+
+	with ThreadPoolExecutor(max_workers=jobs) as executor:
+		list(executor.map(restore_table, commands))
+
+
 def get_backup_path():
 	return frappe.utils.get_site_path(conf.get("backup_path", "private/backups"))
 
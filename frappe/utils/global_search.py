@@ -1,20 +1,26 @@
 # Copyright (c) 2021, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 
+import hashlib
 import json
 import os
 import re
+from functools import partial
 
 import redis
 
 import frappe
 from frappe.model.base_document import get_controller
-from frappe.utils import cint, strip_html_tags
+from frappe.utils import cint, now_datetime, strip_html_tags
 from frappe.utils.data import cstr
 from frappe.utils.html_utils import unescape_html
 
 HTML_TAGS_PATTERN = re.compile(r"(?s)<[\s]*(script|style).*?</\1>")
 
+REBUILD_CHUNK_SIZE = 1000
+# doctype -> progress of the last `rebuild_for_doctype`
+REBUILD_CHECKPOINTS = "global_search_rebuild_checkpoints"
+
 
 def setup_global_search_table():
 	"""
@@ -30,6 +36,7 @@ def reset():
 	:return:
 	"""
 	frappe.db.delete("__global_search")
+	frappe.cache.delete_value(REBUILD_CHECKPOINTS)
 
 
 def get_doctypes_with_global_search(with_child_tables=True):
@@ -64,24 +71,21 @@ def get_doctypes_with_global_search(with_child_tables=True):
 	return frappe.cache.get_value("doctypes_with_global_search", _get)
 
 
-def rebuild_for_doctype(doctype):
+def rebuild_for_doctype(doctype, full=False):
 	"""
 	Rebuild entries of doctype's documents in __global_search on change of
-	searchable fields
+	searchable fields.
+
+	Documents are indexed in chunks ordered by a keyset cursor. When run as a background job,
+	progress is committed and checkpointed after every chunk, so an interrupted rebuild resumes
+	from the last chunk. If searchable fields haven't changed since the last completed rebuild,
+	only documents modified after it started are indexed.
 	:param doctype: Doctype
+	:param full: Index all documents even if the last rebuild is still valid
 	"""
 	if frappe.local.conf.get("disable_global_search"):
 		return
 
-	def _get_filters():
-		filters = frappe._dict({"docstatus": ["!=", 2]})
-		if meta.has_field("enabled"):
-			filters.enabled = 1
-		if meta.has_field("disabled"):
-			filters.disabled = 0
-
-		return filters
-
 	meta = frappe.get_meta(doctype)
 
 	if cint(meta.issingle) == 1:
@@ -94,24 +98,91 @@ def rebuild_for_doctype(doctype):
 			filters={"fieldtype": ["in", frappe.model.table_fields], "options": doctype},
 		)
 		for p in parent_doctypes:
-			rebuild_for_doctype(p.parent)
+			rebuild_for_doctype(p.parent, full=full)
 
 		return
 
-	# Delete records
-	delete_global_search_records_for_doctype(doctype)
-
 	parent_search_fields = meta.get_global_search_fields()
-	fieldnames = get_selected_fields(meta, parent_search_fields)
+	child_search_fields = get_child_search_fields(meta)
+	signature = get_search_fields_signature(meta, parent_search_fields, child_search_fields)
+
+	checkpoint = frappe.cache.hget(REBUILD_CHECKPOINTS, doctype)
+	if full or not checkpoint or checkpoint["signature"] != signature:
+		checkpoint = {"signature": signature, "since": None, "started_at": now_datetime(), "cursor": ""}
+	elif checkpoint.get("completed"):
+		checkpoint = {
+			"signature": signature,
+			"since": checkpoint["started_at"],
+			"started_at": now_datetime(),
+			"cursor": "",
+		}
+
+	fieldnames = get_selected_fields(meta, parent_search_fields) + ["docstatus"]
+	for fieldname in ("enabled", "disabled"):
+		if meta.has_field(fieldname):
+			fieldnames.append(fieldname)
+
+	if since := checkpoint["since"]:
+		filters, order_by = {"modified": [">=", since]}, "modified asc"
+	else:
+		filters, order_by = {}, "name asc"
+
+	while True:
+		records = frappe.get_all(
+			doctype,
+			fields=fieldnames,
+			filters=filters,
+			order_by=order_by,
+			limit=REBUILD_CHUNK_SIZE,
+			cursor=checkpoint["cursor"],
+		)
+		index_records(doctype, meta, records, parent_search_fields, child_search_fields)
+
+		if not records.next_cursor:
+			break
+
+		checkpoint["cursor"] = records.next_cursor
+		save_rebuild_checkpoint(doctype, checkpoint)
+
+	if not since:
+		# entries of documents deleted without going through `delete_for_document`
+		GlobalSearch = frappe.qb.Table("__global_search")
+		frappe.qb.from_(GlobalSearch).delete().where(
+			(GlobalSearch.doctype == doctype)
+			& GlobalSearch.name.notin(frappe.qb.from_(doctype).select("name"))
+		).run()
+
+	checkpoint["completed"] = True
+	save_rebuild_checkpoint(doctype, checkpoint)
+
+
+def index_records(doctype, meta, records, parent_search_fields, child_search_fields):
+	"""Upsert __global_search entries of given records, delete entries of records that aren't searchable."""
+	if not records:
+		return
 
-	# Get all records from parent doctype table
-	all_records = frappe.get_all(doctype, fields=fieldnames, filters=_get_filters())
+	all_children, _ = get_children_data(
+		doctype, meta, parents=[doc.name for doc in records], child_search_fields=child_search_fields
+	)
+	values, not_searchable = [], []
 
-	# Children data
-	all_children, child_search_fields = get_children_data(doctype, meta)
-	all_contents = []
+	try:
+		website_published = hasattr(get_controller(doctype), "is_website_published") and bool(
+			meta.allow_guest_to_view
+		)
+	except ImportError:
+		# some doctypes has been deleted via future patch, hence controller does not exists
+		website_published = False
+
+	for doc in records:
+		if (
+			doc.docstatus > 1
+			or (meta.has_field("enabled") and not doc.enabled)
+			or (meta.has_field("disabled") and doc.disabled)
+		):
+			not_searchable.append(doc.name)
+			continue
 
-	for doc in all_records:
 		content = []
 		for field in parent_search_fields:
 			value = doc.get(field.fieldname)
@@ -119,42 +190,78 @@ def rebuild_for_doctype(doctype):
 				content.append(get_formatted_value(value, field))
 
 		# get children data
-		for child_doctype, records in all_children.get(doc.name, {}).items():
+		for child_doctype, child_records in all_children.get(doc.name, {}).items():
 			for field in child_search_fields.get(child_doctype):
-				for r in records:
+				for r in child_records:
 					if r.get(field.fieldname):
 						content.append(get_formatted_value(r.get(field.fieldname), field))
 
-		if content:
-			# if doctype published in website, push title, route etc.
-			published = 0
-			title, route = "", ""
-			try:
-				if hasattr(get_controller(doctype), "is_website_published") and meta.allow_guest_to_view:
-					d = frappe.get_doc(doctype, doc.name)
-					published = 1 if d.is_website_published() else 0
-					title = d.get_title()
-					route = d.get("route")
-			except ImportError:
-				# some doctypes has been deleted via future patch, hence controller does not exists
-				pass
-
-			all_contents.append(
-				{
-					"doctype": frappe.db.escape(doctype),
-					"name": frappe.db.escape(doc.name),
-					"content": frappe.db.escape(" ||| ".join(content or "")),
-					"published": published,
-					"title": frappe.db.escape((title or "")[: int(frappe.db.VARCHAR_LEN)]),
-					"route": frappe.db.escape((route or "")[: int(frappe.db.VARCHAR_LEN)]),
-				}
+		if not content:
+			not_searchable.append(doc.name)
+			continue
+
+		# if doctype published in website, push title, route etc.
+		published = 0
+		title, route = "", ""
+		if website_published:
+			d = frappe.get_doc(doctype, doc.name)
+			published = 1 if d.is_website_published() else 0
+			title = d.get_title()
+			route = d.get("route")
+
+		values.append(
+			(
+				doctype,
+				doc.name,
+				" ||| ".join(content),
+				published,
+				(cstr(title) or "")[: int(frappe.db.VARCHAR_LEN)],
+				(route or "")[: int(frappe.db.VARCHAR_LEN)],
+			)
+		)
+
+	if values:
+		sync_values(values)
+
+	if not_searchable:
+		frappe.db.delete("__global_search", {"doctype": doctype, "name": ("in", not_searchable)})
+
+
+def get_search_fields_signature(meta, parent_search_fields, child_search_fields) -> str:
+	"""Return a hash of everything that decides the indexed content of doctype's documents."""
+	fields = [
+		(doctype, df.fieldname, df.fieldtype, df.label)
+		for doctype, search_fields in [(meta.name, parent_search_fields), *child_search_fields.items()]
+		for df in search_fields
+	]
+	return hashlib.sha1(json.dumps([fields, meta.allow_guest_to_view]).encode()).hexdigest()
+
+
+def save_rebuild_checkpoint(doctype, checkpoint):
+	if not in_rebuild_job():
+		# run in the caller's transaction (e.g. saving a DocType), which isn't ours to commit,
+		# the completed rebuild is only recorded once the caller commits it
+		if checkpoint.get("completed"):
+			frappe.db.after_commit.add(
+				partial(frappe.cache.hset, REBUILD_CHECKPOINTS, doctype, checkpoint)
 			)
-	if all_contents:
-		insert_values_for_multiple_docs(all_contents)
+		return
+
+	# commit first, a checkpoint must never point past uncommitted entries
+	if not frappe.flags.in_test:
+		frappe.db.commit()
+
+	frappe.cache.hset(REBUILD_CHECKPOINTS, doctype, checkpoint)
+
+
+def in_rebuild_job() -> bool:
+	job = getattr(frappe.local, "job", None)
+	return bool(job) and job.method == "frappe.utils.global_search.rebuild_for_doctype"
 
 
 def delete_global_search_records_for_doctype(doctype):
 	frappe.db.delete("__global_search", {"doctype": doctype})
+	frappe.cache.hdel(REBUILD_CHECKPOINTS, doctype)
 
 
 def get_selected_fields(meta, global_search_fields):
@@ -170,9 +277,20 @@ def get_selected_fields(meta, global_search_fields):
 	return fieldnames
 
 
-def get_children_data(doctype, meta):
+def get_child_search_fields(meta):
+	"""Return global search fields of doctype's child tables, keyed on child doctype."""
+	child_search_fields = frappe._dict()
+
+	for child in meta.get_table_fields():
+		if search_fields := frappe.get_meta(child.options).get_global_search_fields():
+			child_search_fields.setdefault(child.options, search_fields)
+
+	return child_search_fields
+
+
+def get_children_data(doctype, meta, parents=None, child_search_fields=None):
 	"""
-	Get all records from all the child tables of a doctype
+	Get records from all the child tables of a doctype, of given parents (or all)
 
 	all_children = {
 	        "parent1": {
@@ -187,23 +305,20 @@ def get_children_data(doctype, meta):
 
 	"""
 	all_children = frappe._dict()
-	child_search_fields = frappe._dict()
-
-	for child in meta.get_table_fields():
-		child_meta = frappe.get_meta(child.options)
-		search_fields = child_meta.get_global_search_fields()
-		if search_fields:
-			child_search_fields.setdefault(child.options, search_fields)
-			child_fieldnames = get_selected_fields(child_meta, search_fields)
-			child_records = frappe.get_all(
-				child.options, fields=child_fieldnames, filters={"docstatus": ["!=", 1], "parenttype": doctype}
+	if child_search_fields is None:
+		child_search_fields = get_child_search_fields(meta)
+
+	for child_doctype, search_fields in child_search_fields.items():
+		child_fieldnames = get_selected_fields(frappe.get_meta(child_doctype), search_fields)
+		filters = {"docstatus": ["!=", 1], "parenttype": doctype}
+		if parents is not None:
+			filters["parent"] = ["in", parents]
+
+		for record in frappe.get_all(child_doctype, fields=child_fieldnames, filters=filters):
+			all_children.setdefault(record.parent, frappe._dict()).setdefault(child_doctype, []).append(
+				record
 			)
 
-			for record in child_records:
-				all_children.setdefault(record.parent, frappe._dict()).setdefault(child.options, []).append(
-					record
-				)
-
 	return all_children, child_search_fields
 
 
@@ -1,5 +1,11 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
+from functools import lru_cache
+
+# compiled string templates (print formats, notifications, email templates...) kept per process
+TEMPLATE_CACHE_SIZE = 512
+
+
 def get_jenv():
 	import frappe
 
@@ -37,6 +43,47 @@ def get_template(path):
 	return get_jenv().get_template(path)
 
 
+def get_template_from_string(source: str):
+	"""Return a template of the current environment for the source, like `jenv.from_string`.
+
+	The source is only compiled once per process, environments of all requests are set up alike
+	and globals are looked up when rendering."""
+	jenv = get_jenv()
+	return jenv.template_class.from_code(jenv, compile_template(source), jenv.make_globals(None))
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(source: str):
+	return get_jenv().compile(source)
+
+
+def precompile_templates(*sources: str | None) -> None:
+	"""Compile the templates in advance, on save of the documents having them.
+
+	Errors are left to be reported when rendering."""
+	from jinja2 import TemplateError
+
+	for source in sources:
+		if source:
+			try:
+				compile_template(source)
+			except TemplateError:
+				pass
+
+
+def get_template_cache_info() -> dict:
+	"""Return hits, misses and size of the compiled template cache of this process."""
+	info = compile_template.cache_info()
+	lookups = info.hits + info.misses
+	return {
+		"hits": info.hits,
+		"misses": info.misses,
+		"hit_rate": info.hits / lookups if lookups else 0.0,
+		"size": info.currsize,
+		"max_size": info.maxsize,
+	}
+
+
 def get_email_from_template(name, args):
 	from jinja2 import TemplateNotFound
 
@@ -62,9 +109,9 @@ def validate_template(html):
 
 	if not html:
 		return
-	jenv = get_jenv()
 	try:
-		jenv.from_string(html)
+		# compiled templates are cached, the ones of saved documents are ready to be rendered
+		compile_template(html)
 	except TemplateSyntaxError as e:
 		frappe.throw(frappe._(f"Syntax error in template as line {e.lineno}: {e.message}"))
 
@@ -94,7 +141,7 @@ def render_template(template, context=None, is_path=None, safe_render=True):
 		if safe_render and ".__" in template:
 			throw(_("Illegal template"))
 		try:
-			return get_jenv().from_string(template).render(context)
+			return get_template_from_string(template).render(context)
 		except TemplateError:
 			throw(
 				title="Jinja Template Error",
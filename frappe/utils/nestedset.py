@@ -9,18 +9,27 @@
 # 2. have a field called "old_parent" in your fields list - this identifies whether the parent has been changed
 # 3. call update_nsm(doc_obj) in the on_upate method
 
+#
+# To create or move many nodes, wrap them in `defer_nsm_updates(doctype)` to rebuild the tree once
+# at the end instead of shifting lft, rgt of the nodes on the right for every node.
+
 # ------------------------------------------
+from collections import defaultdict
 from collections.abc import Iterator
+from contextlib import contextmanager
 
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.query_builder import Order
+from frappe.query_builder import Case, Order
 from frappe.query_builder.functions import Coalesce, Max
 from frappe.query_builder.terms import SubQuery
 from frappe.query_builder.utils import DocType
 
 
+REBUILD_BATCH_SIZE = 1000
+
+
 class NestedSetRecursionError(frappe.ValidationError):
 	pass
 
@@ -50,8 +59,13 @@ def update_nsm(doc):
 
 	parent, old_parent = doc.get(parent_field) or None, doc.get(old_parent_field) or None
 
+	deferred = doc.doctype in (frappe.flags.deferred_nsm_doctypes or ())
+
 	# has parent changed (?) or parent is None (root)
-	if not doc.lft and not doc.rgt:
+	if deferred:
+		# the tree is rebuilt at the end of `defer_nsm_updates`
+		pass
+	elif not doc.lft and not doc.rgt:
 		update_add_node(doc, parent or "", parent_field)
 	elif old_parent != parent:
 		update_move_node(doc, parent_field)
@@ -60,7 +74,8 @@ def update_nsm(doc):
 	doc.set(old_parent_field, parent)
 	frappe.db.set_value(doc.doctype, doc.name, old_parent_field, parent or "", update_modified=False)
 
-	doc.reload()
+	if not deferred:
+		doc.reload()
 
 
 def update_add_node(doc, parent, parent_field):
@@ -169,11 +184,19 @@ def update_move_node(doc: Document, parent_field: str):
 
 @frappe.whitelist()
 def rebuild_tree(doctype: str) -> None:
-	"""Call rebuild_node for all root nodes."""
+	"""Set lft, rgt of all nodes from their parents.
+
+	All nodes are read at once and their intervals computed in memory, only the changed ones
+	are written, in batches."""
 	# Check for perm if called from client-side
 	if frappe.request and frappe.local.form_dict.cmd == "rebuild_tree":
 		frappe.only_for("System Manager")
 
+	_rebuild_tree(doctype)
+
+
+def _rebuild_tree(doctype: str) -> list[str]:
+	"""Rebuild the tree and return names of nodes in loops (or under one), left as they were."""
 	meta = frappe.get_meta(doctype)
 	if not meta.has_field("lft") or not meta.has_field("rgt"):
 		frappe.throw(
@@ -183,23 +206,96 @@ def rebuild_tree(doctype: str) -> None:
 
 	parent_field = meta.nsm_parent_field or f"parent_{frappe.scrub(doctype)}"
 
-	# get all roots
-	right = 1
 	table = DocType(doctype)
-	column = getattr(table, parent_field)
-	result = (
+	nodes = (
 		frappe.qb.from_(table)
-		.where((column == "") | (column.isnull()))
+		.select(table.name, table[parent_field], table.lft, table.rgt)
 		.orderby(table.name, order=Order.asc)
-		.select(table.name)
 	).run()
 
-	frappe.db.auto_commit_on_many_writes = 1
+	children = defaultdict(list)
+	for name, parent, _lft, _rgt in nodes:
+		children[parent or ""].append(name)
+
+	intervals = get_intervals(children)
+	update_intervals(
+		doctype,
+		{
+			name: intervals[name]
+			for name, _parent, lft, rgt in nodes
+			if name in intervals and intervals[name] != (lft, rgt)
+		},
+	)
+
+	# nodes with a missing parent aren't in loops
+	names = {name for name, _parent, _lft, _rgt in nodes}
+	return [name for name, parent, _lft, _rgt in nodes if name not in intervals and parent in names]
 
-	for r in result:
-		right = rebuild_node(doctype, r[0], right, parent_field)
 
-	frappe.db.auto_commit_on_many_writes = 0
+def get_intervals(children: dict[str, list[str]]) -> dict[str, tuple[int, int]]:
+	"""Return (lft, rgt) of nodes under the roots (children of ""), walking the tree depth first."""
+	intervals = {}
+	lefts = {}
+	path = []
+	position = 0
+	stack = [iter(children.get("", ()))]
+
+	while stack:
+		name = next(stack[-1], None)
+		if name is None:
+			# all children of the node at the end of the path are done
+			stack.pop()
+			if path:
+				node = path.pop()
+				position += 1
+				intervals[node] = (lefts.pop(node), position)
+			continue
+
+		position += 1
+		lefts[name] = position
+		path.append(name)
+		stack.append(iter(children.get(name, ())))
+
+	return intervals
+
+
+def update_intervals(doctype: str, intervals: dict[str, tuple[int, int]]) -> None:
+	table = DocType(doctype)
+	for batch in frappe.utils.create_batch(list(intervals.items()), REBUILD_BATCH_SIZE):
+		lft, rgt = Case(), Case()
+		for name, (left, right) in batch:
+			lft = lft.when(table.name == name, left)
+			rgt = rgt.when(table.name == name, right)
+
+		frappe.qb.update(table).set(table.lft, lft).set(table.rgt, rgt).where(
+			table.name.isin([name for name, _interval in batch])
+		).run()
+
+
+@contextmanager
+def defer_nsm_updates(doctype: str):
+	"""Don't maintain lft, rgt of nodes saved in the block, rebuild the tree once at the end.
+
+	with defer_nsm_updates("Item Group"):
+	        for group in groups:
+	                frappe.get_doc(group).insert()
+
+	Until the end of the block, lft, rgt of the doctype aren't valid and moves aren't checked
+	for loops."""
+	deferred = frappe.flags.deferred_nsm_doctypes
+	if deferred is None:
+		deferred = frappe.flags.deferred_nsm_doctypes = {}
+
+	deferred[doctype] = deferred.get(doctype, 0) + 1
+	try:
+		yield
+	finally:
+		deferred[doctype] -= 1
+		if not deferred[doctype]:
+			del deferred[doctype]
+
+	if doctype not in deferred and _rebuild_tree(doctype):
+		frappe.throw(_("Item cannot be added to its own descendants"), NestedSetRecursionError)
 
 
 def rebuild_node(doctype, parent, left, parent_field):
@@ -1,12 +1,17 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
+import os
 import pickle
 import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
 
 import redis
 from redis.commands.search import Search
 
 import frappe
+from frappe.monitor import get_profile
 from frappe.utils import cstr
 
 
@@ -24,9 +29,199 @@ class RedisearchWrapper(Search):
 		return super().sugget(self.client.make_key(key), *args, **kwargs)
 
 
+CLIENT_CACHE_CHANNEL = "frappe:client_cache:invalidate"
+# values of these types (and tuples of them) can't be changed by callers, see `ClientCache`
+IMMUTABLE_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+class ClientCache:
+	"""Bounded, process-local cache of unpickled values that sits in front of Redis.
+
+	Unlike `frappe.local.cache` this survives across requests. Every write made through
+	`RedisWrapper` publishes an invalidation message on `CLIENT_CACHE_CHANNEL` and a
+	listener thread in every process evicts the affected entries. Whenever the listener
+	isn't subscribed (startup, lost connection) the cache is bypassed and flushed, so a
+	process never serves values it may have missed invalidations for.
+
+	Immutable values, like the serialised compiled meta, are kept as they are and served without
+	unpickling. Other values are kept pickled and unpickled on every `get`, callers get their own
+	copy and may change it, like values read from Redis.
+
+	Writers must publish invalidations after writing to Redis, otherwise another process could
+	read and cache the old value again after applying the invalidation.
+	"""
+
+	def __init__(self, redis_client: "RedisWrapper", maxsize: int = 1024, ttl: int = 300):
+		self.redis = redis_client
+		self.maxsize = maxsize
+		self.ttl = ttl
+		self.lock = threading.RLock()
+		self._reset()
+
+	def _reset(self):
+		# (name, hash field or None) -> (expiry, value, is pickled)
+		self.data = OrderedDict()
+		self.fields_by_name = defaultdict(set)
+		self.generation = 0
+		self.subscribed = False
+		self.pid = os.getpid()
+		self.listener = None
+		# used to skip our own invalidation messages, they've already been applied
+		self.client_id = os.urandom(8).hex()
+
+	@property
+	def active(self) -> bool:
+		if self.pid != os.getpid():
+			# forked, listener threads (and locks held by them) don't survive fork
+			self.lock = threading.RLock()
+			self._reset()
+
+		if not self.listener:
+			with self.lock:
+				if not self.listener:
+					self.listener = threading.Thread(target=self._listen, daemon=True)
+					self.listener.start()
+
+		return self.subscribed
+
+	def get(self, name, field=None):
+		"""Return `(found, value)` for given key / hash field, the value is a new copy unless it is
+		immutable."""
+		if not self.active:
+			return False, None
+
+		with self.lock:
+			entry = self.data.get((name, field))
+			if entry is None:
+				return False, None
+
+			expiry, value, pickled = entry
+			if expiry < time.monotonic():
+				self._evict((name, field))
+				return False, None
+
+			self.data.move_to_end((name, field))
+
+		return True, pickle.loads(value) if pickled else value
+
+	def set(self, name, field, value, pickled: bytes, generation: int):
+		"""Store value fetched from Redis, along with its pickled form. `generation` should be read
+		before fetching the value, if any invalidation was received in between, the value might be
+		stale and is discarded."""
+		if not self.active:
+			return
+
+		with self.lock:
+			if generation != self.generation:
+				return
+
+			if is_immutable(value):
+				entry = (time.monotonic() + self.ttl, value, False)
+			else:
+				entry = (time.monotonic() + self.ttl, pickled, True)
+
+			self.data[(name, field)] = entry
+			self.data.move_to_end((name, field))
+			self.fields_by_name[name].add(field)
+
+			while len(self.data) > self.maxsize:
+				self._evict(next(iter(self.data)))
+
+	def clear(self):
+		with self.lock:
+			self.generation += 1
+			self.data.clear()
+			self.fields_by_name.clear()
+
+	def invalidate(self, names=(), fields=(), prefix=None):
+		"""Evict locally and notify other processes."""
+		message = {
+			"client_id": self.client_id,
+			"names": list(names),
+			"fields": list(fields),
+			"prefix": prefix,
+		}
+		self._apply(message)
+		try:
+			self.redis.publish(CLIENT_CACHE_CHANNEL, pickle.dumps(message))
+		except redis.exceptions.ConnectionError:
+			# can't notify others, they'll flush when their subscription breaks
+			pass
+
+	def _evict(self, entry_key):
+		self.data.pop(entry_key, None)
+		name, field = entry_key
+		if (fields := self.fields_by_name.get(name)) is not None:
+			fields.discard(field)
+			if not fields:
+				del self.fields_by_name[name]
+
+	def _evict_name(self, name):
+		for field in self.fields_by_name.pop(name, ()):
+			self.data.pop((name, field), None)
+
+	def _apply(self, message: dict):
+		with self.lock:
+			self.generation += 1
+
+			for name in message.get("names") or ():
+				self._evict_name(name)
+
+			for name, field in message.get("fields") or ():
+				self._evict((name, field))
+
+			if prefix := message.get("prefix"):
+				for name in [n for n in self.fields_by_name if n.startswith(prefix)]:
+					self._evict_name(name)
+
+	def _listen(self):
+		while True:
+			try:
+				pubsub = self.redis.pubsub()
+				pubsub.subscribe(CLIENT_CACHE_CHANNEL)
+				for message in pubsub.listen():
+					if message["type"] == "subscribe":
+						# anything cached before this point may have missed invalidations
+						self.clear()
+						self.subscribed = True
+					elif message["type"] == "message":
+						message = pickle.loads(message["data"])
+						if message.get("client_id") != self.client_id:
+							self._apply(message)
+			except Exception:
+				pass
+
+			self.subscribed = False
+			self.clear()
+			time.sleep(1)
+
+
+def is_immutable(value) -> bool:
+	if type(value) in IMMUTABLE_TYPES:
+		return True
+
+	return type(value) is tuple and all(is_immutable(v) for v in value)
+
+
 class RedisWrapper(redis.Redis):
 	"""Redis client that will automatically prefix conf.db_name"""
 
+	client_cache: ClientCache | None = None
+
+	def enable_client_cache(self, maxsize: int = 1024, ttl: int = 300):
+		"""Keep a bounded process-local copy of values read via `get_value` / `hget`."""
+		self.client_cache = ClientCache(self, maxsize=maxsize, ttl=ttl)
+
+	def execute_command(self, *args, **options):
+		if profile := get_profile():
+			start = time.perf_counter()
+			try:
+				return super().execute_command(*args, **options)
+			finally:
+				profile.record_redis_call(time.perf_counter() - start)
+
+		return super().execute_command(*args, **options)
+
 	def connected(self):
 		try:
 			self.ping()
@@ -69,7 +264,10 @@ class RedisWrapper(redis.Redis):
 				self.set(key, pickle.dumps(val))
 
 		except redis.exceptions.ConnectionError:
-			return None
+			pass
+
+		if self.client_cache:
+			self.client_cache.invalidate(names=[key])
 
 	def get_value(self, key, generator=None, user=None, expires=False, shared=False):
 		"""Return cache value. If not found and generator function is
@@ -83,25 +281,35 @@ class RedisWrapper(redis.Redis):
 		key = self.make_key(key, user, shared)
 
 		if key in frappe.local.cache:
-			val = frappe.local.cache[key]
+			return frappe.local.cache[key]
 
-		else:
-			val = None
-			try:
-				val = self.get(key)
-			except redis.exceptions.ConnectionError:
-				pass
+		client_cache = None if expires else self.client_cache
+		if client_cache:
+			found, val = client_cache.get(key)
+			if found:
+				frappe.local.cache[key] = val
+				return val
+
+			generation = client_cache.generation
 
-			if val is not None:
-				val = pickle.loads(val)
+		val = None
+		try:
+			val = self.get(key)
+		except redis.exceptions.ConnectionError:
+			pass
 
-			if not expires:
-				if val is None and generator:
-					val = generator()
-					self.set_value(original_key, val, user=user)
+		if val is not None:
+			pickled, val = val, pickle.loads(val)
+			if client_cache:
+				client_cache.set(key, None, val, pickled, generation)
 
-				else:
-					frappe.local.cache[key] = val
+		if not expires:
+			if val is None and generator:
+				val = generator()
+				self.set_value(original_key, val, user=user)
+
+			else:
+				frappe.local.cache[key] = val
 
 		return val
 
@@ -125,6 +333,9 @@ class RedisWrapper(redis.Redis):
 	def delete_keys(self, key):
 		"""Delete keys with wildcard `*`."""
 		self.delete_value(self.get_keys(key), make_keys=False)
+		if self.client_cache:
+			# `*` is only used as a trailing wildcard
+			self.client_cache.invalidate(prefix=self.make_key(key.split("*", 1)[0]))
 
 	def delete_key(self, *args, **kwargs):
 		self.delete_value(*args, **kwargs)
@@ -148,6 +359,9 @@ class RedisWrapper(redis.Redis):
 		except redis.exceptions.ConnectionError:
 			pass
 
+		if self.client_cache:
+			self.client_cache.invalidate(names=keys)
+
 	def lpush(self, key, value):
 		super().lpush(self.make_key(key), value)
 
@@ -192,6 +406,9 @@ class RedisWrapper(redis.Redis):
 		except redis.exceptions.ConnectionError:
 			pass
 
+		if self.client_cache:
+			self.client_cache.invalidate(fields=[(_name, key)])
+
 	def hexists(self, name: str, key: str, shared: bool = False) -> bool:
 		if key is None:
 			return False
@@ -224,6 +441,14 @@ class RedisWrapper(redis.Redis):
 		if key in frappe.local.cache[_name]:
 			return frappe.local.cache[_name][key]
 
+		if self.client_cache:
+			found, value = self.client_cache.get(_name, key)
+			if found:
+				frappe.local.cache[_name][key] = value
+				return value
+
+			generation = self.client_cache.generation
+
 		value = None
 		try:
 			value = super().hget(_name, key)
@@ -231,7 +456,9 @@ class RedisWrapper(redis.Redis):
 			pass
 
 		if value is not None:
-			value = pickle.loads(value)
+			pickled, value = value, pickle.loads(value)
+			if self.client_cache:
+				self.client_cache.set(_name, key, value, pickled, generation)
 			frappe.local.cache[_name][key] = value
 		elif generator:
 			value = generator()
@@ -244,11 +471,15 @@ class RedisWrapper(redis.Redis):
 		if _name in frappe.local.cache:
 			if key in frappe.local.cache[_name]:
 				del frappe.local.cache[_name][key]
+
 		try:
 			super().hdel(_name, key)
 		except redis.exceptions.ConnectionError:
 			pass
 
+		if self.client_cache:
+			self.client_cache.invalidate(fields=[(_name, key)])
+
 	def hdel_keys(self, name_starts_with, key):
 		"""Delete hash names with wildcard `*` and key"""
 		for name in self.get_keys(name_starts_with):
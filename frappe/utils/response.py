@@ -153,7 +153,16 @@ def as_binary():
 	filename = frappe.response["filename"]
 	filename = filename.encode("utf-8").decode("unicode-escape", "ignore")
 	response.headers.add("Content-Disposition", None, filename=filename)
-	response.data = frappe.response["filecontent"]
+
+	filecontent = frappe.response["filecontent"]
+	if hasattr(filecontent, "read"):
+		# large files (e.g. exports) written to a temporary file, closed once sent
+		response.content_length = filecontent.seek(0, os.SEEK_END)
+		filecontent.seek(0)
+		response.response = wrap_file(frappe.local.request.environ, filecontent)
+		response.direct_passthrough = True
+	else:
+		response.data = filecontent
 	return response
 
 
@@ -4,6 +4,7 @@ import inspect
 import io
 import json
 import mimetypes
+import operator
 import types
 from contextlib import contextmanager
 from functools import lru_cache
@@ -38,6 +39,8 @@ ARGUMENT_NOT_SET = object()
 
 SAFE_EXEC_CONFIG_KEY = "server_script_enabled"
 SERVER_SCRIPT_FILE_PREFIX = "<serverscript>"
+# compiled scripts and expressions kept per process, the same ones run on every document event
+COMPILED_CODE_CACHE_SIZE = 1024
 
 
 class NamespaceDict(frappe._dict):
@@ -109,11 +112,7 @@ def safe_exec(
 
 	with safe_exec_flags(), patched_qb():
 		# execute script compiled by RestrictedPython
-		exec(
-			compile_restricted(script, filename=filename, policy=FrappeTransformer),
-			exec_globals,
-			_locals,
-		)
+		exec(_compile_restricted(script, filename, "exec"), exec_globals, _locals)
 
 	return exec_globals, _locals
 
@@ -123,19 +122,156 @@ def safe_eval(code, eval_globals=None, eval_locals=None):
 
 	code = unicodedata.normalize("NFKC", code)
 
-	_validate_safe_eval_syntax(code)
-
 	if not eval_globals:
 		eval_globals = {}
 
 	eval_globals["__builtins__"] = {}
 	eval_globals.update(WHITELISTED_SAFE_EVAL_GLOBALS)
 
-	return eval(
-		compile_restricted(code, filename="<safe_eval>", policy=FrappeTransformer, mode="eval"),
-		eval_globals,
-		eval_locals,
-	)
+	return eval(_compile_restricted(code, "<safe_eval>", "eval"), eval_globals, eval_locals)
+
+
+@lru_cache(maxsize=COMPILED_CODE_CACHE_SIZE)
+def _compile_restricted(code: str, filename: str, mode: str) -> types.CodeType:
+	"""Compile code with RestrictedPython, code objects are immutable and can be reused."""
+	if mode == "eval":
+		_validate_safe_eval_syntax(code)
+
+	return compile_restricted(code, filename=filename, policy=FrappeTransformer, mode=mode)
+
+
+COMPARISON_OPERATORS = {
+	ast.Eq: operator.eq,
+	ast.NotEq: operator.ne,
+	ast.Lt: operator.lt,
+	ast.LtE: operator.le,
+	ast.Gt: operator.gt,
+	ast.GtE: operator.ge,
+	ast.In: lambda a, b: a in b,
+	ast.NotIn: lambda a, b: a not in b,
+	ast.Is: operator.is_,
+	ast.IsNot: operator.is_not,
+}
+
+
+def evaluate_condition(condition: str, doc, get_context):
+	"""Evaluate the condition of a rule (webhook, notification, etc.) on a document.
+
+	Simple conditions are run as plain Python predicates (see `compile_condition`), other ones
+	with `safe_eval` and the context returned by `get_context(doc)`."""
+	if predicate := compile_condition(condition):
+		return predicate(doc)
+
+	return safe_eval(condition, None, get_context(doc))
+
+
+@lru_cache(maxsize=COMPILED_CODE_CACHE_SIZE)
+def compile_condition(condition: str):
+	"""Return a function of `doc` giving the same result as `safe_eval(condition, None, {"doc": doc})`
+	or None if the condition isn't simple enough.
+
+	Simple conditions compare fields (`doc.status`, `doc.get("status")`) with constants or lists of
+	constants, and combine these with `and`, `or` and `not`:
+
+		doc.status == "Open" and doc.grand_total > 1000
+		doc.priority in ("High", "Urgent") or not doc.customer
+	"""
+	import unicodedata
+
+	try:
+		tree = ast.parse(unicodedata.normalize("NFKC", condition).strip(), mode="eval")
+		return _compile_condition_node(tree.body)
+	except (SyntaxError, ValueError, TypeError):
+		return None
+
+
+def get_condition_fields(condition: str) -> set[str] | None:
+	"""Return fields of `doc` read by the condition, None if it isn't simple (see `compile_condition`)."""
+	import unicodedata
+
+	if not compile_condition(condition):
+		return None
+
+	fields = set()
+	for node in ast.walk(ast.parse(unicodedata.normalize("NFKC", condition).strip(), mode="eval")):
+		if isinstance(node, ast.Call):
+			fields.add(node.args[0].value)
+		elif isinstance(node, ast.Attribute) and node.attr != "get":
+			fields.add(node.attr)
+
+	return fields
+
+
+def _compile_condition_node(node):
+	if isinstance(node, ast.BoolOp):
+		operands = [_compile_condition_node(value) for value in node.values]
+		if isinstance(node.op, ast.And):
+
+			def _and(doc):
+				for operand in operands:
+					if not (value := operand(doc)):
+						return value
+				return value
+
+			return _and
+
+		def _or(doc):
+			for operand in operands:
+				if value := operand(doc):
+					return value
+			return value
+
+		return _or
+
+	if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+		operand = _compile_condition_node(node.operand)
+		return lambda doc: not operand(doc)
+
+	if isinstance(node, ast.Compare):
+		left = _compile_condition_node(node.left)
+		comparators = [_compile_condition_node(comparator) for comparator in node.comparators]
+		compares = [COMPARISON_OPERATORS[type(op)] for op in node.ops]
+
+		def _compare(doc):
+			value = left(doc)
+			for compare, comparator in zip(compares, comparators):
+				other = comparator(doc)
+				if not compare(value, other):
+					return False
+				value = other
+			return True
+
+		return _compare
+
+	if (
+		isinstance(node, ast.Attribute)
+		and isinstance(node.value, ast.Name)
+		and node.value.id == "doc"
+		and not node.attr.startswith("_")
+		and node.attr not in UNSAFE_ATTRIBUTES
+	):
+		fieldname = node.attr
+		return lambda doc: getattr(doc, fieldname)
+
+	if (
+		isinstance(node, ast.Call)
+		and isinstance(node.func, ast.Attribute)
+		and isinstance(node.func.value, ast.Name)
+		and node.func.value.id == "doc"
+		and node.func.attr == "get"
+		and not node.keywords
+		and 1 <= len(node.args) <= 2
+	):
+		args = [ast.literal_eval(arg) for arg in node.args]
+		if not isinstance(args[0], str) or args[0].startswith("_"):
+			raise ValueError("Unsupported field")
+		return lambda doc: doc.get(*args)
+
+	# constants, lists and tuples of constants, negative numbers, etc.
+	if any(isinstance(child, ast.Call) for child in ast.walk(node)):
+		raise ValueError("Unsupported call")
+	value = ast.literal_eval(node)
+	return lambda doc: value
 
 
 def _validate_safe_eval_syntax(code):
@@ -162,6 +298,57 @@ def safe_exec_flags():
 
 
 def get_safe_globals():
+	"""Return globals for `safe_exec`.
+
+	Values that don't change during a request are only gathered once per request (see
+	`get_safe_globals_template`), each call gets its own copy of the namespaces."""
+	out = copy_namespace(get_safe_globals_template())
+
+	form_dict = getattr(frappe.local, "form_dict", frappe._dict())
+
+	if "_" in form_dict:
+		del frappe.local.form_dict["_"]
+
+	user = getattr(frappe.local, "session", None) and frappe.local.session.user or "Guest"
+
+	out.args = form_dict
+	out.frappe.update(
+		flags=frappe._dict(),
+		form_dict=form_dict,
+		user=user,
+		full_name=frappe.local.session.data.full_name
+		if getattr(frappe.local, "session", None)
+		else "Guest",
+		request=getattr(frappe.local, "request", {}),
+		session=frappe._dict(
+			user=user,
+			csrf_token=frappe.local.session.data.csrf_token
+			if getattr(frappe.local, "session", None)
+			else "",
+		),
+		lang=getattr(frappe.local, "lang", "en"),
+	)
+
+	if frappe.response:
+		out.frappe.response = frappe.response
+
+	return out
+
+
+def get_safe_globals_template():
+	"""Return globals that don't depend on the user or the request, built once per request (and
+	database connection)."""
+	db = getattr(frappe.local, "db", None)
+	cached = getattr(frappe.local, "safe_globals_template", None)
+	if cached and cached[0] is db:
+		return cached[1]
+
+	template = _get_safe_globals_template()
+	frappe.local.safe_globals_template = (db, template)
+	return template
+
+
+def _get_safe_globals_template():
 	datautils = frappe._dict()
 
 	if frappe.db:
@@ -173,13 +360,6 @@ def get_safe_globals():
 
 	add_data_utils(datautils)
 
-	form_dict = getattr(frappe.local, "form_dict", frappe._dict())
-
-	if "_" in form_dict:
-		del frappe.local.form_dict["_"]
-
-	user = getattr(frappe.local, "session", None) and frappe.local.session.user or "Guest"
-
 	out = NamespaceDict(
 		# make available limited methods of frappe
 		json=NamespaceDict(loads=json.loads, dumps=json.dumps),
@@ -187,16 +367,13 @@ def get_safe_globals():
 		dict=dict,
 		log=frappe.log,
 		_dict=frappe._dict,
-		args=form_dict,
 		frappe=NamespaceDict(
 			call=call_whitelisted_function,
-			flags=frappe._dict(),
 			format=frappe.format_value,
 			format_value=frappe.format_value,
 			date_format=date_format,
 			time_format=time_format,
 			format_date=frappe.utils.data.global_date_format,
-			form_dict=form_dict,
 			bold=frappe.bold,
 			copy_doc=frappe.copy_doc,
 			errprint=frappe.errprint,
@@ -220,19 +397,8 @@ def get_safe_globals():
 			sendmail=frappe.sendmail,
 			get_print=frappe.get_print,
 			attach_print=frappe.attach_print,
-			user=user,
 			get_fullname=frappe.utils.get_fullname,
 			get_gravatar=frappe.utils.get_gravatar_url,
-			full_name=frappe.local.session.data.full_name
-			if getattr(frappe.local, "session", None)
-			else "Guest",
-			request=getattr(frappe.local, "request", {}),
-			session=frappe._dict(
-				user=user,
-				csrf_token=frappe.local.session.data.csrf_token
-				if getattr(frappe.local, "session", None)
-				else "",
-			),
 			make_get_request=frappe.integrations.utils.make_get_request,
 			make_post_request=frappe.integrations.utils.make_post_request,
 			make_put_request=frappe.integrations.utils.make_put_request,
@@ -263,7 +429,6 @@ def get_safe_globals():
 				before_rollback=frappe.db.before_rollback,
 				add_index=frappe.db.add_index,
 			),
-			lang=getattr(frappe.local, "lang", "en"),
 		),
 		FrappeClient=FrappeClient,
 		style=frappe._dict(border_color="#d1d8dd"),
@@ -283,9 +448,6 @@ def get_safe_globals():
 		frappe.exceptions, out.frappe, lambda obj: inspect.isclass(obj) and issubclass(obj, Exception)
 	)
 
-	if frappe.response:
-		out.frappe.response = frappe.response
-
 	out.update(safe_globals)
 
 	# default writer allows write access
@@ -306,6 +468,14 @@ def get_safe_globals():
 	return out
 
 
+def copy_namespace(namespace: frappe._dict) -> frappe._dict:
+	"""Copy the namespace and the namespaces in it, scripts can change them."""
+	return type(namespace)(
+		(key, copy_namespace(value) if isinstance(value, frappe._dict) else value)
+		for key, value in namespace.items()
+	)
+
+
 def is_job_queued(job_name, queue="default"):
 	"""
 	:param job_name: used to identify a queued job, usually dotted path to function
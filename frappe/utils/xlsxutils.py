@@ -16,7 +16,8 @@ ILLEGAL_CHARACTERS_RE = re.compile(r"[\000-\010]|[\013-\014]|[\016-\037]")
 
 
 # return xlsx file object
-def make_xlsx(data, sheet_name, wb=None, column_widths=None):
+def make_xlsx(data, sheet_name, wb=None, column_widths=None, file=None):
+	"""Write rows (any iterable) to a write-only workbook, saved to `file` or a new BytesIO."""
 	column_widths = column_widths or []
 	if wb is None:
 		wb = openpyxl.Workbook(write_only=True)
@@ -46,7 +47,7 @@ def make_xlsx(data, sheet_name, wb=None, column_widths=None):
 
 		ws.append(clean_row)
 
-	xlsx_file = BytesIO()
+	xlsx_file = BytesIO() if file is None else file
 	wb.save(xlsx_file)
 	return xlsx_file
 
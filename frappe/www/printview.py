@@ -161,7 +161,9 @@ def get_rendered_template(
 		doc.absolute_value = print_format.absolute_value
 
 		def get_template_from_string():
-			return jenv.from_string(get_print_format(doc.doctype, print_format))
+			return frappe.utils.jinja.get_template_from_string(
+				get_print_format(doc.doctype, print_format)
+			)
 
 		if print_format.custom_format:
 			template = get_template_from_string()